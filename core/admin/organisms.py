@@ -28,21 +28,41 @@ class CollectiveAdmin(OrganismAdmin):
     inlines = [IndividualInline]
 
 
-class GrowthInline(GenericStackedInline):
+class GrowthMetricsMixin(object):
+
+    def duration(self, growth):
+        if not growth.metrics:
+            return None
+        return "{:.1f}s".format(sum(growth.metrics["timings"].values()))
+
+    def query_count(self, growth):
+        if not growth.metrics:
+            return None
+        return growth.metrics["queries"]["count"]
+
+    def fetched_resources(self, growth):
+        if not growth.metrics:
+            return None
+        return "{fetched} fetched / {cached} cached".format(**growth.metrics["resources"])
+
+
+class GrowthInline(GrowthMetricsMixin, GenericStackedInline):
     model = Growth
-    fields = ("type", "state", "config",)
+    fields = ("type", "state", "config", "duration", "query_count", "fetched_resources", "metrics",)
+    readonly_fields = ("duration", "query_count", "fetched_resources", "metrics",)
     extra = 0
     ct_field = "community_type"
     ct_fk_field = "community_id"
 
 
-class GrowthAdmin(admin.ModelAdmin):
-    list_display = ["type", "state", "config"]
+class GrowthAdmin(GrowthMetricsMixin, admin.ModelAdmin):
+    list_display = ["type", "state", "duration", "query_count", "fetched_resources", "config"]
+    readonly_fields = ("metrics",)
 
 
 class ManifestationInline(GenericStackedInline):
     model = Manifestation
-    readonly_fields = ("created_at", "completed_at")
+    readonly_fields = ("created_at", "completed_at", "data")
     fields = ("uri", "config", "created_at", "completed_at", "task", "data")
     extra = 0
     ct_field = "community_type"
@@ -11,6 +11,14 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         self.load_processors()
+        self.connect_signals()
+
+    @staticmethod
+    def connect_signals():
+        from django.db.models.signals import post_delete
+        from core.models.organisms import Collective
+        from core.utils.vectors import delete_collective_vectors
+        post_delete.connect(delete_collective_vectors, sender=Collective, dispatch_uid="delete_collective_vectors")
 
     def load_processors(self):
         from core.processors.base import Processor
@@ -17,6 +17,10 @@ class DSHttpError403LimitExceeded(DSResourceException):
     pass
 
 
+class DSHttpError429TooManyRequests(DSResourceException):
+    pass
+
+
 class DSHttpError400NoToken(DSResourceException):
     pass
 
@@ -37,6 +41,10 @@ class DSNoContent(Exception):
     pass
 
 
+class DSQuotaExhausted(Exception):
+    pass
+
+
 class DSProcessException(Exception):
     pass
 
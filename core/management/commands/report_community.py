@@ -0,0 +1,71 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import logging
+
+from core.management.commands._community import CommunityCommand
+from core.models.organisms import Growth
+from core.utils.configuration import DecodeConfigAction
+
+
+class Command(CommunityCommand):
+    """
+    Reports the performance metrics that Growths of a Community recorded (see Growth.add_metrics).
+    """
+
+    HEADER = "{:<20} {:<12} {:>9} {:>9} {:>13} {:>9} {:>8} {:>10} {:>8} {:>8}  {}".format(
+        "growth", "state", "begin", "network", "contribution", "write", "queries", "query time",
+        "fetched", "cached", "errors"
+    )
+    ROW = "{:<20} {:<12} {:>8.1f}s {:>8.1f}s {:>12.1f}s {:>8.1f}s {:>8} {:>9.1f}s {:>8} {:>8}  {}"
+
+    def add_arguments(self, parser):
+        parser.add_argument('community', type=str, nargs="?", default=self.community_model)
+        parser.add_argument('-a', '--args', type=str, nargs="*", default="")
+        parser.add_argument('-c', '--config', type=str, action=DecodeConfigAction, nargs="?", default={})
+        parser.add_argument('--id', type=int, default=None, help="reports the Community with this id")
+
+    def get_community(self):
+        if self.community_id is not None:
+            return self.model.objects.get(id=self.community_id)
+        return self.model.objects.get_latest_by_signature(self.signature, **self.config)
+
+    def format_growth(self, growth):
+        metrics = growth.metrics
+        if not metrics or "timings" not in metrics:
+            return "{:<20} {:<12} no metrics".format(growth.type, growth.state)
+        timings = metrics["timings"]
+        errors = ", ".join(
+            "{}: {}".format(status, count)
+            for status, count in sorted(metrics["errors"].items())
+        )
+        return self.ROW.format(
+            growth.type, growth.state,
+            timings["begin"], timings["network"], timings["contribution"], timings["write"],
+            metrics["queries"]["count"], metrics["queries"]["time"],
+            metrics["resources"]["fetched"], metrics["resources"]["cached"],
+            errors or "-"
+        )
+
+    def handle_community(self, community, *arguments, **options):
+        self.stdout.write("{} ({}): {}".format(community, community.signature, community.state))
+        self.stdout.write(self.HEADER)
+        phases = {phase: 0.0 for phase in Growth.METRICS_PHASES}
+        slowest = None
+        for growth in community.growth_set.order_by("id"):
+            self.stdout.write(self.format_growth(growth))
+            if not growth.metrics or "timings" not in growth.metrics:
+                continue
+            for phase in Growth.METRICS_PHASES:
+                phases[phase] += growth.metrics["timings"][phase]
+                if slowest is None or growth.metrics["timings"][phase] > slowest[2]:
+                    slowest = (growth.type, phase, growth.metrics["timings"][phase],)
+        self.stdout.write("total: " + ", ".join(
+            "{} {:.1f}s".format(phase, phases[phase]) for phase in Growth.METRICS_PHASES
+        ))
+        if slowest is not None:
+            self.stdout.write("slowest: {} of {} with {:.1f}s".format(slowest[1], slowest[0], slowest[2]))
+
+    def handle(self, *args, **options):
+        logging.disable(logging.INFO)
+        self.community_id = options["id"]
+        super(Command, self).handle(*args, **options)
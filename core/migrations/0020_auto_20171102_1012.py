@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-02 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_auto_20171017_1444'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='httpresourcemock',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-06 15:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_auto_20171102_1012'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='httpresourcemock',
+            name='validated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
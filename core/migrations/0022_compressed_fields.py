@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-13 11:04
+from __future__ import unicode_literals
+
+from django.db import migrations
+import core.utils.compression
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_httpresourcemock_validated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='httpresourcemock',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='manifestation',
+            name='data',
+            field=core.utils.compression.CompressedJSONField(null=True),
+        ),
+    ]
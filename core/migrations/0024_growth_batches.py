@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-20 14:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import json_field.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_ratelimitbucket_dailyquota'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='growth',
+            name='batches',
+            field=json_field.fields.JSONField(blank=True, default=None, help_text='Enter a valid JSON object', null=True),
+        ),
+        migrations.AddField(
+            model_name='growth',
+            name='is_exhausted',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-24 10:31
+from __future__ import unicode_literals
+
+from django.db import migrations
+import json_field.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_growth_batches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='growth',
+            name='metrics',
+            field=json_field.fields.JSONField(blank=True, default=None, help_text='Enter a valid JSON object', null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-27 15:48
+from __future__ import unicode_literals
+
+import core.utils.compression
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_growth_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankFeatures',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('processor', models.CharField(max_length=255)),
+                ('fingerprint', models.CharField(max_length=255)),
+                ('data', core.utils.compression.CompressedJSONField(null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('collective', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.Collective')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='rankfeatures',
+            unique_together=set([('collective', 'processor')]),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-28 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_rankfeatures'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='growth',
+            name='state',
+            field=models.CharField(choices=[('Complete', 'Complete'), ('Contribute', 'Contribute'), ('Error', 'Error'), ('New', 'New'), ('Partial', 'Partial'), ('Processing', 'Processing'), ('Queued', 'Queued'), ('Retry', 'Retry')], db_index=True, default='New', max_length=255),
+        ),
+    ]
@@ -3,6 +3,8 @@ from .user import DataScopeUser
 from .organisms.individual import Individual
 from .organisms.collective import Collective
 from .organisms.growth import Growth
+from .organisms.features import RankFeatures
+from .resources.limits import RateLimitBucket, DailyQuota
 
 from core.tests.mocks.http import HttpResourceMock
 from core.tests.mocks.community import CommunityMock
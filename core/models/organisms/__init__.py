@@ -3,3 +3,4 @@ from .individual import Individual
 from .collective import Collective
 from .growth import Growth
 from .community import Community
+from .features import RankFeatures
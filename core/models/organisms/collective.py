@@ -55,8 +55,7 @@ class Collective(Organism):  # TODO: rename to family
         """
         if not isinstance(data, Iterable):
             data = [data]
-        for instance in data:
-            Individual.validate(instance, schema)
+        Individual.validate_batch(data, schema)
 
     def update(self, data, validate=True, reset=True, batch_size=500):  # TODO: rename to "add" and implement "update"
         """
@@ -77,8 +76,6 @@ class Collective(Organism):  # TODO: rename to family
 
             prepared = []
             if isinstance(data, dict):
-                if validate:
-                    Individual.validate(data, self.schema)
                 individual = Individual(
                     community=self.community,
                     collective=self,
@@ -88,8 +85,6 @@ class Collective(Organism):  # TODO: rename to family
                 individual.clean()
                 prepared.append(individual)
             elif isinstance(data, Individual):
-                if validate:
-                    Individual.validate(data, self.schema)
                 data.id = None
                 data.collective = self
                 data.clean()
@@ -102,6 +97,8 @@ class Collective(Organism):  # TODO: rename to family
         update_count = 0
         for updates in ibatch(data, batch_size=batch_size):
             updates = prepare_updates(updates)
+            if validate:
+                Individual.validate_batch(updates, self.schema)
             update_count += len(updates)
             Individual.objects.bulk_create(updates, batch_size=settings.MAX_BATCH_SIZE)
 
@@ -146,6 +143,30 @@ class Collective(Organism):  # TODO: rename to family
         else:
             return [ind.output(frm) for ind in self.individual_set.iterator()]
 
+    @staticmethod
+    def output_from_individuals(individuals, *args):
+        """
+        Works like output, but for a list of Individuals instead of all Individuals of a Collective.
+
+        :param individuals: (list) Individuals to output from
+        :param args: paths like for output
+        :return: output for every Individual in the order of individuals
+        """
+        if len(args) > 1:
+            return [Collective.output_from_individuals(individuals, frm) for frm in args]
+        frm = args[0]
+        if not frm:
+            return [frm for ind in individuals]
+        elif isinstance(frm, list):
+            output = Collective.output_from_individuals(individuals, *frm)
+            if len(frm) > 1:
+                output = [list(zipped) for zipped in zip(*output)]
+            else:
+                output = [[out] for out in output]
+            return output
+        else:
+            return [ind.output(frm) for ind in individuals]
+
     def group_by(self, key):
         """
         Outputs a dict with lists. The lists are filled with Individuals that hold the same value for key.
@@ -3,13 +3,17 @@ import six
 from itertools import groupby
 from collections import OrderedDict, Iterator
 import logging
+from datetime import datetime, timedelta
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation, ContentType
 
+from celery import group
+
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.models.organisms.states import CommunityState, COMMUNITY_STATE_CHOICES
 from core.models.organisms import Growth, Collective, Individual, Organism
+from core.models.organisms.growth import GrowthState, ContributeType
 from core.models.organisms.mixins import ProcessorMixin
 from core.models.organisms.managers.community import CommunityManager
 from core.models.resources.manifestation import Manifestation
@@ -57,6 +61,8 @@ class Community(models.Model, ProcessorMixin):
     ASYNC_MANIFEST = False
     INPUT_THROUGH_PATH = True
     PUBLIC_CONFIG = {}
+    PARALLEL_GROWTH = False  # callbacks may create dependencies that growth_dependencies can't see
+    ASYNC_STALE_AFTER = 600  # NB: seconds without progress after which requests grow an ASYNC Community themselves
 
     objects = CommunityManager()
 
@@ -87,6 +93,43 @@ class Community(models.Model, ProcessorMixin):
         if callback is not None and callable(callback):
             callback(inp)
 
+    def get_predecessor(self):
+        """
+        Returns the Community whose outputs Growths of this Community may reuse.
+        By default this is the latest ready Community of the same kind and signature.
+
+        :return: Community or None
+        """
+        predecessors = self.__class__.objects \
+            .filter(signature=self.signature, state=CommunityState.READY, created_at__lt=self.created_at) \
+            .exclude(id=self.id) \
+            .order_by("-created_at")
+        return predecessors.first()
+
+    def call_reuse_callback(self, growth):
+        """
+        Calls the reuse callback for the phase of a Growth with the finished Growth of the same phase
+        from the predecessor Community. Only phases with "reuse" in their spirit get reused.
+        The callback should fill the output of the Growth with what is still valid
+        and configure the Growth to only compute the remainder.
+
+        :param growth: the Growth that is about to begin
+        :return: (bool) whether a previous Growth was available for reuse
+        """
+        phase_config = self.COMMUNITY_SPIRIT.get(growth.type, {})
+        callback = getattr(self, "reuse_" + growth.type, None)
+        if not phase_config.get("reuse", False) or callback is None or not callable(callback):
+            return False
+        predecessor = self.get_predecessor()
+        if predecessor is None:
+            return False
+        previous = predecessor.growth_set.filter(type=growth.type, is_finished=True).last()
+        if previous is None:
+            return False
+        log.info("Reusing " + growth.type + " from community " + str(predecessor.id))
+        callback(growth, previous)
+        return True
+
     def call_error_callbacks(self, phase, errors, out):
         errors.order_by('-status')
         phase_config = self.COMMUNITY_SPIRIT[phase]
@@ -126,6 +169,7 @@ class Community(models.Model, ProcessorMixin):
                 cont, con = None, None
 
             inp = growth_config["input"]
+            upstream = None
             if inp is not None and inp.startswith("@"):
                 grw = self.growth_set.filter(type=inp[1:]).last()
                 if grw is None:
@@ -133,6 +177,7 @@ class Community(models.Model, ProcessorMixin):
                         "Could not find growth with type {} for input of {}".format(inp[1:], growth_type)
                     )
                 inp = grw.output
+                upstream = grw
             elif inp is None:
                 inp = self.initial_input(*args)
             elif inp.startswith("Collective"):
@@ -179,9 +224,85 @@ class Community(models.Model, ProcessorMixin):
                 input=inp,
                 output=out
             )
+            if growth_config.get("stream") and self.config.async:
+                self.setup_stream(growth, upstream)
             growth.clean()
             growth.save()
 
+    def setup_stream(self, growth, upstream):
+        """
+        Prepares a Growth to stream from the Growth that outputs its input. See Growth.stream.
+
+        :param growth: the Growth that should start on contributions of upstream before upstream finishes
+        :param upstream: the Growth that outputs to the input of growth
+        :return: None
+        """
+        if upstream is None or upstream.contribute_type != ContributeType.APPEND:
+            raise AssertionError(
+                "Growth {} can only stream from an @-referenced growth that appends to its output".format(growth.type)
+            )
+        if growth.output == growth.input and growth.contribute_type == ContributeType.APPEND:
+            raise AssertionError("Growth {} can't stream while appending to its own input".format(growth.type))
+        growth.batches = []
+        if upstream.batches is None:
+            upstream.batches = []
+            upstream.save()
+
+    def growth_dependencies(self, growths):
+        """
+        Determines for every Growth which earlier Growths need to finish before it can begin.
+        A Growth depends on an earlier Growth when it reads or writes an Organism that the earlier Growth writes,
+        or when it writes an Organism that the earlier Growth reads.
+        Dependencies that only exist through callbacks can be declared under "dependencies" in the spirit.
+
+        :param growths: (list) Growths in the order of COMMUNITY_SPIRIT
+        :return: (dict) sets of Growth types by Growth type
+        """
+        def organisms(growth, prefix):
+            organism_id = getattr(growth, prefix + "_id")
+            return {(getattr(growth, prefix + "_type_id"), organism_id)} if organism_id is not None else set()
+
+        dependencies = OrderedDict()
+        for index, growth in enumerate(growths):
+            reads = organisms(growth, "input")
+            writes = organisms(growth, "output")
+            dependencies[growth.type] = set(self.COMMUNITY_SPIRIT[growth.type].get("dependencies", []))
+            for earlier in growths[:index]:
+                earlier_reads = organisms(earlier, "input")
+                earlier_writes = organisms(earlier, "output")
+                if earlier_writes & (reads | writes) or earlier_reads & writes:
+                    dependencies[growth.type].add(earlier.type)
+        return dependencies
+
+    def ready_growths(self):
+        """
+        Returns all Growths that have not begun yet and whose dependencies are finished.
+
+        :return: (list) Growths in the order of COMMUNITY_SPIRIT
+        """
+        growths = list(self.growth_set.all())
+        dependencies = self.growth_dependencies(growths)
+        finished = {growth.type for growth in growths if growth.is_finished}
+        return [
+            growth for growth in growths
+            if growth.state == GrowthState.NEW and dependencies[growth.type].issubset(finished)
+        ]
+
+    def stream_growths(self):
+        """
+        Begins or advances the Growths that directly follow the current Growth and stream from it.
+        These Growths become the current Growth in the usual order, which is when they finish.
+
+        :return: None
+        """
+        for growth in self.growth_set.filter(id__gt=self.current_growth.id, is_finished=False):
+            if not self.COMMUNITY_SPIRIT[growth.type].get("stream") or growth.batches is None:
+                break
+            if growth.state == GrowthState.NEW:
+                self.begin_growth(growth)
+            else:
+                growth.stream()
+
     def next_growth(self):
         growth = self.growth_set.filter(is_finished=False).first()
         if growth is None:
@@ -221,6 +342,9 @@ class Community(models.Model, ProcessorMixin):
         elif self.state == CommunityState.SYNC:
             return False
 
+        if self.PARALLEL_GROWTH:
+            return self.grow_parallel(*args)
+
         result = None
         if self.state in [CommunityState.NEW]:
             log.info("Preparing community")
@@ -228,43 +352,211 @@ class Community(models.Model, ProcessorMixin):
             self.setup_growth(*args)
             self.current_growth = self.next_growth()
             self.save()  # in between save because next operations may take long and community needs to be claimed.
-            log.info("Preparing " + self.current_growth.type)
-            self.call_begin_callback(self.current_growth.type, self.current_growth.input)
-            log.info("Starting " + self.current_growth.type)
-            result = self.current_growth.begin()  # when synchronous result contains actual results
+            result = self.begin_growth(self.current_growth)
             self.save()
 
         while self.kernel is None:
 
-            output, errors = self.current_growth.finish(result)  # will raise when Growth is not finished
-            error_count = errors.count()
-            if error_count > 1:
-                should_finish = self.call_error_callbacks(self.current_growth.type, errors, output)
-                log.info("{} errors occurred".format(error_count))
-            else:
-                should_finish = True
-            if not should_finish:
-                self.state = CommunityState.ABORTED
-                self.save()
-                raise DSProcessError("Could not finish growth according to error callbacks.")
-            log.info("Finishing " + self.current_growth.type)
-            self.call_finish_callback(self.current_growth.type, output, errors)
+            if self.state == CommunityState.ASYNC:
+                self.stream_growths()
+            self.finish_growth(self.current_growth, result)  # will raise when Growth is not finished
             try:
                 self.current_growth = self.next_growth()
             except Growth.DoesNotExist:
                 self.set_kernel()
+                self.store_features()
                 self.state = CommunityState.READY
                 self.save()
                 return True
-            log.info("Preparing " + self.current_growth.type)
-            self.call_begin_callback(self.current_growth.type, self.current_growth.input)
-            log.info("Starting " + self.current_growth.type)
-            result = self.current_growth.begin()
+            if self.current_growth.state == GrowthState.NEW:  # streaming Growths have begun already
+                result = self.begin_growth(self.current_growth)
+            else:
+                result = None
             self.save()
 
             if self.state == CommunityState.ASYNC:
                 raise DSProcessUnfinished("Community starts another Growth.")
 
+    def grow_exclusive(self, *args, **kwargs):
+        """
+        Grows the Community like grow does, while the Community is locked in the database.
+        Growth tasks of asynchronous Communities call this when they are done (see Growth.get_callback).
+        The lock prevents that a Community grows in several processes at once
+        and it makes callbacks wait for the process that is still beginning a Growth.
+        The state gets checked only after locking, because a callback may run before that process commits.
+
+        :param states: (list) optional states that the locked Community should be in to grow
+        :return: True when the Community is ready
+        """
+        states = kwargs.pop("states", None)
+        exception = None
+        with transaction.atomic():
+            self.__class__.objects.select_for_update().filter(id=self.id).exists()
+            self.refresh_from_db(fields=["state", "current_growth", "kernel_type", "kernel_id"])
+            if states is not None and self.state not in states:
+                return self.state == CommunityState.READY
+            try:
+                done = self.grow(*args)
+            except (DSProcessUnfinished, DSProcessError) as exc:  # raised after commit to keep changes
+                exception = exc
+        if exception is not None:
+            raise exception
+        return done
+
+    def is_stalled(self):
+        """
+        Indicates whether an asynchronous Community made no progress for ASYNC_STALE_AFTER seconds.
+        Growth task callbacks may get lost, for instance when a worker dies,
+        after which nothing else grows the Community any further.
+
+        :return: (bool) whether the Community should get grown outside of Growth task callbacks
+        """
+        if self.state != CommunityState.ASYNC or self.modified_at is None:
+            return False
+        return self.modified_at < datetime.now() - timedelta(seconds=self.ASYNC_STALE_AFTER)
+
+    @classmethod
+    def get_growth_status(cls, community_id):
+        """
+        Returns the state of a Community and its Growths.
+        It only reads a few columns, because clients poll this while a Community grows.
+
+        :param community_id: (int) id of the Community
+        :return: (dict) the status or None when the Community does not exist
+        """
+        try:
+            state = cls.objects.values_list("state", flat=True).get(id=community_id)
+        except cls.DoesNotExist:
+            return None
+        growths = Growth.objects \
+            .filter(community_type=ContentType.objects.get_for_model(cls), community_id=community_id) \
+            .order_by("id") \
+            .values("type", "state", "is_finished")
+        growths = list(growths)
+        return {
+            "state": state,
+            "growths": growths,
+            "finished": len([growth for growth in growths if growth["is_finished"]]),
+            "total": len(growths)
+        }
+
+    def finish_growth(self, growth, result):
+        """
+        Finishes a Growth and calls the error and finish callbacks for its phase.
+
+        :param growth: the Growth to finish
+        :param result: the result of Growth.begin
+        :return: None
+        :raises DSProcessUnfinished: when the Growth is not finished
+        :raises DSProcessError: when the error callbacks abort the Community
+        """
+        output, errors = growth.finish(result)  # will raise when Growth is not finished
+        error_count = errors.count()
+        if error_count > 1:
+            should_finish = self.call_error_callbacks(growth.type, errors, output)
+            log.info("{} errors occurred".format(error_count))
+        else:
+            should_finish = True
+        if not should_finish:
+            self.state = CommunityState.ABORTED
+            self.save()
+            raise DSProcessError("Could not finish growth according to error callbacks.")
+        log.info("Finishing " + growth.type)
+        self.call_finish_callback(growth.type, output, errors)
+
+    def begin_growth(self, growth):
+        log.info("Preparing " + growth.type)
+        self.call_reuse_callback(growth)
+        self.call_begin_callback(growth.type, growth.input)
+        log.info("Starting " + growth.type)
+        return growth.begin()  # when synchronous result contains actual results
+
+    def begin_growths(self, growths):
+        """
+        Begins Growths that do not depend on each other.
+        Asynchronous growth of more than one Growth queues the Growths and begins them in Celery tasks,
+        which get dispatched after commit, because other processes can't see uncommitted Growths and organisms.
+        Begin callbacks get called beforehand in this process, because they may change the Community.
+        Synchronous Growths begin one after another, for the same reason.
+
+        :param growths: (list) Growths to begin
+        :return: (list) results of Growth.begin in the same order as growths or None for queued Growths
+        """
+        if self.state == CommunityState.SYNC or len(growths) == 1:
+            return [self.begin_growth(growth) for growth in growths]
+
+        from core.tasks.community import begin_growth
+        for growth in growths:
+            log.info("Preparing " + growth.type)
+            self.call_reuse_callback(growth)
+            self.call_begin_callback(growth.type, growth.input)
+            growth.state = GrowthState.QUEUED
+            growth.save()
+        tasks = group(begin_growth.si(self.__class__.__name__, self.id, growth.id) for growth in growths)
+        transaction.on_commit(lambda: tasks.delay())
+        return [None for growth in growths]
+
+    def begin_growth_exclusive(self, growth_id):
+        """
+        Begins a Growth that begin_growths queued, while the Community is locked in the database.
+        The lock makes the callback of the Growth task wait until the Growth has begun.
+
+        :param growth_id: (int) id of the queued Growth
+        :return: the Growth or None when the Growth is no longer queued
+        """
+        with transaction.atomic():
+            self.__class__.objects.select_for_update().filter(id=self.id).exists()
+            growth = self.growth_set.get(id=growth_id)
+            if growth.state != GrowthState.QUEUED:
+                return None
+            log.info("Starting " + growth.type)
+            growth.begin()
+        return growth
+
+    def grow_parallel(self, *args):
+        """
+        Grows the Community by beginning every Growth as soon as the Growths it depends on are finished.
+        See growth_dependencies for how dependencies get determined.
+
+        :return: True when the Community is ready
+        :raises DSProcessUnfinished: when growing asynchronously and some Growths are still processing
+        """
+        if self.state == CommunityState.NEW:
+            log.info("Preparing community")
+            self.state = CommunityState.ASYNC if self.config.async else CommunityState.SYNC
+            self.setup_growth(*args)
+            self.save()  # in between save because next operations may take long and community needs to be claimed.
+
+        results = {}
+        while self.kernel is None:
+
+            unfinished = self.growth_set.filter(is_finished=False)
+            for growth in unfinished.exclude(state__in=[GrowthState.NEW, GrowthState.QUEUED]):
+                try:
+                    self.finish_growth(growth, results.pop(growth.id, None))
+                except DSProcessUnfinished:
+                    continue
+
+            growths = self.ready_growths()
+            if not growths and not self.growth_set.filter(is_finished=False).exists():
+                self.current_growth = self.growth_set.last()
+                self.set_kernel()
+                self.store_features()
+                self.state = CommunityState.READY
+                self.save()
+                return True
+
+            if growths:
+                for growth, result in zip(growths, self.begin_growths(growths)):
+                    results[growth.id] = result
+                self.current_growth = growths[-1]
+                self.save()
+            elif self.state == CommunityState.SYNC:
+                raise DSProcessError("Community can't begin any unfinished Growth.")
+
+            if self.state == CommunityState.ASYNC:
+                raise DSProcessUnfinished("Community waits for unfinished Growths.")
+
     @property
     def manifestation(self):
         """
@@ -273,13 +565,44 @@ class Community(models.Model, ProcessorMixin):
         :return:
         """
         content = self.kernel.content
-        for part in self.COMMUNITY_BODY:
+        for index, part in enumerate(self.COMMUNITY_BODY):
             processor, method, args_type = self.prepare_process(part["process"], extra_config=part.get("config"))
-            content = method(content)
+            # The first part may process features of the kernel that store_features stored
+            features_content = self.manifest_from_features(processor, method) if not index else None
+            content = method(content) if features_content is None else features_content
             assert isinstance(content, Iterator), \
                 "To prevent high memory usage processors should return iterators when manifestating"
         return content
 
+    def manifest_from_features(self, processor, method):
+        """
+        Processes the kernel with the features variant of a processor method (named <method>_from_features).
+
+        :return: (iterator) processed content or None when the features variant is not available
+        """
+        features_method = getattr(processor, method.__name__ + "_from_features", None)
+        if features_method is None or not isinstance(self.kernel, Collective):
+            return None
+        return features_method(self.kernel)
+
+    def store_features(self):
+        """
+        Stores features of the kernel that the first processor of the COMMUNITY_BODY can manifest from,
+        which saves every manifestation from processing the entire kernel. See RankProcessor.store_features.
+        Features get stored for all hooks that PUBLIC_CONFIG allows to set a weight for.
+
+        :return: None
+        """
+        if not self.COMMUNITY_BODY or not isinstance(self.kernel, Collective):
+            return
+        part = self.COMMUNITY_BODY[0]
+        processor, method, args_type = self.prepare_process(part["process"], extra_config=part.get("config"))
+        store = getattr(processor, "store_features", None)
+        if store is None:
+            return
+        log.info("Storing features")
+        store(self.kernel, [key[1:] for key in self.PUBLIC_CONFIG if key.startswith("$")])
+
     @classmethod
     def get_name(cls):
         if hasattr(cls, 'COMMUNITY_NAME'):
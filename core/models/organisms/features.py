@@ -0,0 +1,82 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from django.db import models
+from django.db.models import Count, Max
+
+from core.models.organisms.collective import Collective
+from core.utils.compression import CompressedJSONField
+
+
+class RankFeatures(models.Model):
+    """
+    Stores the values that rank hooks of a processor return for every Individual of a Collective.
+    Values are stored per hook as a column with a value for every Individual id in the same order as ids.
+    Ranking with other weights only needs these values and not the Individuals themselves.
+    """
+
+    collective = models.ForeignKey(Collective, related_name="+")
+    processor = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=255)
+    data = CompressedJSONField(null=True)  # NB: {"ids": [...], "columns": {hook_name: [...]}}
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("collective", "processor",)
+
+    @staticmethod
+    def get_fingerprint(collective, day=None):
+        """
+        Returns a string that changes whenever Individuals get added to, removed from or changed in a Collective.
+
+        :param collective: the Collective to fingerprint
+        :param day: (date) optional day that values are valid for
+        :return: (str) fingerprint
+        """
+        aggregate = collective.individual_set.aggregate(count=Count("id"), modified_at=Max("modified_at"))
+        fingerprint = "{}:{}".format(aggregate["count"], aggregate["modified_at"])
+        if day is not None:
+            fingerprint += ":{}".format(day.isoformat())
+        return fingerprint
+
+    @classmethod
+    def store(cls, collective, processor, ids, columns, day=None):
+        """
+        Stores values of hooks for a Collective, replacing values stored earlier for the same processor.
+
+        :param collective: the Collective that values were calculated for
+        :param processor: (str) name of the processor
+        :param ids: (list) ids of the Individuals
+        :param columns: (dict) a list of values per hook in the same order as ids
+        :param day: (date) optional day that the values are valid for
+        :return: RankFeatures
+        """
+        features, created = cls.objects.update_or_create(
+            collective=collective,
+            processor=processor,
+            defaults={
+                "fingerprint": cls.get_fingerprint(collective, day),
+                "data": {"ids": ids, "columns": columns}
+            }
+        )
+        return features
+
+    @classmethod
+    def load(cls, collective, processor, day=None):
+        """
+        Loads values stored for a Collective if the Collective did not change after storing them.
+
+        :param collective: the Collective to load values for
+        :param processor: (str) name of the processor
+        :param day: (date) optional day that the values should be valid for
+        :return: RankFeatures or None
+        """
+        try:
+            features = cls.objects.get(collective=collective, processor=processor)
+        except cls.DoesNotExist:
+            return None
+        if features.fingerprint != cls.get_fingerprint(collective, day):
+            return None
+        return features
+
+    def __str__(self):
+        return "{} features of {}".format(self.processor, self.collective)
@@ -1,16 +1,22 @@
 import logging
+from time import time
+from datetime import datetime
 from operator import xor
 from collections import Iterator
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.contrib.contenttypes.fields import GenericForeignKey, ContentType
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ValidationError, FieldDoesNotExist
+
+import json_field
 
 from datascope.configuration import PROCESS_CHOICE_LIST, DEFAULT_CONFIGURATION
 from core.processors.base import ArgumentsTypes
 from core.utils.configuration import ConfigurationField
-from core.utils.helpers import get_any_model
-from core.exceptions import DSProcessError, DSNoContent
+from core.utils.helpers import get_any_model, ibatch, bulk_update
+from core.utils.metrics import QueryMetrics, TimedIterator
+from core.exceptions import DSProcessError, DSProcessUnfinished, DSNoContent
 from core.models.organisms import Individual, Collective
 from core.models.organisms.mixins import ProcessorMixin
 
@@ -20,6 +26,7 @@ log = logging.getLogger("datascope")
 
 class GrowthState(object):
     NEW = "New"
+    QUEUED = "Queued"
     PROCESSING = "Processing"
     CONTRIBUTE = "Contribute"
     COMPLETE = "Complete"
@@ -70,6 +77,13 @@ class Growth(models.Model, ProcessorMixin):
     state = models.CharField(max_length=255, choices=GROWTH_STATE_CHOICES, default=GrowthState.NEW, db_index=True)
     is_finished = models.BooleanField(default=False, db_index=True)
 
+    batches = json_field.JSONField(default=None, null=True, blank=True)  # NB: only set when streaming
+    is_exhausted = models.BooleanField(default=False)
+    metrics = json_field.JSONField(default=None, null=True, blank=True)  # NB: see add_metrics
+
+    STREAM_BATCH_SIZE = 100
+    METRICS_PHASES = ["begin", "network", "contribution", "write"]
+
     def begin(self):
         """
         Starts the Celery task that provides growth of the data pool and is stored under self.process.
@@ -78,22 +92,38 @@ class Growth(models.Model, ProcessorMixin):
         :param kwargs: (optional) The keyword arguments to pass through the process of Growth
         :return: the input Organism
         """
-        assert self.state in [GrowthState.NEW, GrowthState.RETRY], \
+        assert self.state in [GrowthState.NEW, GrowthState.QUEUED, GrowthState.RETRY], \
             "Can't begin a growth that is in state {}".format(self.state)
 
-        self.config = self.community.config.to_dict(protected=True)  # TODO: make this += operation instead
+        start = time()
+        with QueryMetrics() as queries:
+            self.config = self.community.config.to_dict(protected=True)  # TODO: make this += operation instead
+            link = self.get_callback() if self.config.async else None
+            processor, method, args_type = self.prepare_process(self.process, async=self.config.async, link=link)
+            assert args_type == ArgumentsTypes.NORMAL and isinstance(self.input, Individual) or \
+                args_type == ArgumentsTypes.BATCH and isinstance(self.input, Collective), \
+                "Unexpected arguments type '{}' for input of class {}".format(
+                    args_type,
+                    self.input.__class__.__name__
+                )
+            if self.batches is None:
+                args, kwargs = self.input.output(self.config.args, self.config.kwargs)
+        self.add_metrics(timings={"begin": time() - start}, queries=queries)
+        self.metrics["dispatched_at"] = time()  # NB: see count_resources and get_network_time
+        if self.batches is not None:
+            self.state = GrowthState.PROCESSING
+            self.stream()
+            return
 
-        processor, method, args_type = self.prepare_process(self.process, async=self.config.async)
-        assert args_type == ArgumentsTypes.NORMAL and isinstance(self.input, Individual) or \
-            args_type == ArgumentsTypes.BATCH and isinstance(self.input, Collective), \
-            "Unexpected arguments type '{}' for input of class {}".format(args_type, self.input.__class__.__name__)
-        args, kwargs = self.input.output(self.config.args, self.config.kwargs)
-        if isinstance(self.input, Individual):
-            result = method(*args, **kwargs)
-        elif isinstance(self.input, Collective):
-            result = method(args, kwargs)
-        else:
-            raise AssertionError("Growth.input is of unexpected type {}".format(type(self.input)))
+        start = time()
+        with QueryMetrics() as queries:  # synchronous processes query in this process as well
+            if isinstance(self.input, Individual):
+                result = method(*args, **kwargs)
+            elif isinstance(self.input, Collective):
+                result = method(args, kwargs)
+            else:
+                raise AssertionError("Growth.input is of unexpected type {}".format(type(self.input)))
+        self.add_metrics(timings={"network": time() - start}, queries=queries)
 
         if not self.config.async:
             self.state = GrowthState.CONTRIBUTE
@@ -114,20 +144,46 @@ class Growth(models.Model, ProcessorMixin):
 
         processor, method, args_type = self.prepare_process(self.process, async=self.config.async)
 
+        if self.state == GrowthState.PROCESSING and self.batches is not None:
+            if not self.stream():
+                raise DSProcessUnfinished("Growth {} is still streaming.".format(self.type))
+            self.state = GrowthState.COMPLETE if not self.resources.exists() else GrowthState.PARTIAL
+            self.save()
+            return self.output, self.resources
+
         if self.state == GrowthState.PROCESSING:
             try:
                 result = processor.async_results(self.result_id)
                 self.state = GrowthState.CONTRIBUTE
+                self.add_metrics(timings={"network": self.get_network_time()})
             except DSProcessError as exc:
                 self.state = GrowthState.ERROR
                 self.save()
                 raise
 
         if self.state == GrowthState.CONTRIBUTE:
+            err = self.contribute_results(processor, result, reset=self.config.reset_output)
+            self.state = GrowthState.COMPLETE if not len(err) else GrowthState.PARTIAL
+            self.save()
+
+        return self.output, self.resources
+
+    def contribute_results(self, processor, result, reset=True):
+        """
+        Contributes the successful resources of a result to the output and retains the erroneous resources.
+
+        :param processor: the processor that created the result
+        :param result: the result of the process
+        :param reset: (optional) whether appending should replace the content of the output
+        :return: the erroneous resources
+        """
+        start = time()
+        with QueryMetrics() as queries:
             scc, err = processor.results(result)
-            contributions = self.prepare_contributions(scc)
+            resources, errors = self.count_resources(scc, err)
+            contributions = TimedIterator(self.prepare_contributions(scc))
             if self.contribute_type == ContributeType.APPEND:
-                self.append_to_output(contributions)
+                self.append_to_output(contributions, reset=reset)
             elif self.contribute_type == ContributeType.INLINE:
                 assert self.config.inline_key, \
                     "No inline_key specified in configuration for Growth with inline contribution"
@@ -142,10 +198,157 @@ class Growth(models.Model, ProcessorMixin):
                 raise AssertionError("Growth.finish did not act on contribute_type {}".format(self.contribute_type))
             for res in err:
                 res.retain(self)
-            self.state = GrowthState.COMPLETE if not len(err) else GrowthState.PARTIAL
+        self.add_metrics(
+            timings={
+                "contribution": contributions.duration,
+                "write": time() - start - contributions.duration
+            },
+            queries=queries,
+            resources=resources,
+            errors=errors
+        )
+        return err
+
+    def count_resources(self, success_resources, error_resources):
+        """
+        Counts the resources that were fetched during this Growth and those that were served from cache,
+        together with the amount of erroneous resources per status.
+        Resources that were not modified after the process got dispatched were served from cache.
+
+        :param success_resources: (QuerySet) the successful resources
+        :param error_resources: (QuerySet) the erroneous resources
+        :return: (tuple) resource counts and error counts by status
+        """
+        dispatched_at = (self.metrics or {}).get("dispatched_at", None)
+        total = success_resources.count()
+        if dispatched_at is not None:
+            dispatched_at = datetime.fromtimestamp(int(dispatched_at))  # NB: databases may store whole seconds
+            fetched = success_resources.filter(modified_at__gte=dispatched_at).count()
+        else:
+            fetched = total
+        try:
+            error_resources.model._meta.get_field("status")
+            statuses = error_resources.values_list("status", flat=True)
+        except FieldDoesNotExist:
+            statuses = [None for resource in error_resources]
+        errors = {}
+        for status in statuses:
+            status = str(status)
+            errors[status] = errors.get(status, 0) + 1
+        return {"fetched": fetched, "cached": total - fetched}, errors
+
+    def get_network_time(self):
+        """
+        Returns the time between dispatching the process and now,
+        which is the time that the background process took, including any waiting for a worker.
+        """
+        dispatched_at = (self.metrics or {}).get("dispatched_at", None)
+        return time() - dispatched_at if dispatched_at is not None else 0.0
+
+    def add_metrics(self, timings=None, queries=None, resources=None, errors=None):
+        """
+        Adds performance metrics to the metrics of this Growth. Metrics of every begin, batch and retry add up.
+        The metrics contain the seconds spent per phase (see METRICS_PHASES),
+        the amount and duration of database queries issued by this process,
+        counts of fetched resources and resources served from cache and counts of errors per status.
+        Processes that run in the background query the database in other processes, which doesn't get counted.
+
+        :param timings: (dict) seconds per phase
+        :param queries: (QueryMetrics) measured queries
+        :param resources: (dict) resource counts
+        :param errors: (dict) error counts per status
+        :return: None
+        """
+        if self.metrics is None:
+            self.metrics = {}
+        metrics_timings = self.metrics.setdefault("timings", {phase: 0.0 for phase in self.METRICS_PHASES})
+        metrics_queries = self.metrics.setdefault("queries", {"count": 0, "time": 0.0})
+        metrics_resources = self.metrics.setdefault("resources", {"fetched": 0, "cached": 0})
+        metrics_errors = self.metrics.setdefault("errors", {})
+        for phase, seconds in (timings or {}).items():
+            metrics_timings[phase] += seconds
+        if queries is not None:
+            metrics_queries["count"] += queries.count
+            metrics_queries["time"] += queries.time
+        for key, count in (resources or {}).items():
+            metrics_resources[key] += count
+        for status, count in (errors or {}).items():
+            metrics_errors[status] = metrics_errors.get(status, 0) + count
+
+    @property
+    def input_is_exhausted(self):
+        """
+        Indicates whether all earlier Growths of the Community that output to the input of this Growth are finished.
+        """
+        return not Growth.objects.filter(
+            community_type=self.community_type,
+            community_id=self.community_id,
+            output_type=self.input_type,
+            output_id=self.input_id,
+            id__lt=self.id,
+            is_finished=False
+        ).exists()
+
+    def stream(self):
+        """
+        Processes the input of a streaming Growth in batches while earlier Growths are still adding to that input.
+        Individuals that got added to the input after the boundary of the last batch get dispatched as new batches
+        and the results of batches that are ready get contributed to the output.
+        The boundary of every batch is the id of its last Individual.
+
+        :return: (bool) whether the stream is exhausted and all batches are contributed
+        """
+        assert self.batches is not None, "Growth.stream expects batches to be set on streaming Growths"
+        assert isinstance(self.input, Collective), "Growth.stream expects a Collective as input"
+        processor, method, args_type = self.prepare_process(self.process, async=True, link=self.get_callback())
+
+        if not self.is_exhausted:
+            is_exhausted = self.input_is_exhausted  # before dispatching to not miss any last additions
+            boundary = self.batches[-1]["boundary"] if self.batches else 0
+            individuals = self.input.individual_set.filter(id__gt=boundary).order_by("id")
+            for individuals_batch in ibatch(individuals.iterator(), batch_size=self.STREAM_BATCH_SIZE):
+                args, kwargs = Collective.output_from_individuals(
+                    individuals_batch,
+                    self.config.args,
+                    self.config.kwargs
+                )
+                result = method(args, kwargs)
+                self.batches.append({
+                    "boundary": individuals_batch[-1].id,
+                    "result_id": result.id,
+                    "is_contributed": False
+                })
+            self.is_exhausted = is_exhausted
             self.save()
 
-        return self.output, self.resources
+        for batch in self.batches:
+            if batch["is_contributed"]:
+                continue
+            try:
+                result = processor.async_results(batch["result_id"])
+            except DSProcessUnfinished:
+                continue
+            except DSProcessError:
+                self.state = GrowthState.ERROR
+                self.save()
+                raise
+            self.add_metrics()
+            self.metrics["timings"]["network"] = self.get_network_time()  # streams overlap with the network
+            self.contribute_results(processor, result, reset=False)
+            batch["is_contributed"] = True
+            self.save()
+
+        return self.is_exhausted and all(batch["is_contributed"] for batch in self.batches)
+
+    def get_callback(self):
+        """
+        Returns a Celery signature that continues to grow the Community when a task of this Growth is done.
+        This way asynchronous Communities grow without anybody polling them.
+
+        :return: signature of core.grow_community
+        """
+        from core.tasks.community import grow_community
+        return grow_community.si(self.community.__class__.__name__, self.community_id)
 
     def prepare_contributions(self, success_resources):
         if not success_resources.exists() or not self.contribute:
@@ -167,35 +370,72 @@ class Growth(models.Model, ProcessorMixin):
                 ))
                 success_resource.retain(self)
 
-    def append_to_output(self, contributions):
+    def append_to_output(self, contributions, reset=True):
         assert isinstance(self.output, Collective), "append_to_output expects a Collective as output"
-        self.output.update(contributions)
+        self.output.update(contributions, reset=reset)
 
-    def inline_by_key(self, contributions, inline_key):
+    def inline_by_key(self, contributions, inline_key, batch_size=500):
         assert isinstance(self.output, Collective), "inline_by_key expects a Collective as output"
         original_identifier = self.output.identifier
         assert original_identifier == inline_key, \
             "Identifier of output '{}' does not match inline key '{}'".format(original_identifier, inline_key)
         self.output.identifier = "{}.{}".format(original_identifier, original_identifier)
         self.output.save()
-        for contribution in contributions:
-            affected_individuals = self.output.individual_set.filter(identity=contribution[inline_key])
-            for individual in affected_individuals.iterator():
-                individual.properties[inline_key] = contribution
-                individual.clean()
-                individual.save()
-
-    def update_by_key(self, contributions, update_key):
+
+        def inline(individual, contribution):
+            individual.properties[inline_key] = contribution
+
+        self.contribute_by_key(contributions, inline_key, inline, batch_size=batch_size)
+
+    def update_by_key(self, contributions, update_key, batch_size=500):
         assert isinstance(self.output, Collective), "update_by_key expects a Collective as output"
-        for contribution in contributions:
-            identifier = self.output.identifier
-            assert identifier == update_key, \
-                "Identifier of output '{}' does not match update key '{}'".format(identifier, update_key)
-            affected_individuals = self.output.individual_set.filter(identity=contribution[update_key])
-            for individual in affected_individuals.iterator():
-                individual.update(contribution)
-                individual.clean()
-                individual.save()
+        identifier = self.output.identifier
+        assert identifier == update_key, \
+            "Identifier of output '{}' does not match update key '{}'".format(identifier, update_key)
+
+        def update(individual, contribution):
+            individual.properties.update(contribution)
+            Individual.validate(individual.properties, individual.schema)
+
+        self.contribute_by_key(contributions, update_key, update, batch_size=batch_size)
+
+    def contribute_by_key(self, contributions, key, merge, batch_size=500):
+        """
+        Merges contributions into the Individuals of the output that have the value of key in the contribution
+        as identity. Several Individuals may share an identity and they all receive the contribution.
+        Contributions get handled in batches. Every batch loads the affected Individuals with a single query,
+        merges all contributions in memory in the order they are given and writes the changes with a few queries.
+        Each batch is a single transaction.
+
+        :param contributions: (iterable) dicts that hold the key
+        :param key: (str) the key of contributions that holds the identity
+        :param merge: (callable) gets called with an Individual and a contribution to merge them
+        :param batch_size: (int) amount of contributions per batch
+        :return: None
+        """
+        for batch in ibatch(contributions, batch_size=batch_size):
+            identities = [contribution[key] for contribution in batch]
+            identity_filter = Q(identity__in=[str(identity) for identity in identities if identity is not None])
+            if None in identities:
+                identity_filter |= Q(identity__isnull=True)
+            with transaction.atomic():
+                individuals_by_identity = {}
+                for individual in self.output.individual_set.filter(identity_filter).iterator():
+                    individuals_by_identity.setdefault(individual.identity, []).append(individual)
+                affected_individuals = {}
+                for contribution in batch:
+                    identity = contribution[key]
+                    for individual in individuals_by_identity.get(str(identity) if identity is not None else None, []):
+                        merge(individual, contribution)
+                        individual.clean()
+                        affected_individuals[individual.id] = individual
+                now = datetime.now()
+                for individual in affected_individuals.values():
+                    individual.modified_at = now
+                bulk_update(
+                    list(affected_individuals.values()),
+                    ["properties", "identity", "index", "modified_at"]
+                )
 
     def save(self, *args, **kwargs):
         self.is_finished = self.state in [GrowthState.COMPLETE, GrowthState.PARTIAL]
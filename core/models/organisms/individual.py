@@ -1,6 +1,5 @@
 from itertools import repeat
 
-import jsonschema
 from jsonschema.exceptions import ValidationError as SchemaValidationError
 
 from django.db import models
@@ -11,6 +10,7 @@ import json_field
 
 from core.models.organisms import Organism
 from core.utils.data import reach
+from core.utils.schemas import validate, validate_batch
 
 
 class Individual(Organism):
@@ -42,23 +42,44 @@ class Individual(Organism):
         :param schema: The JSON schema to use for validation.
         :return: Valid data
         """
-
-        if isinstance(data, dict):
-            properties = data
-        elif isinstance(data, Individual):
-            properties = data.properties
-        else:
-            raise ValidationError(
-                "An Individual can only work with a dict as data and got {} instead".format(type(data))
-            )
-
         try:
-            jsonschema.validate(properties, schema)
+            validate(Individual.get_properties(data), schema)
         except SchemaValidationError as exc:
             djang_exception = ValidationError(exc.message)
             djang_exception.schema = exc.schema
             raise djang_exception
 
+    @staticmethod
+    def validate_batch(data, schema):
+        """
+        Validates a list of data against given schema with a single validator.
+        The raised ValidationError holds the schema errors for every invalid item by index under errors.
+
+        :param data: The list of dicts or Individuals to validate
+        :param schema: The JSON schema to use for validation.
+        :return: None
+        """
+        errors = validate_batch([Individual.get_properties(instance) for instance in data], schema)
+        if not errors:
+            return
+        index, exc = min(errors.items(), key=lambda item: item[0])
+        djang_exception = ValidationError(
+            "{} invalid item(s), first at index {}: {}".format(len(errors), index, exc.message)
+        )
+        djang_exception.schema = exc.schema
+        djang_exception.errors = errors
+        raise djang_exception
+
+    @staticmethod
+    def get_properties(data):
+        if isinstance(data, dict):
+            return data
+        elif isinstance(data, Individual):
+            return data.properties
+        raise ValidationError(
+            "An Individual can only work with a dict as data and got {} instead".format(type(data))
+        )
+
     def update(self, data, validate=True):
         """
         Update the properties and spirit with new data.
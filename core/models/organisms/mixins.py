@@ -3,13 +3,14 @@ from core.processors.base import Processor
 
 class ProcessorMixin(object):
 
-    def prepare_process(self, process, async=False, extra_config=None):
+    def prepare_process(self, process, async=False, extra_config=None, link=None):
         """
         Creates an instance of the processor based on requested process with a correct config set.
         Processors get loaded from core.processors
         It returns the processor and the method that should be invoked.
 
         :param process: A dotted string indicating the processor and method that represent the process.
+        :param link: (optional) Celery signature to call when an async method is done, whether it failed or not
         :return: processor, method
         """
         assert isinstance(extra_config, (dict, type(None))), \
@@ -29,6 +30,9 @@ class ProcessorMixin(object):
         processor = processor_class(config=config)
         method, args_type = processor.get_processor_method(method_name)
         if async:
+            if link is not None:
+                method.link(link)
+                method.link_error(link)
             method = getattr(method, "delay")
         if not callable(method):
             raise AssertionError("{} is not a callable property on {}.".format(method_name, processor))
@@ -38,17 +38,21 @@ class TestCollective(TransactionTestCase):
         except ValueError:
             pass
 
-    @patch('core.models.organisms.collective.Individual.validate')
+    @patch('core.models.organisms.collective.Individual.validate_batch')
     def test_validate_queryset(self, validate_method):
         self.instance.validate(self.instance.individual_set.all(), self.instance.schema)
-        for ind in self.instance.individual_set.all():
-            validate_method.assert_any_call(ind, self.instance.schema)
+        self.assertEqual(validate_method.call_count, 1)
+        args, kwargs = validate_method.call_args
+        self.assertEqual(list(args[0]), list(self.instance.individual_set.all()))
+        self.assertEqual(args[1], self.instance.schema)
 
-    @patch('core.models.organisms.collective.Individual.validate')
+    @patch('core.models.organisms.collective.Individual.validate_batch')
     def test_validate_content(self, validate_method):
         self.instance.validate(self.instance.content, self.instance.schema)
-        for ind in self.instance.content:
-            validate_method.assert_any_call(ind, self.instance.schema)
+        self.assertEqual(validate_method.call_count, 1)
+        args, kwargs = validate_method.call_args
+        self.assertEqual(list(args[0]), list(self.instance.content))
+        self.assertEqual(args[1], self.instance.schema)
 
     def get_update_list_and_ids(self, value):
         updates = []
@@ -59,7 +63,7 @@ class TestCollective(TransactionTestCase):
             updates.append(individual) if index % 2 else updates.append(individual.properties)
         return updates, individual_ids
 
-    @patch('core.models.organisms.collective.Individual.validate')
+    @patch('core.models.organisms.collective.Individual.validate_batch')
     @patch('core.models.organisms.collective.Collective.influence')
     def test_update(self, influence_method, validate_method):
         updates, individual_ids = self.get_update_list_and_ids(value="value 3")
@@ -82,7 +86,9 @@ class TestCollective(TransactionTestCase):
             # NB: no need to fetch community as this has been done
             # Query 2: insert individuals
             self.instance2.update(updates, validate=True, reset=True)
-        self.assertEqual(validate_method.call_count, 5)
+        self.assertEqual(validate_method.call_count, 1)
+        args, kwargs = validate_method.call_args
+        self.assertEqual(len(args[0]), 5)
         self.assertEqual(influence_method.call_count, 5)
         self.assertEqual(self.instance2.individual_set.count(), 5)
         for individual in self.instance2.individual_set.all():
@@ -96,7 +102,7 @@ class TestCollective(TransactionTestCase):
             # NB: no need to fetch community as this has been done
             # Query 1: insert individuals
             self.instance2.update(updates, validate=True, reset=False)
-        self.assertEqual(validate_method.call_count, 10)
+        self.assertEqual(validate_method.call_count, 2)
         self.assertEqual(influence_method.call_count, 5)
         self.assertEqual(self.instance2.individual_set.count(), 10)
         new_ids = []
@@ -1,5 +1,8 @@
 from __future__ import unicode_literals
 
+from copy import deepcopy
+from datetime import timedelta
+
 from django.test import TestCase
 
 from mock import Mock, patch
@@ -8,6 +11,7 @@ from core.models.organisms import Individual, Collective, Growth, Community, Org
 from core.models.organisms.community import CommunityState
 from core.models.organisms.growth import GrowthState
 from core.tests.mocks.community import CommunityMock
+from core.tasks.community import grow_community
 from core.tests.mocks.http import HttpResourceMock, MockErrorQuerySet
 from core.exceptions import DSProcessUnfinished, DSProcessError
 
@@ -68,6 +72,34 @@ class TestCommunityMock(CommunityTestMixin):
         self.instance.call_finish_callback("phase1", "output", "errors")
         self.assertTrue(self.instance.finish_phase1.called)
 
+    def test_get_predecessor(self):
+        self.assertIsNone(self.instance.get_predecessor())
+        self.assertIsNone(self.error.get_predecessor())
+        self.complete.state = CommunityState.READY
+        self.complete.save()
+        self.assertEqual(self.error.get_predecessor(), self.complete)
+        self.assertIsNone(self.complete.get_predecessor())
+
+    def test_call_reuse_callback(self):
+        growth = self.error.growth_set.get(type="phase1")
+        previous = Growth.objects.get(id=1)
+        previous.community = self.complete
+        previous.save()
+        self.error.reuse_phase1 = Mock()
+        # Without reuse in the spirit, a predecessor or a finished Growth nothing gets reused
+        self.assertFalse(self.error.call_reuse_callback(growth))
+        self.error.COMMUNITY_SPIRIT = deepcopy(CommunityMock.COMMUNITY_SPIRIT)
+        self.error.COMMUNITY_SPIRIT["phase1"]["reuse"] = True
+        self.assertFalse(self.error.call_reuse_callback(growth))
+        self.complete.state = CommunityState.READY
+        self.complete.save()
+        self.assertTrue(self.error.call_reuse_callback(growth))
+        self.error.reuse_phase1.assert_called_once_with(growth, previous)
+        previous.state = GrowthState.PROCESSING
+        previous.save()
+        self.assertFalse(self.error.call_reuse_callback(growth))
+        self.assertEqual(self.error.reuse_phase1.call_count, 1)
+
     def test_create_organism(self):
         result = self.instance.create_organism("Individual", {"test": "test"})
         self.assertGreater(result.id, 0)
@@ -310,6 +342,293 @@ class TestCommunityMock(CommunityTestMixin):
         self.assertEqual(self.instance.current_growth.id, self.instance.growth_set.last().id)
         self.assertEqual(self.instance.state, CommunityState.READY)
 
+    def test_get_growth_status(self):
+        status = CommunityMock.get_growth_status(self.instance.id)
+        self.assertEqual(status, {"state": CommunityState.NEW, "growths": [], "finished": 0, "total": 0})
+        self.instance.setup_growth()
+        growth = self.instance.growth_set.first()
+        growth.state = GrowthState.COMPLETE
+        growth.save()
+        status = CommunityMock.get_growth_status(self.instance.id)
+        self.assertEqual(status["finished"], 1)
+        self.assertEqual(status["total"], 3)
+        self.assertEqual(status["growths"][0], {"type": "phase1", "state": GrowthState.COMPLETE, "is_finished": True})
+        self.assertEqual([growth["type"] for growth in status["growths"]], ["phase1", "phase2", "phase3"])
+        self.assertIsNone(CommunityMock.get_growth_status(0))
+
+    @patch("core.models.organisms.community.Growth.begin")
+    def test_grow_exclusive(self, begin_growth):
+        self.set_callback_mocks()
+        with patch("core.models.organisms.community.Growth.finish", side_effect=self.raise_unfinished):
+            try:
+                self.instance.grow_exclusive()
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+        instance = CommunityMock.objects.get(id=self.instance.id)
+        self.assertEqual(instance.state, CommunityState.ASYNC)
+        self.assertEqual(instance.growth_set.count(), 3)
+        self.assertEqual(instance.current_growth.id, instance.growth_set.first().id)
+        begin_growth.assert_called_once_with()
+
+    @patch("core.models.organisms.community.Growth.begin")
+    def test_grow_exclusive_eager_callback(self, begin_growth):
+        # A Growth task that finishes before its dispatch commits calls back while the Community is still locked
+        callback_states = []
+        begin_growth.side_effect = lambda: callback_states.append(grow_community("CommunityMock", self.instance.id))
+        self.set_callback_mocks()
+        with patch("core.models.organisms.community.Growth.finish", side_effect=self.raise_unfinished) as finish:
+            try:
+                self.instance.grow_exclusive()
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertEqual(callback_states, [CommunityState.ASYNC])
+            self.assertEqual(finish.call_count, 2)  # the callback tried to continue the Community
+        self.assertFalse(self.instance.grow_exclusive(states=[CommunityState.NEW]))
+        begin_growth.assert_called_once_with()
+
+    def test_is_stalled(self):
+        self.assertFalse(self.instance.is_stalled())
+        self.instance.state = CommunityState.ASYNC
+        self.instance.save()
+        self.assertFalse(self.instance.is_stalled())
+        self.instance.modified_at -= timedelta(seconds=CommunityMock.ASYNC_STALE_AFTER + 1)
+        self.assertTrue(self.instance.is_stalled())
+        self.instance.state = CommunityState.READY
+        self.assertFalse(self.instance.is_stalled())
+
+    @staticmethod
+    def eager_group(signatures):
+        signatures = list(signatures)
+        return Mock(delay=lambda: [signature() for signature in signatures])
+
+    def get_fan_out_spirit(self):
+        spirit = deepcopy(CommunityMock.COMMUNITY_SPIRIT)
+        spirit["phase2"]["output"] = "Collective"
+        spirit["phase3"]["input"] = "@phase1"
+        return spirit
+
+    def test_growth_dependencies(self):
+        self.instance.setup_growth()
+        dependencies = self.instance.growth_dependencies(list(self.instance.growth_set.all()))
+        self.assertEqual(list(dependencies.keys()), ["phase1", "phase2", "phase3"])
+        self.assertEqual(dependencies["phase1"], set())
+        self.assertEqual(dependencies["phase2"], {"phase1"})
+        self.assertEqual(dependencies["phase3"], {"phase1", "phase2"})
+        spirit = self.get_fan_out_spirit()
+        with patch.object(CommunityMock, "COMMUNITY_SPIRIT", spirit):
+            self.instance.growth_set.all().delete()
+            self.instance.setup_growth()
+            dependencies = self.instance.growth_dependencies(list(self.instance.growth_set.all()))
+            self.assertEqual(dependencies["phase2"], {"phase1"})
+            self.assertEqual(dependencies["phase3"], {"phase1"})
+            spirit["phase3"]["dependencies"] = ["phase2"]
+            dependencies = self.instance.growth_dependencies(list(self.instance.growth_set.all()))
+            self.assertEqual(dependencies["phase3"], {"phase1", "phase2"})
+
+    def test_setup_stream(self):
+        spirit = deepcopy(CommunityMock.COMMUNITY_SPIRIT)
+        spirit["phase3"]["stream"] = True
+        with patch.object(CommunityMock, "COMMUNITY_SPIRIT", spirit):
+            self.instance.setup_growth()
+        growth1, growth2, growth3 = self.instance.growth_set.all()
+        self.assertIsNone(growth1.batches)
+        self.assertEqual(growth2.batches, [])
+        self.assertEqual(growth3.batches, [])
+        spirit["phase2"]["stream"] = True
+        with patch.object(CommunityMock, "COMMUNITY_SPIRIT", spirit):
+            self.assertRaises(AssertionError, self.instance.setup_growth)
+
+    @patch("core.models.organisms.community.Growth.stream")
+    def test_grow_stream_async(self, stream_growth):
+
+        def begin(growth):
+            growth.state = GrowthState.PROCESSING
+            growth.save()
+
+        def finish(growth, result):
+            if growth.type not in finished_types:
+                raise DSProcessUnfinished("Raised for test")
+            growth.state = GrowthState.COMPLETE
+            growth.save()
+            return growth.output, MockErrorQuerySet
+
+        finished_types = []
+        spirit = self.get_fan_out_spirit()
+        spirit["phase2"]["stream"] = True
+        self.set_callback_mocks()
+        with patch.object(CommunityMock, "COMMUNITY_SPIRIT", spirit), \
+                patch.object(Growth, "begin", autospec=True, side_effect=begin) as begin_growth, \
+                patch.object(Growth, "finish", autospec=True, side_effect=finish):
+            try:
+                self.instance.grow()  # start growth and stream
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            first_growth, second_growth, third_growth = self.instance.growth_set.all()
+            self.assertEqual(self.instance.current_growth.id, first_growth.id)
+            self.assertEqual(begin_growth.call_count, 2)
+            self.assertEqual(self.instance.call_begin_callback.call_count, 2)
+            self.instance.call_begin_callback.assert_called_with("phase2", second_growth.input)
+            self.assertFalse(stream_growth.called)
+
+            try:
+                self.instance.grow()  # continue stream
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertEqual(begin_growth.call_count, 2)
+            self.assertEqual(stream_growth.call_count, 1)
+
+            self.set_callback_mocks()
+            finished_types.append("phase1")
+            try:
+                self.instance.grow()  # first stage done, second stage continues streaming
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertEqual(self.instance.current_growth.id, second_growth.id)
+            self.assertEqual(begin_growth.call_count, 2)
+            self.assertFalse(self.instance.call_begin_callback.called)
+            self.instance.call_finish_callback.assert_called_once_with("phase1", first_growth.output, MockErrorQuerySet)
+
+    @patch("core.models.CommunityMock.set_kernel")
+    def test_grow_parallel_async(self, set_kernel):
+
+        def begin(growth):
+            growth.state = GrowthState.PROCESSING
+            growth.save()
+
+        def finish(growth, result):
+            if growth.type not in finished_types:
+                raise DSProcessUnfinished("Raised for test")
+            growth.state = GrowthState.COMPLETE
+            growth.save()
+            return growth.output, MockErrorQuerySet
+
+        finished_types = []
+        self.set_callback_mocks()
+        with patch.object(CommunityMock, "PARALLEL_GROWTH", True), \
+                patch.object(CommunityMock, "COMMUNITY_SPIRIT", self.get_fan_out_spirit()), \
+                patch.object(Growth, "begin", autospec=True, side_effect=begin) as begin_growth, \
+                patch.object(Growth, "finish", autospec=True, side_effect=finish), \
+                patch("core.models.organisms.community.transaction.on_commit") as on_commit, \
+                patch("core.models.organisms.community.group", side_effect=self.eager_group):
+            try:
+                self.instance.grow()  # start growth
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            first_growth, second_growth, third_growth = self.instance.growth_set.all()
+            self.assertEqual(self.instance.current_growth.id, first_growth.id)
+            self.instance.call_begin_callback.assert_called_once_with("phase1", first_growth.input)
+            self.assertEqual(begin_growth.call_count, 1)
+            self.assertEqual(self.instance.state, CommunityState.ASYNC)
+
+            self.set_callback_mocks()
+            begin_growth.reset_mock()
+            try:
+                self.instance.grow()  # continue growth in background
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertFalse(self.instance.call_begin_callback.called)
+            self.assertFalse(self.instance.call_finish_callback.called)
+            self.assertFalse(begin_growth.called)
+
+            finished_types.append("phase1")
+            try:
+                self.instance.grow()  # first stage done, queue second and third stage together
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertEqual(self.instance.current_growth.id, third_growth.id)
+            self.instance.call_finish_callback.assert_called_once_with("phase1", first_growth.output, MockErrorQuerySet)
+            self.assertEqual(self.instance.call_begin_callback.call_count, 2)
+            self.assertFalse(begin_growth.called)
+            self.assertEqual(
+                sorted(self.instance.growth_set.values_list("state", flat=True)),
+                sorted([GrowthState.COMPLETE, GrowthState.QUEUED, GrowthState.QUEUED])
+            )
+
+            self.set_callback_mocks()
+            try:
+                self.instance.grow()  # queued stages neither begin nor finish before the transaction commits
+                self.fail("Unfinished community didn't raise any exception.")
+            except DSProcessUnfinished:
+                pass
+            self.assertFalse(self.instance.call_begin_callback.called)
+            self.assertFalse(self.instance.call_finish_callback.called)
+            self.assertFalse(begin_growth.called)
+
+            self.assertEqual(on_commit.call_count, 1)
+            dispatch = on_commit.call_args[0][0]
+            dispatch()  # the transaction commits and the tasks begin the queued stages
+            self.assertEqual(begin_growth.call_count, 2)
+            self.assertEqual(
+                sorted(self.instance.growth_set.values_list("state", flat=True)),
+                sorted([GrowthState.COMPLETE, GrowthState.PROCESSING, GrowthState.PROCESSING])
+            )
+
+            self.set_callback_mocks()
+            begin_growth.reset_mock()
+            finished_types += ["phase2", "phase3"]
+            done = self.instance.grow()  # all stages done
+            self.assertTrue(done)
+            self.assertEqual(self.instance.call_finish_callback.call_count, 2)
+            self.assertFalse(begin_growth.called)
+            self.assertEqual(self.instance.current_growth.id, third_growth.id)
+            self.assertEqual(self.instance.state, CommunityState.READY)
+            self.assertEqual(set_kernel.call_count, 1)
+
+    @patch("core.models.CommunityMock.set_kernel")
+    def test_grow_parallel_exclusive(self, set_kernel):
+
+        def begin(growth):
+            growth.state = GrowthState.PROCESSING
+            growth.save()
+
+        def finish(growth, result):
+            if growth.type not in finished_types:
+                raise DSProcessUnfinished("Raised for test")
+            growth.state = GrowthState.COMPLETE
+            growth.save()
+            return growth.output, MockErrorQuerySet
+
+        finished_types = ["phase1"]
+        self.set_callback_mocks()
+        with patch.object(CommunityMock, "PARALLEL_GROWTH", True), \
+                patch.object(CommunityMock, "COMMUNITY_SPIRIT", self.get_fan_out_spirit()), \
+                patch.object(Growth, "begin", autospec=True, side_effect=begin) as begin_growth, \
+                patch.object(Growth, "finish", autospec=True, side_effect=finish), \
+                patch("core.models.organisms.community.transaction.on_commit", side_effect=lambda func: func()), \
+                patch("core.models.organisms.community.group", side_effect=self.eager_group):
+            self.assertRaises(DSProcessUnfinished, self.instance.grow_exclusive)  # start growth
+            self.assertEqual(begin_growth.call_count, 1)
+            self.assertRaises(DSProcessUnfinished, self.instance.grow_exclusive)  # begin stages in tasks
+            self.assertEqual(begin_growth.call_count, 3)
+            self.assertEqual(
+                sorted(self.instance.growth_set.values_list("state", flat=True)),
+                sorted([GrowthState.COMPLETE, GrowthState.PROCESSING, GrowthState.PROCESSING])
+            )
+            finished_types += ["phase2", "phase3"]
+            self.assertTrue(self.instance.grow_exclusive())
+        self.assertEqual(self.instance.state, CommunityState.READY)
+        self.assertEqual(self.instance.growth_set.filter(state=GrowthState.COMPLETE).count(), 3)
+        self.assertEqual(set_kernel.call_count, 1)
+
+    @patch('core.tasks.http.get_resource_link', return_value=HttpResourceMock())
+    def test_grow_parallel_sync(self, get_resource_link):
+        self.instance.config.async = False
+        self.set_callback_mocks()
+        with patch.object(CommunityMock, "PARALLEL_GROWTH", True):
+            done = self.instance.grow()
+        self.assertTrue(done)
+        self.assertEqual(self.instance.growth_set.filter(state=GrowthState.COMPLETE).count(), 3)
+        self.assertEqual(self.instance.current_growth.id, self.instance.growth_set.last().id)
+        self.assertEqual(self.instance.state, CommunityState.READY)
+
     def test_manifestation(self):
         self.complete.config.include_odd = True
         manifestation = self.complete.manifestation
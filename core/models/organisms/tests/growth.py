@@ -1,9 +1,16 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
+from time import time
+
 from mock import patch, Mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.exceptions import ValidationError
+
 from core.models.organisms.growth import Growth, GrowthState
 from core.processors import HttpResourceProcessor
+from core.tasks.community import grow_community
 from core.tests.mocks.celery import (MockTask, MockAsyncResultSuccess, MockAsyncResultPartial,
                                     MockAsyncResultError, MockAsyncResultWaiting)
 from core.tests.mocks.http import HttpResourceMock
@@ -114,6 +121,52 @@ class TestGrowth(TestProcessorMixin):
         self.assertEqual(self.collective_input.state, GrowthState.CONTRIBUTE)
         self.assertFalse(self.collective_input.is_finished)
 
+    def test_begin_links_callback(self):
+        with patch('core.tasks.http.send_mass.s', return_value=MockTask):
+            self.collective_input.begin()
+        callback = grow_community.si("CommunityMock", 1)
+        MockTask.link.assert_called_once_with(callback)
+        MockTask.link_error.assert_called_once_with(callback)
+        MockTask.reset_mock()
+        self.new.config = {"async": False}
+        with patch('core.tasks.http.send.s', return_value=MockTask):
+            self.new.begin()
+        self.assertFalse(MockTask.link.called)
+
+    def test_stream(self):
+        self.collective_input.batches = []
+        self.collective_input.contribute_results = Mock(return_value=[])
+        with patch.object(Growth, "STREAM_BATCH_SIZE", 2), \
+                patch('core.tasks.http.send_mass.s', return_value=MockTask):
+            self.collective_input.begin()
+        self.assertEqual(MockTask.delay.call_count, 2)
+        MockTask.delay.assert_any_call(
+            [["nested value 0"], ["nested value 1"]],
+            [{"context": "nested value"}, {"context": "nested value"}]
+        )
+        MockTask.delay.assert_called_with([["nested value 2"]], [{"context": "nested value"}])
+        self.assertEqual(self.collective_input.state, GrowthState.PROCESSING)
+        self.assertTrue(self.collective_input.is_exhausted)
+        self.assertEqual(len(self.collective_input.batches), 2)
+        self.assertLess(self.collective_input.batches[0]["boundary"], self.collective_input.batches[1]["boundary"])
+        with patch('core.processors.resources.AsyncResult',
+                   side_effect=[MockAsyncResultSuccess, MockAsyncResultWaiting]):
+            try:
+                self.collective_input.finish(None)
+                self.fail("Growth.finish did not raise when a batch was still processing")
+            except DSProcessUnfinished:
+                pass
+        self.assertEqual(self.collective_input.contribute_results.call_count, 1)
+        self.assertEqual([batch["is_contributed"] for batch in self.collective_input.batches], [True, False])
+        self.assertFalse(self.collective_input.is_finished)
+        with patch('core.processors.resources.AsyncResult', return_value=MockAsyncResultSuccess) as async_result:
+            self.collective_input.finish(None)
+        self.assertEqual(async_result.call_count, 1)
+        self.assertEqual(self.collective_input.contribute_results.call_count, 2)
+        self.assertEqual(MockTask.delay.call_count, 2)
+        self.assertEqual(self.collective_input.state, GrowthState.COMPLETE)
+        self.assertTrue(self.collective_input.is_finished)
+
     def test_begin_with_processing_state(self):
         try:
             self.processing.begin()
@@ -325,6 +378,65 @@ class TestGrowth(TestProcessorMixin):
             "value"  # doesn't update in contrast to inline_by_key
         )
 
+    def test_update_by_key_shared_identity(self):
+        output = self.collective_input.output
+        shared = output.individual_set.get(identity="nested value 0")
+        shared.id = None
+        shared.save()
+        contributions = [
+            {"value": "nested value 0", "extra": "first"},
+            {"value": "nested value 1", "extra": "second"},
+            {"value": "nested value 0", "extra": "third"},
+            {"value": "missing", "extra": "fourth"},
+        ]
+        with CaptureQueriesContext(connection) as capture:
+            self.collective_input.update_by_key(contributions, "value", batch_size=2)
+        self.assertLess(len(capture.captured_queries), 15)
+        extras = {
+            individual.id: (individual.identity, individual.properties.get("extra"),)
+            for individual in output.individual_set.all()
+        }
+        self.assertEqual(len(extras), 4)
+        self.assertEqual(extras[3], ("nested value 0", "third",))
+        self.assertEqual(extras[shared.id], ("nested value 0", "third",))
+        self.assertEqual(extras[4], ("nested value 1", "second",))
+        self.assertEqual(extras[5], ("nested value 2", None,))
+
+    def test_update_by_key_invalid(self):
+        contributions = [
+            {"value": "nested value 0", "extra": "valid"},
+            {"value": "nested value 1", "extra": 1},
+        ]
+        self.assertRaises(ValidationError, self.collective_input.update_by_key, contributions, "value", batch_size=1)
+        output = self.collective_input.output
+        self.assertEqual(output.individual_set.get(identity="nested value 0").properties["extra"], "valid")
+        self.assertNotIn("extra", output.individual_set.get(identity="nested value 1").properties)
+
+    @patch('core.processors.resources.AsyncResult', return_value=MockAsyncResultPartial)
+    def test_metrics(self, async_result):
+        self.assertIsNone(self.processing.metrics)
+        self.processing.metrics = {"dispatched_at": time() - 10}
+        self.processing.finish("result")
+        metrics = Growth.objects.get(id=self.processing.id).metrics
+        self.assertEqual(sorted(metrics["timings"].keys()), sorted(Growth.METRICS_PHASES))
+        self.assertGreaterEqual(metrics["timings"]["network"], 10)
+        self.assertGreater(metrics["queries"]["count"], 0)
+        self.assertEqual(metrics["resources"], {"fetched": 0, "cached": 3})
+        self.assertEqual(metrics["errors"], {"502": 2})
+        # Metrics of a begin, for instance of a retry, add up to the metrics of earlier attempts
+        self.collective_input.metrics = metrics
+        self.collective_input.config = {"async": False}
+        with patch('core.tasks.http.send_mass.s', return_value=MockTask):
+            self.collective_input.begin()
+        metrics = self.collective_input.metrics
+        self.assertGreater(metrics["timings"]["begin"], 0)
+        self.assertIn("dispatched_at", metrics)
+        self.assertEqual(metrics["resources"], {"fetched": 0, "cached": 3})
+        self.collective_input.add_metrics(resources={"fetched": 2}, errors={"404": 1})
+        self.collective_input.add_metrics(resources={"fetched": 1, "cached": 1}, errors={"404": 1, "502": 1})
+        self.assertEqual(metrics["resources"], {"fetched": 3, "cached": 4})
+        self.assertEqual(metrics["errors"], {"404": 2, "502": 3})
+
     def test_is_finished(self):
         self.new.state = GrowthState.COMPLETE
         self.new.save()
@@ -4,6 +4,7 @@ from mock import patch
 from json import loads
 
 from django.test import TestCase
+from django.core.exceptions import ValidationError
 
 from core.models.organisms import Individual
 
@@ -58,6 +59,18 @@ class TestIndividual(TestCase):
     def test_validate(self):
         self.skipTest("not tested (should validate with Individual and dicts)")
 
+    def test_validate_batch(self):
+        schema = self.instance.schema
+        Individual.validate_batch([self.instance, self.expected_content], schema)
+        invalid = dict(self.expected_content, value=1)
+        try:
+            Individual.validate_batch([self.instance, invalid, {}], schema)
+            self.fail("Individual.validate_batch did not raise ValidationError for invalid data")
+        except ValidationError as exc:
+            self.assertEqual(sorted(exc.errors.keys()), [1, 2])
+            self.assertEqual(exc.schema, schema["properties"]["value"])
+        self.assertRaises(ValidationError, Individual.validate_batch, ["invalid"], schema)
+
     @patch('core.models.organisms.collective.Collective.influence')
     def test_clean_without_collective(self, influence_method):
         self.instance.collective = None
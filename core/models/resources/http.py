@@ -1,12 +1,13 @@
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
 
 import hashlib
 import json
+import logging
 from copy import copy, deepcopy
 from datetime import datetime
+from time import sleep
 
 import requests
-import jsonschema
 from jsonschema.exceptions import ValidationError as SchemaValidationError
 from urlobject import URLObject
 from bs4 import BeautifulSoup
@@ -20,7 +21,22 @@ from django.conf import settings
 import json_field
 
 from core.models.resources.resource import Resource
-from core.exceptions import DSHttpError50X, DSHttpError40X
+from core.models.resources.limits import RateLimitBucket, DailyQuota
+from core.utils.helpers import ibatch
+from core.utils.http import get_shared_session
+from core.utils.compression import CompressedTextField
+from core.utils.schemas import validate
+from core.exceptions import (DSHttpError50X, DSHttpError40X, DSResourceException, DSHttpError429TooManyRequests,
+                             DSQuotaExhausted)
+
+
+log = logging.getLogger("datascope")
+
+
+class Freshness(object):
+    FRESH = "Fresh"
+    STALE = "Stale"
+    EXPIRED = "Expired"
 
 
 class HttpResource(Resource):
@@ -42,8 +58,9 @@ class HttpResource(Resource):
 
     # Storing data
     head = json_field.JSONField(default=None)
-    body = models.TextField(default=None)
+    body = CompressedTextField(default=None)
     status = models.PositiveIntegerField(default=None)
+    validated_at = models.DateTimeField(null=True, blank=True)
 
     # Class constants that determine behavior
     URI_TEMPLATE = ""
@@ -59,6 +76,45 @@ class HttpResource(Resource):
         "kwargs": {}
     }
 
+    # Freshness policy in seconds, which gets measured from the last response.
+    # Successful responses stay fresh forever when FRESHNESS_TTL is None.
+    # During FRESHNESS_STALE_WHILE_REVALIDATE after the TTL stale responses get used, while revalidating in background.
+    # Not found responses get used instead of a new request during FRESHNESS_NEGATIVE_TTL.
+    FRESHNESS_TTL = None
+    FRESHNESS_STALE_WHILE_REVALIDATE = 0
+    FRESHNESS_NEGATIVE_TTL = 0
+
+    # Fields that revalidate restores when revalidation fails, so the stored response stays in use.
+    REVALIDATION_FIELDS = ["request", "head", "body", "status", "validated_at", "modified_at"]
+
+    # Headers of a response with concatenated arguments that don't apply to the responses split from it.
+    SPLIT_EXCLUDED_HEADERS = ["etag", "last-modified", "content-length", "content-md5"]
+
+    # Requests per second and the amount of requests that may be made at once, shared by all processes.
+    # Requests get counted per RATE_LIMIT_KEY, which defaults to the host of the request.
+    # When DAILY_QUOTA is set requests fail with a 429 status once the quota of the current day is used.
+    RATE_LIMIT = None
+    RATE_LIMIT_BURST = 1
+    RATE_LIMIT_KEY = None
+    DAILY_QUOTA = None
+
+    # Responses with a status in RETRY_STATUSES get sent again by send_serie, until MAX_RETRIES is reached.
+    # The delay starts at RETRY_BACKOFF seconds and doubles every attempt up to RETRY_BACKOFF_MAX seconds,
+    # unless the response asks for a longer delay through its Retry-After header.
+    RETRY_STATUSES = []
+    MAX_RETRIES = 0
+    RETRY_BACKOFF = 5
+    RETRY_BACKOFF_MAX = 300
+
+    # Parser used by BeautifulSoup for HTML bodies. Subclasses may choose "lxml" when that package is installed.
+    HTML_PARSER = "html.parser"
+
+    # Set to a HttpResourceCache to look up stored resources in bulk
+    cache = None
+    _session = None
+    _not_modified = False
+    _content_cache = None
+
     #######################################################
     # PUBLIC FUNCTIONALITY
     #######################################################
@@ -74,6 +130,7 @@ class HttpResource(Resource):
         :return: HttpResource
         """
         if not self.request:
+            args, kwargs = self.request_arguments(method, *args, **kwargs)
             self.request = self._create_request(method, *args, **kwargs)
             self.uri = HttpResource.uri_from_url(self.request.get("url"))
             self.data_hash = HttpResource.hash_from_data(
@@ -85,24 +142,93 @@ class HttpResource(Resource):
         self.clean()  # sets self.uri and self.data_hash based on request
         resource = None
         try:
-            resource = self.__class__.objects.get(
-                uri=self.uri,
-                data_hash=self.data_hash
-            )
+            if self.cache is not None:
+                resource = self.cache.get(self.uri, self.data_hash)
+            else:
+                resource = self.__class__.objects.get(
+                    uri=self.uri,
+                    data_hash=self.data_hash
+                )
             self.validate_request(resource.request)
         except (self.DoesNotExist, ValidationError):
             if resource is not None:
                 resource.delete()
             resource = self
 
-        if resource.success:
+        freshness = resource.freshness if resource.id else Freshness.EXPIRED
+        if freshness == Freshness.FRESH and not resource.success:
+            resource._handle_errors()  # raises the error of the negatively cached response
+        elif freshness == Freshness.FRESH:
+            return resource
+        elif freshness == Freshness.STALE and getattr(self.config, "async", True):  # NB: not every config has async
+            resource.revalidate_later()
+            return resource
+        elif freshness == Freshness.STALE:
+            resource.revalidate()
             return resource
 
         resource.request = resource.request_with_auth()
-        resource._send()
+        try:
+            resource._send()
+        except DSQuotaExhausted as exc:
+            # Only this request fails, so that series of requests keep the results that were gathered already
+            resource.set_error(429, connection_error=True)
+            raise DSHttpError429TooManyRequests(str(exc), resource=resource)
         resource._handle_errors()
         return resource
 
+    def request_arguments(self, method, *args, **kwargs):
+        """
+        Returns the arguments and keyword arguments that send creates a request with.
+        Resources that complete arguments, for instance from their configuration, should override this
+        instead of send, so that request_key finds the same responses as send.
+
+        :return: (tuple) args and kwargs
+        """
+        return args, kwargs
+
+    def request_key(self, method, *args, **kwargs):
+        """
+        Returns the uri and data_hash under which send would store or look up the response to a request.
+        Unlike send this doesn't have any side effects, like sending requests or querying the database.
+
+        :param method: the HTTP method of the request
+        :return: (tuple) uri and data_hash
+        :raises ValidationError: when arguments are invalid for this resource
+        """
+        args, kwargs = self.request_arguments(method, *args, **kwargs)
+        request = self._create_request(method, *args, **kwargs)
+        uri = HttpResource.uri_from_url(request.get("url"))[:255]
+        return uri, HttpResource.hash_from_data(request.get("data"))
+
+    @classmethod
+    def expire_requests(cls, method, args_list, kwargs_list, config=None, batch_size=500):
+        """
+        Deletes stored responses to requests with the given arguments, so that these requests get sent again.
+        Arguments that are invalid for this resource get ignored.
+
+        :param method: the HTTP method of the requests
+        :param args_list: (list) arguments of every request
+        :param kwargs_list: (list) keyword arguments of every request
+        :param config: (optional) configuration to create the requests with
+        :param batch_size: (int) maximum amount of requests to delete with a single query
+        :return: (int) amount of deleted responses
+        """
+        keys = []
+        for args, kwargs in zip(args_list, kwargs_list):
+            try:
+                keys.append(cls(config=config).request_key(method, *args, **kwargs))
+            except ValidationError:
+                continue
+        deleted_count = 0
+        for keys_batch in ibatch(keys, batch_size):
+            for data_hash in {data_hash for uri, data_hash in keys_batch}:
+                uris = [uri for uri, key_hash in keys_batch if key_hash == data_hash]
+                expired = cls.objects.filter(uri__in=uris, data_hash=data_hash)
+                deleted_count += expired.count()
+                expired.delete()
+        return deleted_count
+
     def get(self, *args, **kwargs):
         """
 
@@ -131,19 +257,37 @@ class HttpResource(Resource):
     @property
     def content(self):
         """
+        Parses the body once and returns the same data until the body or content type changes.
+        The data is shared between calls, so callers that make changes to the data should copy it first.
 
         :return: content_type, data
         """
         if self.success:
             content_type = self.head.get("content-type", "unknown/unknown").split(';')[0]
-            if content_type == "application/json":
-                return content_type, json.loads(self.body)
-            elif content_type == "text/html":
-                return content_type, BeautifulSoup(self.body, "html.parser")
-            else:
-                return content_type, None
+            body = self.__dict__.get("body")
+            if self._content_cache is not None:
+                cached_body, cached_content_type, data = self._content_cache
+                if cached_body is body and cached_content_type == content_type:
+                    return content_type, data
+            data = self.parse_content(content_type)
+            self._content_cache = (body, content_type, data,)
+            return content_type, data
         return None, None
 
+    def parse_content(self, content_type):
+        """
+        Turns the body into python data or a soup depending on the content type.
+
+        :param content_type: (str) mime type without parameters
+        :return: data or None for unknown content types
+        """
+        if content_type == "application/json":
+            return json.loads(self.body)
+        elif content_type == "text/html":
+            return BeautifulSoup(self.body, self.HTML_PARSER)
+        else:
+            return None
+
     @property
     def meta(self):
         """
@@ -152,6 +296,58 @@ class HttpResource(Resource):
         """
         return None
 
+    @property
+    def freshness(self):
+        """
+        Returns whether the stored response may be used according to the freshness policy of the class.
+
+        :return: Freshness.FRESH, Freshness.STALE or Freshness.EXPIRED
+        """
+        validated_at = self.validated_at or self.modified_at
+        if self.success:
+            ttl = self.FRESHNESS_TTL
+        elif self.status == 404:
+            ttl = self.FRESHNESS_NEGATIVE_TTL
+        else:
+            ttl = 0
+        if ttl is None:
+            return Freshness.FRESH
+        if validated_at is None:
+            return Freshness.EXPIRED
+        age = (datetime.now() - validated_at).total_seconds()
+        if age < ttl:
+            return Freshness.FRESH
+        elif self.success and age < ttl + self.FRESHNESS_STALE_WHILE_REVALIDATE:
+            return Freshness.STALE
+        return Freshness.EXPIRED
+
+    def revalidate(self):
+        """
+        Sends the stored request again, conditional on the stored response when possible.
+        The stored response is kept when revalidation fails.
+
+        :return: (bool) whether revalidation succeeded
+        """
+        stored = {field: getattr(self, field) for field in self.REVALIDATION_FIELDS}
+        self.request = self.request_with_auth()
+        try:
+            self._send()
+            self._handle_errors()
+        except (DSResourceException, DSQuotaExhausted) as exc:
+            log.warning("Could not revalidate {} with id {}: {}".format(self.__class__.__name__, self.id, exc))
+            for field, value in stored.items():
+                setattr(self, field, value)
+            return False
+        self.save()
+        return True
+
+    def revalidate_later(self):
+        """
+        Revalidates the resource in the background.
+        """
+        from core.tasks.http import revalidate
+        revalidate.delay(self.__class__.__name__, self.id)
+
     def retain(self, retainer):
         self.retainer = retainer
         self.save()
@@ -253,14 +449,14 @@ class HttpResource(Resource):
             raise ValidationError("Received keyword arguments for request where there should be none.")
         if args_schema:
             try:
-                jsonschema.validate(list(args), args_schema)
+                validate(list(args), args_schema)
             except SchemaValidationError as ex:
                 raise ValidationError(
                     "{}: {}".format(self.__class__.__name__, str(ex))
                 )
         if kwargs_schema:
             try:
-                jsonschema.validate(kwargs, kwargs_schema)
+                validate(kwargs, kwargs_schema)
             except SchemaValidationError as ex:
                 raise ValidationError(
                     "{}: {}".format(self.__class__.__name__, str(ex))
@@ -311,6 +507,58 @@ class HttpResource(Resource):
         request["url"] = str(url)
         return request
 
+    #######################################################
+    # CONCAT ARGS LOGIC
+    #######################################################
+    # Methods to store responses to concatenated arguments per argument
+    # Override split_content to enable the concat_args_cache configuration
+
+    def split_content(self, links, keys):
+        """
+        Splits the content of a response to concatenated arguments into content for every argument.
+        The returned content should equal the content of a response to a request with only that argument.
+
+        :param links: (list) this resource followed by any resources that continued it
+        :param keys: (list) the arguments that were concatenated
+        :return: (dict) content per argument for all arguments that were found
+        """
+        raise NotImplementedError(
+            "{} does not implement split_content for concat_args_cache".format(self.__class__.__name__)
+        )
+
+    def split_by_concat_args(self, links, symbol):
+        """
+        Creates a resource for every argument that got concatenated into the last argument of this resource.
+        These resources get found as if they were requested with a single argument.
+        Headers that describe the whole response, like validators for revalidation, don't get copied.
+
+        :param links: (list) this resource followed by any resources that continued it
+        :param symbol: the symbol that joined the arguments
+        :return: (list) unsaved resources
+        """
+        method = self.request["method"]
+        args = list(self.request["args"])
+        kwargs = self.request["kwargs"]
+        keys = args[-1].split(symbol) if args and isinstance(args[-1], str) else []
+        if len(keys) < 2:
+            return []
+        contents = self.split_content(links, keys)
+        resources = []
+        for key in keys:
+            if key not in contents:
+                continue
+            resource = self.__class__(config=self.config.to_dict(protected=True))
+            resource.request = resource._create_request(method, *(args[:-1] + [key]), **kwargs)
+            resource.head = {
+                key: value for key, value in (self.head or {}).items()
+                if key.lower() not in self.SPLIT_EXCLUDED_HEADERS
+            }
+            resource.status = self.status
+            resource.body = json.dumps(contents[key])
+            resource.clean()
+            resources.append(resource)
+        return resources
+
     #######################################################
     # PROTECTED METHODS
     #######################################################
@@ -326,13 +574,17 @@ class HttpResource(Resource):
 
         method = self.request.get("method")
         data = self.request.get("data") if not method == "get" else None
+        headers = dict(self.request.get("headers") or {})
+        if self.id and self.success:
+            headers.update(self.conditional_headers())
         request = requests.Request(
             method=method,
             url=self.request.get("url"),
-            headers=self.request.get("headers"),
+            headers=headers,
             data=data
         )
         preq = self.session.prepare_request(request)
+        self.throttle(preq.url)
 
         try:
             response = self.session.send(
@@ -347,14 +599,69 @@ class HttpResource(Resource):
         except requests.Timeout:
             self.set_error(504, connection_error=True)
             return
+        self.validated_at = datetime.now()
+        if response.status_code == 304 and self.id and self.success:
+            self._not_modified = True  # only validated_at changes
+            return
         self._update_from_response(response)
 
+    def retry_delay(self, attempt):
+        """
+        Returns the amount of seconds to wait before retrying a failed request according to the retry policy.
+
+        :param attempt: (int) the amount of retries that were made before
+        :return: (int) seconds or None if the request should not be retried
+        """
+        if self.status not in self.RETRY_STATUSES or attempt >= self.MAX_RETRIES:
+            return None
+        backoff = min(self.RETRY_BACKOFF * 2 ** attempt, self.RETRY_BACKOFF_MAX)
+        head = {key.lower(): value for key, value in (self.head or {}).items()}
+        try:
+            retry_after = int(head.get("retry-after", 0))
+        except ValueError:  # HTTP dates are not supported
+            retry_after = 0
+        return max(backoff, retry_after)
+
+    def rate_limit_key(self, url):
+        return self.RATE_LIMIT_KEY or urlparse(url).netloc
+
+    def throttle(self, url):
+        """
+        Counts a request to url towards the daily quota and waits until the rate limit allows the request.
+
+        :param url: (str) the url that will be requested
+        :return: None
+        :raises DSQuotaExhausted: when the daily quota has been used
+        """
+        if not self.RATE_LIMIT and self.DAILY_QUOTA is None:
+            return
+        key = self.rate_limit_key(url)
+        if self.DAILY_QUOTA is not None:
+            DailyQuota.consume(key, self.DAILY_QUOTA)
+        if self.RATE_LIMIT:
+            wait = RateLimitBucket.reserve(key, self.RATE_LIMIT, self.RATE_LIMIT_BURST)
+            if wait:
+                sleep(wait)
+
+    def conditional_headers(self):
+        """
+        Returns headers that make the server respond with 304 Not Modified when the stored response is still valid.
+
+        :return: dict
+        """
+        head = {key.lower(): value for key, value in (self.head or {}).items()}
+        headers = {}
+        if "etag" in head:
+            headers["If-None-Match"] = head["etag"]
+        if "last-modified" in head:
+            headers["If-Modified-Since"] = head["last-modified"]
+        return headers
+
     def _update_from_response(self, response):
         self.head = dict(response.headers)
         self.status = response.status_code
-        # TODO: check what to do with responses that contain invalid character bytes
-        # TODO: check why sometimes we get strings and sometimes bytes in response.body
-        self.body = response.content if isinstance(response.content, str) else response.content.decode("utf-8")
+        # The body gets stored as bytes and will only get decoded when the body gets accessed
+        self.body = response.content
 
     def _handle_errors(self):
         """
@@ -376,10 +683,31 @@ class HttpResource(Resource):
     # Methods and properties to tweak Django
 
     def __init__(self, *args, **kwargs):
-        self.session = kwargs.pop("session", requests.Session())
+        self._session = kwargs.pop("session", None)
         self.timeout = kwargs.pop("timeout", 30)  # TODO: test this
         super(HttpResource, self).__init__(*args, **kwargs)
 
+    @property
+    def session(self):
+        """
+        Returns the session given to the resource or the session shared by the process.
+        Resources that don't make requests never get a session.
+        """
+        if self._session is None:
+            self._session = get_shared_session()
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def save(self, *args, **kwargs):
+        if self._not_modified and self.id and "update_fields" not in kwargs:
+            # A 304 Not Modified response only bumps freshness, which prevents rewriting the body
+            kwargs["update_fields"] = ["validated_at", "modified_at"]
+        self._not_modified = False
+        super(HttpResource, self).save(*args, **kwargs)
+
     def clean(self):
         if self.request and not self.uri:
             uri_request = self.request_without_auth()
@@ -421,6 +749,9 @@ class HttpResource(Resource):
 
     class Meta:
         abstract = True
+        index_together = [
+            ("uri", "data_hash",)
+        ]
 
 
 class BrowserResource(HttpResource):  # TODO: write tests
@@ -452,7 +783,7 @@ class BrowserResource(HttpResource):  # TODO: write tests
         self.head = dict()
         self.status = 1
         self.body = response.page_source
-        self.soup = BeautifulSoup(self.body, "html.parser")
+        self.soup = BeautifulSoup(self.body, self.HTML_PARSER)
 
     @property
     def success(self):
@@ -483,9 +814,9 @@ class BrowserResource(HttpResource):  # TODO: write tests
 
     def __init__(self, *args, **kwargs):
         super(HttpResource, self).__init__(*args, **kwargs)
-        self.soup = BeautifulSoup(self.body if self.body else "", "html.parser")
+        self.soup = BeautifulSoup(self.body if self.body else "", self.HTML_PARSER)
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         abstract = True
 
 
@@ -494,5 +825,67 @@ class URLResource(HttpResource):
     def _create_url(self, *args):
         return args[0]
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         abstract = True
+
+
+class HttpResourceCache(object):
+    """
+    Holds resources of a HttpResource model that got loaded from the database in bulk.
+    HttpResource.send looks up stored resources in the cache when it is set on the resource,
+    which prevents a query for every request that gets send.
+
+    The cache first collects the uri and data_hash of requests, which HttpResource.request_key returns.
+    After collecting all keys load will fetch the resources.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.keys = set()
+        self.resources = {}
+
+    def collect(self, uri, data_hash):
+        """
+        Adds the key of a request to the keys that load will fetch resources for.
+
+        :param uri: uri of the resource
+        :param data_hash: data hash of the resource
+        :return: None
+        """
+        self.keys.add((uri, data_hash,))
+
+    def get(self, uri, data_hash):
+        """
+        Returns a loaded resource or raises DoesNotExist when the resource was collected, but not found.
+        Keys get answered from the cache once, because callers may delete or store resources afterwards.
+        Other resources will get queried from the database.
+
+        :param uri: uri of the resource
+        :param data_hash: data hash of the resource
+        :return: HttpResource
+        """
+        key = (uri, data_hash,)
+        resource = self.resources.pop(key, None)
+        if resource is not None:
+            self.keys.discard(key)
+            return resource
+        if key in self.keys:
+            self.keys.discard(key)  # the resource may get stored after this lookup
+            raise self.model.DoesNotExist("Could not find {} with data hash '{}' in cache".format(uri, data_hash))
+        return self.model.objects.get(uri=uri, data_hash=data_hash)
+
+    def load(self, batch_size=500):
+        """
+        Fetches the resources for all collected keys with a query for every batch_size keys
+
+        :param batch_size: (int) maximum amount of keys to query for at once
+        :return: None
+        """
+        for keys in ibatch(sorted(self.keys), batch_size):
+            uris = {uri for uri, data_hash in keys}
+            data_hashes = {data_hash for uri, data_hash in keys}
+            resources = self.model.objects.filter(uri__in=uris, data_hash__in=data_hashes).order_by("id")
+            for resource in resources.iterator():
+                key = (resource.uri, resource.data_hash,)
+                if key in self.keys:
+                    self.resources[key] = resource
@@ -0,0 +1,116 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from time import time
+from datetime import date
+
+from django.db import models, transaction, IntegrityError
+
+from core.exceptions import DSQuotaExhausted
+
+
+def get_or_create_for_update(model, defaults=None, **lookup):
+    """
+    Gets a row locked for update and creates the row when it does not exist yet.
+    When another process creates the same row at the same time the unique constraint raises an IntegrityError,
+    after which the row of the other process gets locked instead.
+    Should get called inside a transaction.
+
+    :param model: the model of the row
+    :param defaults: (dict) values for fields that are not part of lookup when the row gets created
+    :param lookup: values that identify the row
+    :return: the locked row
+    """
+    try:
+        with transaction.atomic():  # NB: the savepoint keeps the outer transaction usable after an IntegrityError
+            instance, created = model.objects.select_for_update().get_or_create(defaults=defaults, **lookup)
+    except IntegrityError:
+        instance = model.objects.select_for_update().get(**lookup)
+    return instance
+
+
+class RateLimitBucket(models.Model):
+    """
+    A token bucket that is shared by all processes that send requests to the same key (usually a host).
+    Buckets get refilled with rate tokens per second up to a maximum of burst tokens.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()  # NB: unix timestamp for sub second precision
+
+    @classmethod
+    def reserve(cls, key, rate, burst=1):
+        """
+        Takes a token from the bucket for key. When the bucket is empty the token gets reserved ahead of time,
+        which makes sure that waiting processes get their turn in the order in which they asked for one.
+
+        :param key: (str) identifier of the bucket
+        :param rate: (float) amount of requests per second
+        :param burst: (int) maximum amount of requests that may be made at once
+        :return: (float) amount of seconds to wait before sending the request
+        """
+        assert rate > 0, "RateLimitBucket.reserve expects a rate larger than 0"
+        burst = max(burst, 1)
+        with transaction.atomic():
+            now = time()
+            bucket = get_or_create_for_update(cls, key=key, defaults={"tokens": burst, "updated_at": now})
+            tokens = min(burst, bucket.tokens + max(now - bucket.updated_at, 0) * rate) - 1
+            bucket.tokens = tokens
+            bucket.updated_at = now
+            bucket.save()
+        return -tokens / rate if tokens < 0 else 0
+
+    def __str__(self):
+        return self.key
+
+
+class DailyQuota(models.Model):
+    """
+    Counts the requests that were made for a key during a day, to stop before metered APIs start to refuse requests.
+    """
+
+    key = models.CharField(max_length=255)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("key", "day",)
+
+    @classmethod
+    def consume(cls, key, limit):
+        """
+        Counts a request towards the quota of today for key.
+
+        :param key: (str) identifier of the quota
+        :param limit: (int) maximum amount of requests per day
+        :return: (int) amount of requests that remain today
+        :raises DSQuotaExhausted: when the limit has been reached
+        """
+        today = date.today()
+        with transaction.atomic():
+            quota = get_or_create_for_update(cls, key=key, day=today)
+            if quota.count >= limit:
+                raise DSQuotaExhausted(
+                    "Daily quota of {} requests for {} is exhausted on {}".format(limit, key, today)
+                )
+            quota.count += 1
+            quota.save()
+        return limit - quota.count
+
+    @classmethod
+    def exhaust(cls, key, limit):
+        """
+        Marks the quota of today for key as exhausted.
+        Use this when an API refuses requests before our own count reaches the limit.
+
+        :param key: (str) identifier of the quota
+        :param limit: (int) maximum amount of requests per day
+        :return: None
+        """
+        with transaction.atomic():
+            quota = get_or_create_for_update(cls, key=key, day=date.today())
+            quota.count = max(quota.count, limit)
+            quota.save()
+
+    def __str__(self):
+        return "{} ({})".format(self.key, self.day)
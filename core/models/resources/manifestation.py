@@ -5,9 +5,9 @@ from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey, ContentType
 
 from celery.result import AsyncResult
-from json_field import JSONField
 
 from core.models.resources.resource import Resource
+from core.utils.compression import CompressedJSONField
 from core.exceptions import DSProcessUnfinished
 
 
@@ -16,7 +16,7 @@ log = logging.getLogger("datascope")
 
 class Manifestation(Resource):
 
-    data = JSONField(null=True)
+    data = CompressedJSONField(null=True)
 
     community = GenericForeignKey(ct_field="community_type", fk_field="community_id")
     community_type = models.ForeignKey(ContentType, related_name="+")
@@ -4,14 +4,24 @@ from six.moves.urllib.parse import urlencode
 
 import json
 from copy import deepcopy
+from datetime import datetime, timedelta
+
+from mock import patch, Mock, NonCallableMock
+import requests
+from requests.models import Response
 
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.core.exceptions import ValidationError
 
 from core.exceptions import DSHttpError50X, DSHttpError40X
-from core.models.resources.http import HttpResource
+from core.models.resources.http import HttpResource, HttpResourceCache, Freshness
 from core.tests.mocks.data import MOCK_DATA
+from core.utils.http import get_shared_session
+from core.utils.compression import COMPRESSION_HEADER
 from core.tests.mocks.http import HttpResourceMock
+from core.tests.mocks.requests import MockRequests
 
 
 class HttpResourceTestMixin(TestCase):
@@ -238,6 +248,182 @@ class TestHttpResourceMock(HttpResourceTestMixin, ConfigurationFieldTestMixin):
             "data": {"test": "test"}
         }
 
+    def test_session(self):
+        instance = HttpResource.__new__(self.model)
+        HttpResource.__init__(instance)
+        self.assertIsNone(instance._session)
+        self.assertIs(instance.session, get_shared_session())
+        instance = HttpResource.__new__(self.model)
+        HttpResource.__init__(instance, session=MockRequests)
+        self.assertIs(instance.session, MockRequests)
+
+    def test_freshness(self):
+        instance = self.model.objects.get(id=1)
+        self.assertEqual(instance.freshness, Freshness.FRESH)
+        with patch.object(HttpResourceMock, "FRESHNESS_TTL", 60):
+            self.assertEqual(instance.freshness, Freshness.EXPIRED)
+            instance.validated_at = datetime.now()
+            self.assertEqual(instance.freshness, Freshness.FRESH)
+            instance.validated_at = datetime.now() - timedelta(seconds=90)
+            self.assertEqual(instance.freshness, Freshness.EXPIRED)
+            with patch.object(HttpResourceMock, "FRESHNESS_STALE_WHILE_REVALIDATE", 60):
+                self.assertEqual(instance.freshness, Freshness.STALE)
+        # Errors never stay fresh, except for not found responses during the negative TTL
+        instance = self.model.objects.get(id=2)
+        instance.validated_at = datetime.now()
+        self.assertEqual(instance.freshness, Freshness.EXPIRED)
+        instance.status = 404
+        self.assertEqual(instance.freshness, Freshness.EXPIRED)
+        with patch.object(HttpResourceMock, "FRESHNESS_NEGATIVE_TTL", 60):
+            self.assertEqual(instance.freshness, Freshness.FRESH)
+
+    def test_get_not_modified(self):
+        stored_head = {
+            "content-type": "application/json",
+            "ETag": '"1"',
+            "Last-Modified": "Tue, 12 May 2015 18:45:22 GMT"
+        }
+        self.model.objects.filter(id=1).update(head=stored_head)
+        not_modified_response = NonCallableMock(spec=Response)
+        not_modified_response.headers = {}
+        not_modified_response.content = ""
+        not_modified_response.status_code = 304
+        with patch.object(HttpResourceMock, "FRESHNESS_TTL", 60), \
+                patch.object(MockRequests, "send", Mock(return_value=not_modified_response)):
+            instance = self.model().get("success")
+            args, kwargs = instance.session.send.call_args
+            preq = args[0]
+            self.assertEqual(preq.headers["If-None-Match"], '"1"')
+            self.assertEqual(preq.headers["If-Modified-Since"], "Tue, 12 May 2015 18:45:22 GMT")
+            self.assertEqual(instance.id, 1)
+            self.assertEqual(instance.status, 200)
+            self.assertEqual(instance.head, stored_head)
+            self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA))
+            self.assertEqual(instance.freshness, Freshness.FRESH)
+            with CaptureQueriesContext(connection) as queries:
+                instance.save()
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn("body", queries[0]["sql"])
+            self.assertIsNotNone(self.model.objects.get(id=1).validated_at)
+
+    def test_get_stale(self):
+        self.model.objects.filter(id=1).update(validated_at=datetime.now() - timedelta(seconds=90))
+        with patch.object(HttpResourceMock, "FRESHNESS_TTL", 60), \
+                patch.object(HttpResourceMock, "FRESHNESS_STALE_WHILE_REVALIDATE", 60), \
+                patch("core.tasks.http.revalidate.delay") as revalidate_delay:
+            instance = self.model().get("success")
+            self.assertEqual(instance.id, 1)
+            self.assertFalse(instance.session.send.called)
+            revalidate_delay.assert_called_once_with("HttpResourceMock", 1)
+            # Synchronous configurations revalidate right away
+            with patch.object(HttpResourceMock, "revalidate") as revalidate:
+                instance = self.model(config={"async": False}).get("success")
+                self.assertEqual(instance.id, 1)
+                revalidate.assert_called_once_with()
+            self.assertEqual(revalidate_delay.call_count, 1)
+
+    def test_get_negative_cache(self):
+        try:
+            self.model().get("404")
+            self.fail("Get did not raise an exception for a not found response")
+        except DSHttpError40X as exc:
+            exc.resource.save()
+        with patch.object(HttpResourceMock, "FRESHNESS_NEGATIVE_TTL", 60):
+            try:
+                self.model().get("404")
+                self.fail("Get did not raise an exception for a negatively cached response")
+            except DSHttpError40X as exc:
+                self.assertIsNotNone(exc.resource.id)
+                self.assertFalse(exc.resource.session.send.called)
+
+    def test_revalidate(self):
+        instance = self.model.objects.get(id=2)
+        self.assertTrue(instance.revalidate())
+        self.assertEqual(self.model.objects.get(id=2).status, 200)
+        instance = self.model.objects.get(id=1)
+        instance.request["url"] = "http://localhost:8000/en/?q=500&param=1"
+        self.assertFalse(instance.revalidate())
+        self.assertEqual(self.model.objects.get(id=1).status, 200)
+        self.assertEqual(instance.status, 200)
+        self.assertJSONEqual(instance.body, json.dumps(MOCK_DATA))
+
+    def test_get_stale_revalidation_error(self):
+        validated_at = datetime.now() - timedelta(seconds=90)
+        self.model.objects.filter(id=1).update(validated_at=validated_at)
+        stored = self.model.objects.get(id=1)
+        with patch.object(HttpResourceMock, "FRESHNESS_TTL", 60), \
+                patch.object(HttpResourceMock, "FRESHNESS_STALE_WHILE_REVALIDATE", 60), \
+                patch.object(MockRequests, "send", Mock(side_effect=requests.ConnectionError)):
+            instance = self.model(config={"async": False}).get("success")
+            self.assertTrue(MockRequests.send.called)
+        # The stored response stays in use when revalidation responds with a 502
+        self.assertEqual(instance.id, 1)
+        self.assertEqual(instance.status, 200)
+        self.assertEqual(instance.head, stored.head)
+        self.assertEqual(instance.body, stored.body)
+        self.assertEqual(instance.validated_at, stored.validated_at)
+        self.assertEqual(self.model.objects.get(id=1).validated_at, stored.validated_at)
+
+    def test_body_compression(self):
+        body = json.dumps([MOCK_DATA] * 10).encode("utf-8")
+        instance = self.model.objects.get(id=1)
+        instance.body = body
+        self.assertIs(instance.get_body_bytes(), body)
+        instance.save()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT body FROM core_httpresourcemock WHERE id = 1")
+            stored_body = bytes(cursor.fetchone()[0])
+        self.assertTrue(stored_body.startswith(COMPRESSION_HEADER))
+        self.assertLess(len(stored_body), len(body))
+        instance = self.model.objects.get(id=1)
+        self.assertEqual(instance.get_body_bytes(), body)
+        self.assertEqual(instance.body, body.decode("utf-8"))
+        content_type, data = instance.content
+        self.assertEqual(data, [MOCK_DATA] * 10)
+        # Rows stored before compression
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE core_httpresourcemock SET body = %s WHERE id = 1", [json.dumps(MOCK_DATA)])
+        instance = self.model.objects.get(id=1)
+        self.assertEqual(instance.body, json.dumps(MOCK_DATA))
+
+    @patch("core.models.resources.http.BeautifulSoup")
+    @patch("core.models.resources.http.json.loads", wraps=json.loads)
+    def test_content_memoized(self, loads_mock, soup_mock):
+        self.instance.head = {"content-type": "application/json; charset=utf-8"}
+        self.instance.body = json.dumps(self.test_data)
+        self.instance.status = 200
+        content_type, data = self.instance.content
+        content_type, same_data = self.instance.content
+        self.assertIs(data, same_data)
+        self.assertEqual(loads_mock.call_count, 1)
+        # Setting a new body parses again
+        self.instance.body = json.dumps(MOCK_DATA)
+        content_type, data = self.instance.content
+        self.assertEqual(data, MOCK_DATA)
+        self.assertEqual(loads_mock.call_count, 2)
+        # Changing the content type parses again with the parser of the class
+        self.instance.head = {"content-type": "text/html"}
+        self.instance.HTML_PARSER = "lxml"
+        self.instance.content
+        self.instance.content
+        soup_mock.assert_called_once_with(self.instance.body, "lxml")
+        self.assertEqual(loads_mock.call_count, 2)
+
+    @patch.object(HttpResourceMock, "RETRY_STATUSES", [503])
+    @patch.object(HttpResourceMock, "MAX_RETRIES", 3)
+    @patch.object(HttpResourceMock, "RETRY_BACKOFF_MAX", 15)
+    def test_retry_delay(self):
+        self.instance.status = 500
+        self.assertIsNone(self.instance.retry_delay(0))
+        self.instance.status = 503
+        self.instance.head = {}
+        self.assertEqual(self.instance.retry_delay(0), 5)
+        self.assertEqual(self.instance.retry_delay(1), 10)
+        self.assertEqual(self.instance.retry_delay(2), 15)
+        self.assertIsNone(self.instance.retry_delay(3))
+        self.instance.head = {"Retry-After": "30"}
+        self.assertEqual(self.instance.retry_delay(0), 30)
+
     def assert_agent_header(self, prepared_request, expected_agent):
         agent_header = prepared_request.headers.pop("User-Agent")
         datascope_agent, platform_agent = agent_header.split(";")
@@ -353,6 +539,16 @@ class TestHttpResourceMock(HttpResourceTestMixin, ConfigurationFieldTestMixin):
         except ValidationError:
             pass
 
+    def test_expire_requests(self):
+        instance = self.model().get("success")
+        self.assertTrue(instance.id)
+        count = self.model.expire_requests("get", [["success"], [], ["new"]], [{}, {}, {}])
+        self.assertEqual(count, 1)
+        self.assertFalse(self.model.objects.filter(id=instance.id).exists())
+        instance = self.model().get("success")
+        self.assert_call_args_get(instance.session.send.call_args, "success")
+        self.assertEqual(self.model.expire_requests("get", [["success"]], [{}]), 0)
+
     def test_post_new(self):
         # Make a new request and store it.
         instance = self.model().post(query="new")
@@ -446,6 +642,39 @@ class TestHttpResourceMock(HttpResourceTestMixin, ConfigurationFieldTestMixin):
         self.assertIn("key=ahhh", self.instance.request["url"], "request_without_auth should not alter existing request")
         self.assertEqual(request["data"], self.test_post_request["data"])
 
+    def test_request_key(self):
+        instance = self.model()
+        self.assertEqual(instance.request_key("get", "success"), ("localhost:8000/en/?param=1&q=success", "",))
+        uri, data_hash = instance.request_key("post", query="test")
+        self.assertEqual(uri, "localhost:8000/en/?param=1&q=test")
+        self.assertFalse(instance.session.send.called)
+        self.assertIsNone(instance.id)
+        try:
+            instance.request_key("get")
+            self.fail("request_key did not raise a validation exception when confronted with invalid arguments.")
+        except ValidationError:
+            pass
+
+    def test_split_by_concat_args(self):
+        instance = self.model()
+        instance.request = instance._create_request("get", "en", "a|b")
+        instance.head = {
+            "Content-Type": "application/json",
+            "ETag": '"1"',
+            "Last-Modified": "Tue, 12 May 2015 18:45:22 GMT",
+            "Content-Length": "100"
+        }
+        instance.status = 200
+        instance.body = json.dumps(MOCK_DATA)
+        resources = instance.split_by_concat_args([instance], "|")
+        self.assertEqual([list(resource.request["args"]) for resource in resources], [["en", "a"], ["en", "b"]])
+        for resource in resources:
+            self.assertEqual(resource.uri, "localhost:8000/en/?param=1&q={}".format(resource.request["args"][1]))
+            self.assertEqual(resource.head, {"Content-Type": "application/json"})
+            self.assertEqual(resource.conditional_headers(), {})
+            self.assertEqual(resource.status, 200)
+        self.assertEqual(instance.split_by_concat_args([instance], ","), [])
+
     def test_create_next_request(self):
         # Test with get
         instance = self.model().get("next")
@@ -563,3 +792,71 @@ class TestHttpResourceMock(HttpResourceTestMixin, ConfigurationFieldTestMixin):
         args, kwargs = instance.session.send.call_args
         preq = args[0]
         self.assert_agent_header(preq, "DataScope (custom)")
+
+
+class TestHttpResourceCache(TestCase):
+
+    fixtures = ["test-http-resource-mock"]
+
+    def setUp(self):
+        super(TestHttpResourceCache, self).setUp()
+        self.cache = HttpResourceCache(HttpResourceMock)
+        self.success_key = ("localhost:8000/en/?param=1&q=success", "",)
+        self.missing_key = ("localhost:8000/en/?param=1&q=missing", "",)
+
+    def test_collect(self):
+        self.cache.collect(*self.success_key)
+        self.assertEqual(self.cache.keys, {self.success_key})
+        # Collecting the key of a resource without sending it
+        instance = HttpResourceMock()
+        self.cache.collect(*instance.request_key("get", "fail"))
+        self.assertFalse(instance.session.send.called)
+        self.assertEqual(self.cache.keys, {self.success_key, ("localhost:8000/en/?param=1&q=fail", "",)})
+
+    def test_load(self):
+        self.cache.keys = {self.success_key, self.missing_key}
+        with self.assertNumQueries(1):
+            self.cache.load()
+        self.assertEqual(list(self.cache.resources.keys()), [self.success_key])
+        with self.assertNumQueries(2):
+            self.cache.keys = {("localhost:8000/en/?param=1&q={}".format(query), "",) for query in range(3)}
+            self.cache.load(batch_size=2)
+
+    def test_get(self):
+        self.cache.keys = {self.success_key, self.missing_key}
+        self.cache.load()
+        with self.assertNumQueries(0):
+            resource = self.cache.get(*self.success_key)
+            self.assertEqual(resource.id, 1)
+            try:
+                self.cache.get(*self.missing_key)
+                self.fail("HttpResourceCache.get did not raise DoesNotExist for a missing resource")
+            except HttpResourceMock.DoesNotExist:
+                pass
+        # Keys get answered from cache once
+        with self.assertNumQueries(1):
+            resource = self.cache.get(*self.success_key)
+            self.assertEqual(resource.id, 1)
+        with self.assertNumQueries(1):
+            try:
+                self.cache.get(*self.missing_key)
+                self.fail("HttpResourceCache.get did not raise DoesNotExist for a missing resource")
+            except HttpResourceMock.DoesNotExist:
+                pass
+
+    def test_send(self):
+        for query in ["success", "new"]:
+            self.cache.collect(*HttpResourceMock().request_key("get", query))
+        self.cache.load()
+        instance = HttpResourceMock()
+        instance.cache = self.cache
+        with self.assertNumQueries(0):
+            instance = instance.get("success")
+        self.assertEqual(instance.id, 1)
+        self.assertFalse(instance.session.send.called)
+        instance = HttpResourceMock()
+        instance.cache = self.cache
+        with self.assertNumQueries(0):
+            instance = instance.get("new")
+        self.assertIsNone(instance.id)
+        self.assertTrue(instance.session.send.called)
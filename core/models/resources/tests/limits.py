@@ -0,0 +1,80 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from mock import patch
+
+from django.test import TestCase
+from django.db import IntegrityError
+
+from core.models.resources.limits import RateLimitBucket, DailyQuota
+from core.tests.mocks.http import HttpResourceMock
+from core.exceptions import DSQuotaExhausted, DSHttpError429TooManyRequests
+
+
+class TestRateLimitBucket(TestCase):
+
+    @patch("core.models.resources.limits.time", return_value=100.0)
+    def test_reserve(self, time_mock):
+        # A full bucket allows a burst without waiting
+        for request in range(3):
+            self.assertEqual(RateLimitBucket.reserve("localhost", rate=2, burst=3), 0)
+        # Then tokens get reserved ahead of time
+        self.assertEqual(RateLimitBucket.reserve("localhost", rate=2, burst=3), 0.5)
+        self.assertEqual(RateLimitBucket.reserve("localhost", rate=2, burst=3), 1.0)
+        # Other keys have their own bucket
+        self.assertEqual(RateLimitBucket.reserve("example.com", rate=2, burst=3), 0)
+        # Time refills the bucket
+        time_mock.return_value = 103.0
+        self.assertEqual(RateLimitBucket.reserve("localhost", rate=2, burst=3), 0)
+        bucket = RateLimitBucket.objects.get(key="localhost")
+        self.assertEqual(bucket.tokens, 2)
+        self.assertEqual(bucket.updated_at, 103.0)
+
+    @patch("core.models.resources.limits.time", return_value=100.0)
+    def test_reserve_concurrent_create(self, time_mock):
+        # Another process created the bucket after the get of get_or_create and before its insert
+        RateLimitBucket.objects.create(key="localhost", tokens=0, updated_at=100.0)
+        with patch("django.db.models.query.QuerySet.get_or_create", side_effect=IntegrityError):
+            self.assertEqual(RateLimitBucket.reserve("localhost", rate=2, burst=3), 0.5)
+        self.assertEqual(RateLimitBucket.objects.get(key="localhost").tokens, -1)
+
+
+class TestDailyQuota(TestCase):
+
+    def test_consume(self):
+        self.assertEqual(DailyQuota.consume("localhost", 2), 1)
+        self.assertEqual(DailyQuota.consume("localhost", 2), 0)
+        self.assertRaises(DSQuotaExhausted, DailyQuota.consume, "localhost", 2)
+        self.assertEqual(DailyQuota.consume("example.com", 2), 1)
+        self.assertEqual(DailyQuota.objects.get(key="localhost").count, 2)
+
+    def test_consume_concurrent_create(self):
+        DailyQuota.consume("localhost", 2)
+        with patch("django.db.models.query.QuerySet.get_or_create", side_effect=IntegrityError):
+            self.assertEqual(DailyQuota.consume("localhost", 2), 0)
+        self.assertEqual(DailyQuota.objects.get(key="localhost").count, 2)
+
+    def test_exhaust(self):
+        DailyQuota.consume("localhost", 10)
+        DailyQuota.exhaust("localhost", 10)
+        self.assertRaises(DSQuotaExhausted, DailyQuota.consume, "localhost", 10)
+
+    @patch("core.models.resources.http.sleep")
+    def test_throttle(self, sleep_mock):
+        instance = HttpResourceMock()
+        instance.throttle("http://localhost:8000/en/?q=test")
+        self.assertFalse(DailyQuota.objects.exists())
+        self.assertFalse(RateLimitBucket.objects.exists())
+        instance.DAILY_QUOTA = 1
+        instance.RATE_LIMIT = 1
+        instance.throttle("http://localhost:8000/en/?q=test")
+        self.assertEqual(DailyQuota.objects.get(key="localhost:8000").count, 1)
+        self.assertTrue(RateLimitBucket.objects.filter(key="localhost:8000").exists())
+        sleep_mock.assert_not_called()
+        try:
+            instance.get("new")
+            self.fail("HttpResource.get did not raise DSHttpError429TooManyRequests with an exhausted quota")
+        except DSHttpError429TooManyRequests as exc:
+            self.assertIs(exc.resource, instance)
+            self.assertEqual(exc.resource.status, 429)
+            self.assertFalse(exc.resource.success)
+        self.assertEqual(instance.session.send.call_count, 0)
@@ -4,5 +4,6 @@ from .rank import RankProcessor
 from .compare import ComparisonProcessor
 from .expansion import ExpansionProcessor
 from .manifest import ManifestProcessor
+from .cluster import ClusterProcessor
 
 from core.tests.mocks.processor import MockNumberProcessor, MockFilterProcessor
@@ -0,0 +1,191 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from datetime import datetime
+
+from datascope.configuration import DEFAULT_CONFIGURATION
+from core.processors.base import Processor
+from core.utils.configuration import ConfigurationProperty
+from core.utils.data import reach
+from core.utils.helpers import ibatch, bulk_update
+from core.utils.vectors import VectorStore
+
+
+class ClusterProcessor(Processor):
+    """
+    Groups individuals by their feature vectors with mini-batch k-means.
+    Vectors get gathered into a single float32 matrix, either from the VectorStore of the Collective
+    that individuals got their vectors from or from the configured vectors path of individuals. All computation happens on chunks of that matrix.
+    Every clustered individual gets a ds_cluster with its cluster and its distance to the center of that cluster.
+    """
+
+    config = ConfigurationProperty(
+        storage_attribute="_config",
+        defaults=DEFAULT_CONFIGURATION,
+        private=[],
+        namespace="cluster_processor"
+    )
+
+    @staticmethod
+    def get_vector(vectors_path, properties, size=None):
+        vector = reach(vectors_path, properties)
+        if not isinstance(vector, list) or not vector or (size is not None and len(vector) != size):
+            return None
+        return vector
+
+    def get_vector_matrix(self, individuals):
+        """
+        Stacks the vectors of individuals into a float32 matrix chunk by chunk,
+        which keeps no more than a chunk of individuals in memory. Individuals without a valid vector get skipped.
+        Vectors come from the VectorStore of the Collective they were saved for when individuals hold a vector row
+        and otherwise from the configured vectors path.
+
+        :param individuals: (iterator) dictionaries with vectors or with a vector row
+        :return: (tuple) indices of individuals that hold vectors and their matrix
+        """
+        import numpy as np
+        indices = []
+        chunks = []
+        stores = {}
+        size = None
+        offset = 0
+        for batch in ibatch(individuals, self.config.batch_size):
+            stored = np.zeros(len(batch), dtype=bool)
+            for batch_indices, vectors in VectorStore.read_individuals(batch, stores):
+                stored[batch_indices] = True
+                if size is not None and vectors.shape[1] != size:
+                    continue
+                size = vectors.shape[1]
+                chunks.append(vectors)
+                indices += [offset + index for index in batch_indices]
+            rows = []
+            for index, individual in enumerate(batch):
+                if stored[index]:
+                    continue
+                vector = self.get_vector(self.config.vectors, individual, size)
+                if vector is None:
+                    continue
+                size = len(vector)
+                rows.append((index, vector,))
+            if rows:
+                chunks.append(np.array([vector for index, vector in rows], dtype=np.float32))
+            indices += [offset + index for index, vector in rows]
+            offset += len(batch)
+        if not chunks:
+            return np.array([], dtype=int), np.zeros((0, 0), dtype=np.float32)
+        return np.array(indices, dtype=int), np.concatenate(chunks)
+
+    @staticmethod
+    def squared_distances(matrix, centers):
+        """
+        Returns the squared euclidean distance of every row to every center with a single matrix product.
+        """
+        import numpy as np
+        distances = (matrix * matrix).sum(axis=1)[:, np.newaxis] - 2 * matrix.dot(centers.T) + \
+            (centers * centers).sum(axis=1)[np.newaxis, :]
+        return np.maximum(distances, 0)
+
+    def initial_centers(self, matrix, clusters, random):
+        """
+        Picks initial centers with k-means++ from a sample of at most a chunk of rows.
+        """
+        import numpy as np
+        sample = matrix[random.choice(len(matrix), min(len(matrix), self.config.batch_size), replace=False)]
+        centers = [sample[random.randint(len(sample))]]
+        for _ in range(1, clusters):
+            distances = self.squared_distances(sample, np.array(centers)).min(axis=1).astype(np.float64)
+            total = distances.sum()
+            if not total:  # fewer distinct vectors than clusters
+                break
+            centers.append(sample[random.choice(len(sample), p=distances / total)])
+        return np.array(centers, dtype=np.float32)
+
+    def fit(self, matrix):
+        """
+        Computes cluster centers with mini-batch k-means. Every iteration visits all rows in shuffled chunks
+        and moves each center towards the rows of a chunk that are nearest to it, at a rate that decreases
+        with the amount of rows the center already absorbed.
+
+        :param matrix: (numpy.ndarray) a vector per row
+        :return: (numpy.ndarray) a center per row
+        """
+        import numpy as np
+        random = np.random.RandomState(self.config.seed)
+        centers = self.initial_centers(matrix, min(self.config.clusters, len(matrix)), random)
+        counts = np.zeros(len(centers))
+        chunk_count = max(len(matrix) // self.config.batch_size, 1)
+        for iteration in range(self.config.iterations):
+            for chunk in np.array_split(random.permutation(len(matrix)), chunk_count):
+                vectors = matrix[chunk]
+                labels = self.squared_distances(vectors, centers).argmin(axis=1)
+                for label in np.unique(labels):
+                    members = vectors[labels == label]
+                    counts[label] += len(members)
+                    rate = len(members) / counts[label]
+                    centers[label] = (1 - rate) * centers[label] + rate * members.mean(axis=0)
+        return centers
+
+    def assign(self, matrix, centers):
+        """
+        Returns the nearest cluster for every row together with the distance to its center.
+        """
+        import numpy as np
+        labels = np.zeros(len(matrix), dtype=int)
+        distances = np.zeros(len(matrix))
+        for start in range(0, len(matrix), self.config.batch_size):
+            squared = self.squared_distances(matrix[start:start + self.config.batch_size], centers)
+            labels[start:start + len(squared)] = squared.argmin(axis=1)
+            distances[start:start + len(squared)] = np.sqrt(squared.min(axis=1))
+        return labels, distances
+
+    def get_clusters(self, individuals):
+        """
+        Clusters individuals by their vectors.
+
+        :param individuals: (iterator) dictionaries with vectors or with a vector row
+        :return: (dict) cluster info for every index of individuals that holds a vector
+        """
+        indices, matrix = self.get_vector_matrix(individuals)
+        if not len(indices):
+            return {}
+        labels, distances = self.assign(matrix, self.fit(matrix))
+        return {
+            int(index): {"cluster": int(label), "distance": float(distance)}
+            for index, label, distance in zip(indices, labels, distances)
+        }
+
+    def cluster(self, individuals):
+        """
+        Sets ds_cluster on individuals that hold a vector at the configured vectors path.
+
+        :param individuals: (iterator) dictionaries to cluster
+        :return: (iterator) the individuals
+        """
+        individuals = list(individuals)
+        for index, cluster_info in self.get_clusters(individuals).items():
+            individuals[index]["ds_cluster"] = cluster_info
+        return (individual for individual in individuals)
+
+    def cluster_collective(self, collective):
+        """
+        Sets ds_cluster on Individuals of a Collective and writes them to the database in bulk.
+
+        :param collective: the Collective to cluster
+        :return: the Collective
+        """
+        ids = []
+
+        def iterate_properties():
+            for individual in collective.individual_set.order_by("id").iterator():
+                ids.append(individual.id)
+                yield individual.properties
+
+        clusters = self.get_clusters(iterate_properties())
+        now = datetime.now()
+        for batch in ibatch(sorted(clusters), self.config.batch_size):
+            individuals = collective.individual_set.in_bulk([ids[index] for index in batch])
+            for index in batch:
+                individual = individuals[ids[index]]
+                individual.properties["ds_cluster"] = clusters[index]
+                individual.modified_at = now
+            bulk_update(list(individuals.values()), ["properties", "modified_at"])
+        return collective
@@ -15,4 +15,6 @@ class ComparisonProcessor(RankProcessor):
         self.reference = Individual.objects.get(id=int(self.config.reference))
 
     def get_hook_arguments(self, individual):
+        if self.COLUMNAR:
+            return (individual, self.reference.properties,)
         return (deepcopy(individual), deepcopy(self.reference.properties),)
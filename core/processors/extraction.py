@@ -8,7 +8,7 @@ from datascope.configuration import DEFAULT_CONFIGURATION
 from core.processors.base import Processor
 from core.exceptions import DSNoContent
 from core.utils.configuration import ConfigurationProperty
-from core.utils.data import reach
+from core.utils.data import compile_path
 
 
 log = logging.getLogger("datascope")
@@ -65,19 +65,20 @@ class ExtractProcessor(Processor):
     def application_json(self, data):
         context = {}
         for name, objective in six.iteritems(self._context):
-            context[name] = reach(objective, data)
+            context[name] = compile_path(objective).reach(data)
 
-        nodes = reach(self._at, data)
+        nodes = compile_path(self._at).reach(data)
         if isinstance(nodes, dict):
             nodes = six.itervalues(nodes)
 
         if nodes is None:
             raise DSNoContent("Found no nodes at {}".format(self._at))
 
+        objectives = [(name, compile_path(objective)) for name, objective in six.iteritems(self._objective)]
         for node in nodes:
             result = copy(context)
-            for name, objective in six.iteritems(self._objective):
-                result[name] = reach(objective, node)
+            for name, objective in objectives:
+                result[name] = objective.reach(node)
             yield result
 
     def text_html(self, soup):  # soup used in eval!
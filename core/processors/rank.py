@@ -5,11 +5,12 @@ import six
 
 from itertools import islice
 from copy import deepcopy
+from datetime import date
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.processors.base import Processor
 from core.utils.configuration import ConfigurationProperty
-from core.utils.helpers import merge_iter
+from core.utils.helpers import merge_iter, ibatch
 
 
 class RankProcessor(Processor):
@@ -21,16 +22,27 @@ class RankProcessor(Processor):
         namespace="rank_processor"
     )
 
+    COLUMNAR = False  # NB: only enable for hooks that do not modify their arguments
+    FEATURE_STORE = False  # NB: only enable for hooks whose values depend on nothing but the individual
+    DATE_DEPENDENT_HOOKS = []  # NB: stored values expire daily when a processor has hooks that depend on today
+
     def get_hook_arguments(self, individual):
+        if self.COLUMNAR:
+            return (individual,)
         return (deepcopy(individual),)
 
-    def hooks(self, individuals):
-        config_dict = self.config.to_dict()
-        hooks = [
+    def get_hooks(self, config_dict):
+        return [
             getattr(self, hook[1:])
             for hook, weight in six.iteritems(config_dict)  # config gets whitelisted by Community
             if isinstance(hook, str) and hook.startswith("$") and callable(getattr(self, hook[1:], None)) and weight
         ]
+
+    def hooks(self, individuals):
+        if self.COLUMNAR:
+            return self.hooks_columnar(individuals)
+        config_dict = self.config.to_dict()
+        hooks = self.get_hooks(config_dict)
         sort_key = lambda el: el["ds_rank"].get("rank", 0)
         results = []
         batch = []
@@ -75,3 +87,206 @@ class RankProcessor(Processor):
 
         flush_batch(batch, self.config.result_size)
         return islice(merge_iter(*results, key=sort_key, reversed=True), self.config.result_size)
+
+    def get_weighted_hooks(self, config_dict):
+        """
+        Returns the names of all active hooks and the active hooks with a valid weight together with their weight.
+        """
+        hook_names = []
+        hooks = []
+        for hook in self.get_hooks(config_dict):
+            hook_names.append(hook.__name__)
+            try:
+                hooks.append((hook, float(config_dict["$" + hook.__name__]),))
+            except (ValueError, TypeError):  # hooks with invalid weights never rank
+                continue
+        return hook_names, hooks
+
+    def evaluate_hooks(self, hooks, individuals):
+        """
+        Calls every hook for every individual. Values that are not numbers become 0, because these never rank.
+
+        :param hooks: (list) hooks to call
+        :param individuals: (list) dictionaries to call hooks with
+        :return: (numpy.ndarray) values with a row per individual and a column per hook
+        """
+        import numpy as np
+        values = np.zeros((len(individuals), len(hooks)))
+        for column, hook in enumerate(hooks):
+            for row, individual in enumerate(individuals):
+                try:
+                    values[row, column] = float(hook(*self.get_hook_arguments(individual)))
+                except (ValueError, TypeError):
+                    continue
+        return values
+
+    @staticmethod
+    def set_rank_info(individual, hook_names, hooks, values, rank):
+        """
+        Sets ds_rank on an individual in the same format as hooks does.
+
+        :param individual: (dict) ranked individual
+        :param hook_names: (list) names of all active hooks
+        :param hooks: (list) active hooks with a valid weight together with their weight
+        :param values: (numpy.ndarray) the values of hooks for the individual
+        :param rank: (float) combined rank of the individual
+        :return: the individual
+        """
+        rank_info = {hook_name: {"rank": 0.0} for hook_name in hook_names}
+        hook_ranks = []
+        for column, (hook, weight) in enumerate(hooks):
+            module_value = float(values[column])
+            if not module_value:
+                continue
+            rank_info[hook.__name__] = {
+                "rank": module_value * weight,
+                "value": module_value,
+                "weight": weight
+            }
+            hook_ranks.append(module_value * weight)
+        if any(hook_ranks):
+            rank_info["rank"] = float(rank)
+        individual["ds_rank"] = rank_info
+        return individual
+
+    def hooks_columnar(self, individuals):
+        """
+        Ranks like hooks does, but evaluates every hook over a batch of individuals into a column of values.
+        Ranks get combined for the whole batch at once and only the best individuals of a batch get rank details.
+        Individuals with the same rank keep their original order, which makes the result equal to that of hooks.
+        Hook arguments are not copied, so hooks should not modify them.
+
+        :param individuals: (iterator) dictionaries to rank
+        :return: (iterator) the best ranked individuals with ds_rank set
+        """
+        import numpy as np
+
+        hook_names, hooks = self.get_weighted_hooks(self.config.to_dict())
+        weights = [weight for hook, weight in hooks]
+        result_size = self.config.result_size
+        candidates = []
+        candidate_values = []
+        candidate_ranks = []
+
+        for batch in ibatch(individuals, self.config.batch_size):
+            values = self.evaluate_hooks([hook for hook, weight in hooks], batch)
+            ranks = self.combine_ranks(values, weights)
+            selection = self.top_indices(ranks, result_size)
+            candidates += [batch[index] for index in selection]
+            candidate_values.append(values[selection])
+            candidate_ranks.append(ranks[selection])
+
+        if not candidates:
+            return iter([])
+        ranks = np.concatenate(candidate_ranks)
+        values = np.concatenate(candidate_values)
+        return iter([
+            self.set_rank_info(candidates[index], hook_names, hooks, values[index], ranks[index])
+            for index in self.top_indices(ranks, result_size)
+        ])
+
+    def store_features(self, collective, hook_names):
+        """
+        Stores the values of hooks for every Individual of a Collective,
+        so that hooks_from_features can rank the Collective with any weights without calling hooks.
+        Only processors with FEATURE_STORE set store anything, because values may only depend on the Individual.
+        Values of processors with DATE_DEPENDENT_HOOKS are only valid on the day that they were stored.
+
+        :param collective: the Collective to store values for
+        :param hook_names: (list) names of hooks that may get a weight, names of non existing hooks get ignored
+        :return: RankFeatures or None
+        """
+        from core.models.organisms.features import RankFeatures
+        if not self.FEATURE_STORE:
+            return
+        hooks = [
+            getattr(self, hook_name) for hook_name in hook_names
+            if callable(getattr(self, hook_name, None))
+        ]
+        ids = []
+        columns = {hook.__name__: [] for hook in hooks}
+        for batch in ibatch(collective.individual_set.iterator(), self.config.batch_size):
+            values = self.evaluate_hooks(hooks, [individual.content for individual in batch])
+            ids += [individual.id for individual in batch]
+            for column, hook in enumerate(hooks):
+                columns[hook.__name__] += values[:, column].tolist()
+        return RankFeatures.store(collective, self.__class__.__name__, ids, columns, day=self.get_features_day())
+
+    def get_features_day(self):
+        return date.today() if self.DATE_DEPENDENT_HOOKS else None
+
+    def hooks_from_features(self, collective):
+        """
+        Ranks the Individuals of a Collective like hooks_columnar does with values stored by store_features.
+        Only the best ranked Individuals get loaded.
+
+        :param collective: the Collective to rank
+        :return: (iterator) the best ranked individuals with ds_rank set
+                 or None when there are no (up to date) values for all active hooks
+        """
+        from core.models.organisms.features import RankFeatures
+        import numpy as np
+
+        if not self.FEATURE_STORE:
+            return
+        hook_names, hooks = self.get_weighted_hooks(self.config.to_dict())
+        features = RankFeatures.load(collective, self.__class__.__name__, day=self.get_features_day())
+        if features is None:
+            return
+        columns = features.data["columns"]
+        if any(hook.__name__ not in columns for hook, weight in hooks):
+            return
+        ids = features.data["ids"]
+        values = np.zeros((len(ids), len(hooks)))
+        for column, (hook, weight) in enumerate(hooks):
+            values[:, column] = columns[hook.__name__]
+        ranks = self.combine_ranks(values, [weight for hook, weight in hooks])
+        selection = self.top_indices(ranks, self.config.result_size)
+        individuals = collective.individual_set.in_bulk([ids[index] for index in selection])
+        return iter([
+            self.set_rank_info(individuals[ids[index]].content, hook_names, hooks, values[index], ranks[index])
+            for index in selection
+        ])
+
+    @staticmethod
+    def combine_ranks(values, weights):
+        """
+        Multiplies the weighted values of every row, while ignoring values that weigh nothing.
+        Multiplication happens in the same order as hooks does, to get exactly the same floats.
+
+        :param values: (numpy.ndarray) values of hooks with a row per individual and a column per hook
+        :param weights: (list) weight of every hook
+        :return: (numpy.ndarray) a rank per individual, which is 0 when no hook ranked the individual
+        """
+        import numpy as np
+        ranks = np.ones(values.shape[0])
+        ranked = np.zeros(values.shape[0], dtype=bool)
+        for column, weight in enumerate(weights):
+            column_ranks = values[:, column] * weight
+            has_rank = column_ranks != 0
+            ranks = np.where(has_rank, ranks * column_ranks, ranks)
+            ranked |= has_rank
+        ranks[~ranked] = 0.0
+        return ranks
+
+    @staticmethod
+    def top_indices(ranks, size):
+        """
+        Selects the indices of the highest ranks in order without sorting all ranks.
+        Indices of equal ranks stay in ascending order like they do with a stable sort.
+
+        :param ranks: (numpy.ndarray) ranks to select from
+        :param size: (int) amount of indices to select
+        :return: (numpy.ndarray) selected indices
+        """
+        import numpy as np
+        if size <= 0 or not len(ranks):
+            return np.array([], dtype=int)
+        if size < len(ranks):
+            threshold = np.partition(ranks, len(ranks) - size)[len(ranks) - size]
+            above = np.flatnonzero(ranks > threshold)
+            equal = np.flatnonzero(ranks == threshold)[:size - len(above)]
+            selection = np.concatenate([above, equal])
+        else:
+            selection = np.arange(len(ranks))
+        return selection[np.lexsort((selection, -ranks[selection]))]
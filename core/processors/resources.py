@@ -1,12 +1,11 @@
-import requests
-
 from celery.result import AsyncResult, states as TaskStates
 
 from datascope.configuration import DEFAULT_CONFIGURATION
-from core.tasks.http import send, send_mass
+from core.tasks.http import send, send_mass, SendMassBatches
 from core.processors.base import Processor
 from core.utils.configuration import ConfigurationProperty
 from core.utils.helpers import get_any_model
+from core.utils.http import get_shared_session
 from core.exceptions import DSProcessUnfinished, DSProcessError
 
 
@@ -26,7 +25,10 @@ class HttpResourceProcessor(Processor):
     config = ConfigurationProperty(
         storage_attribute="_config",
         defaults=DEFAULT_CONFIGURATION,
-        private=["_resource", "_continuation_limit", "_batch_size"],
+        private=[
+            "_resource", "_continuation_limit", "_batch_size", "_concurrency", "_host_concurrency",
+            "_concat_args_cache", "_pool_connections", "_pool_maxsize"
+        ],
         namespace="http_resource"
     )
 
@@ -67,7 +69,7 @@ class HttpResourceProcessor(Processor):
 
     @classmethod
     def get_session(cls, config):
-        return requests.Session()
+        return get_shared_session(config.pool_connections, config.pool_maxsize)
 
     #######################################################
     # TASKS
@@ -83,13 +85,19 @@ class HttpResourceProcessor(Processor):
             session=self.__class__.__name__
         )
 
-    @property
-    def fetch_mass(self):
-        return send_mass.s(
-            method="get",
+    def _mass_task(self, method):
+        signature = send_mass.s(
+            method=method,
             config=self.config.to_dict(private=True, protected=True),
             session=self.__class__.__name__
         )
+        if not self.config.batch_size:
+            return signature
+        return SendMassBatches(signature, self.config.batch_size, concat_args_size=self.config.concat_args_size)
+
+    @property
+    def fetch_mass(self):
+        return self._mass_task("get")
 
     @property
     def submit(self):
@@ -101,8 +109,4 @@ class HttpResourceProcessor(Processor):
 
     @property
     def submit_mass(self):
-        return send_mass.s(
-            method="post",
-            config=self.config.to_dict(private=True, protected=True),
-            session=self.__class__.__name__
-        )
+        return self._mass_task("post")
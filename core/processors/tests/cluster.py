@@ -0,0 +1,87 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import os
+import shutil
+import tempfile
+from collections import Iterator
+
+from mock import patch
+
+from django.test import TestCase
+
+from core.models.organisms import Collective
+from core.processors.cluster import ClusterProcessor
+from core.tests.mocks.community import CommunityMock
+from core.utils.vectors import VectorStore
+
+
+class TestClusterProcessor(TestCase):
+
+    def setUp(self):
+        super(TestClusterProcessor, self).setUp()
+        self.test_content = [
+            {"name": "left-{}".format(index), "vectors": [0.0 + index / 10, 0.0]}
+            for index in range(5)
+        ] + [
+            {"name": "right-{}".format(index), "vectors": [10.0 + index / 10, 10.0]}
+            for index in range(5)
+        ] + [
+            {"name": "without-vectors"},
+            {"name": "wrong-size", "vectors": [1.0, 2.0, 3.0]}
+        ]
+        self.config = {"clusters": 2, "batch_size": 3, "iterations": 5, "seed": 1}
+
+    def assert_clusters(self, individuals):
+        clusters = {individual["name"]: individual.get("ds_cluster") for individual in individuals}
+        self.assertIsNone(clusters["without-vectors"])
+        self.assertIsNone(clusters["wrong-size"])
+        left = {clusters["left-{}".format(index)]["cluster"] for index in range(5)}
+        right = {clusters["right-{}".format(index)]["cluster"] for index in range(5)}
+        self.assertEqual(len(left), 1)
+        self.assertEqual(len(right), 1)
+        self.assertNotEqual(left, right)
+        for name, cluster_info in clusters.items():
+            if cluster_info is not None:
+                self.assertLess(cluster_info["distance"], 1)
+
+    def test_cluster(self):
+        individuals = ClusterProcessor(self.config).cluster(iter(self.test_content))
+        self.assertTrue(issubclass(individuals.__class__, Iterator))
+        self.assert_clusters(list(individuals))
+        # Clustering is reproducible by seed
+        first = list(ClusterProcessor(self.config).cluster(self.test_content))
+        second = list(ClusterProcessor(self.config).cluster(self.test_content))
+        self.assertEqual(first, second)
+        # More clusters than vectors and no vectors at all
+        config = dict(self.config, clusters=20)
+        self.assertEqual(len(list(ClusterProcessor(config).cluster(self.test_content))), len(self.test_content))
+        self.assertEqual(list(ClusterProcessor(self.config).cluster([{"name": "empty"}])), [{"name": "empty"}])
+
+    def test_cluster_collective(self):
+        collective = Collective.objects.create(community=CommunityMock.objects.create(), schema={})
+        collective.update(self.test_content)
+        ClusterProcessor(self.config).cluster_collective(collective)
+        self.assert_clusters(collective.content)
+
+    def test_cluster_collective_store(self):
+        directory = tempfile.mkdtemp()
+        store = VectorStore(os.path.join(directory, "test"))
+        collective = Collective.objects.create(community=CommunityMock.objects.create(), schema={})
+        content = []
+        vectors = []
+        for individual in self.test_content:
+            individual = dict(individual)
+            if len(individual.get("vectors", [])) == 2:
+                individual["vector_collective"] = 1
+                individual["vector_row"] = len(vectors)
+                vectors.append((individual["name"], individual.pop("vectors"),))
+            content.append(individual)
+        store.save(vectors)
+        collective.update(content)
+        try:
+            with patch.object(VectorStore, "for_collective", return_value=store) as for_collective:
+                ClusterProcessor(self.config).cluster_collective(collective)
+                for_collective.assert_called_once_with(1)
+        finally:
+            shutil.rmtree(directory)
+        self.assert_clusters(collective.content)
@@ -2,14 +2,19 @@ from __future__ import unicode_literals, absolute_import, print_function, divisi
 # noinspection PyUnresolvedReferences
 from six.moves import reduce
 
+from copy import deepcopy
 from collections import Iterator, OrderedDict
 from operator import itemgetter
+from datetime import date, timedelta
 
 from mock import patch
 
 from django.test import TestCase
 
-from core.tests.mocks.processor import MockRankProcessor
+from core.models.organisms import Collective
+from core.tests.mocks.community import CommunityMock
+from core.tests.mocks.processor import MockRankProcessor, MockColumnarRankProcessor, MockFeatureRankProcessor
+from core.tests.mocks.processor import MockDailyFeatureRankProcessor
 
 
 class TestRankProcessor(TestCase):
@@ -238,3 +243,76 @@ class TestRankProcessor(TestCase):
         ranking = list(instance.hooks(self.test_content))
         names = list(map(itemgetter('name'), ranking))
         self.assertEqual(names, ['double-1', 'double-2'], "Order of ranked dictionaries is not correct.")
+
+    def test_columnar_ranking(self):
+        configs = [
+            {"$rank_by_value": 1},
+            {"$rank_by_value": 1, "$is_double": 2},
+            {"$rank_by_value": 1, "$is_highest": 0.8},
+            {"$rank_by_value": 0.3, "$ban_highest": 0.7, "$is_double": 1.1},
+            {"$is_highest": 1},
+            {"$rank_by_value": "makes no sense", "$is_double": 1},
+            {"$wrong_return_value": 1, "$i_think_none_of_it": 1, "$is_double": 1},
+            {"$rank_by_value": 0, "$does_not_exist": 1},
+            {},
+        ]
+        for config in configs:
+            for result_size, batch_size in [(2, 3), (3, 4), (20, 2), (4, 100)]:
+                config.update({"result_size": result_size, "batch_size": batch_size})
+                expected = list(MockRankProcessor(config).hooks(deepcopy(self.test_content)))
+                ranking = MockColumnarRankProcessor(config).hooks(deepcopy(self.test_content))
+                self.assertTrue(issubclass(ranking.__class__, Iterator))
+                self.assertEqual(list(ranking), expected, "Columnar ranking differs for {}".format(config))
+        instance = MockColumnarRankProcessor({"result_size": 2, "batch_size": 3, "$rank_by_value": 1})
+        self.assertEqual(list(instance.hooks([])), [])
+
+    def test_top_indices(self):
+        import numpy as np
+        ranks = np.array([0.0, 3.0, 1.0, 3.0, 2.0, 1.0, 1.0])
+        self.assertEqual(list(MockRankProcessor.top_indices(ranks, 3)), [1, 3, 4])
+        self.assertEqual(list(MockRankProcessor.top_indices(ranks, 5)), [1, 3, 4, 2, 5])
+        self.assertEqual(list(MockRankProcessor.top_indices(ranks, 10)), [1, 3, 4, 2, 5, 6, 0])
+        self.assertEqual(list(MockRankProcessor.top_indices(ranks, 0)), [])
+
+    def test_features(self):
+        collective = Collective.objects.create(community=CommunityMock.objects.create(), schema={})
+        collective.update(self.test_content)
+        hook_names = ["rank_by_value", "is_double", "is_highest", "ban_highest", "does_not_exist"]
+        config = {"result_size": 3, "batch_size": 4, "$rank_by_value": 1, "$is_double": 2}
+        self.assertIsNone(MockColumnarRankProcessor(config).store_features(collective, hook_names))
+        self.assertIsNone(MockFeatureRankProcessor(config).hooks_from_features(collective))
+        features = MockFeatureRankProcessor(config).store_features(collective, hook_names)
+        self.assertEqual(sorted(features.data["columns"].keys()), sorted(hook_names[:-1]))
+        self.assertEqual(len(features.data["ids"]), len(self.test_content))
+        configs = [
+            {"$rank_by_value": 1, "$is_double": 2},
+            {"$rank_by_value": 0.3, "$ban_highest": 0.7, "$is_double": 1.1},
+            {"$is_highest": 1, "$rank_by_value": "makes no sense"},
+            {},
+        ]
+        for config in configs:
+            config.update({"result_size": 3, "batch_size": 4})
+            expected = list(MockColumnarRankProcessor(config).hooks(collective.content))
+            ranking = MockFeatureRankProcessor(config).hooks_from_features(collective)
+            self.assertTrue(issubclass(ranking.__class__, Iterator))
+            self.assertEqual(list(ranking), expected, "Ranking from features differs for {}".format(config))
+        # Hooks without stored values and changed Collectives can't rank from features
+        config = {"result_size": 3, "batch_size": 4, "$wrong_return_value": 1}
+        self.assertIsNone(MockFeatureRankProcessor(config).hooks_from_features(collective))
+        collective.update([{"name": "new", "value": 11}], reset=False)
+        config = {"result_size": 3, "batch_size": 4, "$rank_by_value": 1}
+        self.assertIsNone(MockFeatureRankProcessor(config).hooks_from_features(collective))
+
+    def test_features_date_dependent(self):
+        collective = Collective.objects.create(community=CommunityMock.objects.create(), schema={})
+        collective.update(self.test_content)
+        hook_names = ["rank_by_value", "is_highest"]
+        config = {"result_size": 3, "batch_size": 4, "$rank_by_value": 1, "$is_highest": 1}
+        features = MockDailyFeatureRankProcessor(config).store_features(collective, hook_names)
+        self.assertTrue(features.fingerprint.endswith(date.today().isoformat()))
+        expected = list(MockColumnarRankProcessor(config).hooks(collective.content))
+        self.assertEqual(list(MockDailyFeatureRankProcessor(config).hooks_from_features(collective)), expected)
+        # Values of date dependent hooks expire the next day
+        with patch("core.processors.rank.date") as date_mock:
+            date_mock.today.return_value = date.today() + timedelta(days=1)
+            self.assertIsNone(MockDailyFeatureRankProcessor(config).hooks_from_features(collective))
@@ -9,6 +9,7 @@ from django.db.models import QuerySet
 
 from datascope.configuration import MOCK_CONFIGURATION
 from core.processors.resources import HttpResourceProcessor
+from core.tasks.http import SendMassBatches
 from core.utils.configuration import ConfigurationType
 from core.tests.mocks.requests import MockRequestsWithAgent, MockRequests
 from core.tests.mocks.celery import (MockTask, MockAsyncResultSuccess, MockAsyncResultPartial, MockAsyncResultError,
@@ -37,6 +38,11 @@ class TestHttpResourceProcessor(TestCase):
         self.session = MockRequests
         MockTask.reset_mock()
 
+    def test_get_session(self):
+        session = HttpResourceProcessor.get_session(self.prc.config)
+        self.assertIsInstance(session, requests.Session)
+        self.assertIs(HttpResourceProcessor.get_session(self.prc.config), session)
+
     @patch("core.tasks.http.send.s")
     def test_fetch(self, send_s):
         null = self.prc.fetch
@@ -55,6 +61,17 @@ class TestHttpResourceProcessor(TestCase):
         self.assertIsInstance(kwargs["config"], dict)
         self.assertTrue(kwargs["config"].get("_resource"))
 
+    @patch("core.tasks.http.send_mass.s")
+    def test_fetch_mass_batches(self, send_mass_s):
+        self.config.set_configuration({"batch_size": 100})
+        prc = HttpResourceProcessor(config=self.config.to_dict(protected=True, private=True))
+        batches = prc.fetch_mass
+        self.assertIsInstance(batches, SendMassBatches)
+        self.assertEqual(batches.batch_size, 100)
+        self.assertEqual(batches.signature, send_mass_s.return_value)
+        args, kwargs = send_mass_s.call_args
+        self.assertEqual(kwargs["method"], "get")
+
     @patch("core.tasks.http.send.s")
     def test_submit(self, send_s):
         null = self.prc.submit
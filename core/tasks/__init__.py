@@ -1 +1,2 @@
 from .manifestation import get_manifestation_data, manifest, manifest_serie
+from .community import grow_community, begin_growth
@@ -0,0 +1,54 @@
+import logging
+
+from celery import current_app as app
+
+from core.models.organisms.states import CommunityState
+from core.utils.helpers import get_any_model
+from core.exceptions import DSProcessUnfinished, DSProcessError
+
+
+log = logging.getLogger("datascope")
+
+
+@app.task(name="core.grow_community")
+def grow_community(community_model, community_id):
+    """
+    Continues to grow a Community after one of its Growth tasks is done.
+    Growth tasks link to this task, which makes asynchronous Communities grow to READY without polling.
+
+    :param community_model: (str) name of the Community model
+    :param community_id: (int) id of the Community
+    :return: (str) the state of the Community afterwards or None when the Community no longer exists
+    """
+    Community = get_any_model(community_model)
+    try:
+        community = Community.objects.get(id=community_id)
+    except Community.DoesNotExist:
+        return None
+    try:
+        # NB: the state gets checked under lock, so callbacks of tasks that finish before their dispatch commits wait
+        community.grow_exclusive(states=[CommunityState.ASYNC])
+    except DSProcessUnfinished:
+        pass
+    except DSProcessError as exc:
+        log.warning("Community {} stopped growing: {}".format(community, exc))
+    return community.state
+
+
+@app.task(name="core.begin_growth")
+def begin_growth(community_model, community_id, growth_id):
+    """
+    Begins a Growth that Community.begin_growths queued to begin together with other independent Growths.
+
+    :param community_model: (str) name of the Community model
+    :param community_id: (int) id of the Community
+    :param growth_id: (int) id of the queued Growth
+    :return: (str) the state of the Growth afterwards or None when the Growth did not begin
+    """
+    Community = get_any_model(community_model)
+    try:
+        community = Community.objects.get(id=community_id)
+    except Community.DoesNotExist:
+        return None
+    growth = community.begin_growth_exclusive(growth_id)
+    return growth.state if growth is not None else None
@@ -1,12 +1,21 @@
 import logging
-from time import sleep
+from time import sleep, time
+from datetime import datetime, timedelta
+from math import ceil
+from threading import Thread, Lock, BoundedSemaphore
+from queue import Queue, Empty
+from urllib.parse import urlparse
 
-from celery import current_app as app
+from celery import current_app as app, group, chord
+
+from django.db import connection
+from django.core.exceptions import ValidationError
 
 from datascope.configuration import DEFAULT_CONFIGURATION
 from core.processors.base import Processor
 from core.utils.configuration import ConfigurationType, load_config
 from core.utils.helpers import get_any_model
+from core.utils.http import get_shared_session
 from core.exceptions import DSResourceException
 
 
@@ -19,6 +28,7 @@ def load_session():
     If the argument is a string it is assumed to be the name of a processor that implements the get_session method.
     Whatever this method returns gets injected under the "session" keyword argument for the decorated function.
     If the argument is not a string it gets returned as being a valid session for the resource.
+    Without the argument the session that is shared by the process gets injected.
 
     :param defaults: (mixed) Name of the session provider or the session object.
     :return:
@@ -29,7 +39,8 @@ def load_session():
                 "load_session expects a fully prepared ConfigurationType for config"
             session_injection = kwargs.pop("session", None)
             if not session_injection:
-                raise TypeError("load_session decorator expects a session kwarg.")
+                session = get_shared_session(config.pool_connections, config.pool_maxsize)
+                return func(config, session=session, *args, **kwargs)
             if not isinstance(session_injection, str):
                 return func(config, session=session_injection, *args, **kwargs)
             session_provider = Processor.get_processor_class(session_injection)
@@ -39,11 +50,12 @@ def load_session():
     return wrap
 
 
-def get_resource_link(config, session=None):
+def get_resource_link(config, session=None, cache=None):
     assert isinstance(config, ConfigurationType), \
         "get_resource_link expects a fully prepared ConfigurationType for config"
     Resource = get_any_model(config.resource)
     link = Resource(config=config.to_dict(protected=True))
+    link.cache = cache
 
     if session is not None:
         link.session = session
@@ -55,6 +67,53 @@ def get_resource_link(config, session=None):
     return link
 
 
+class ThrottledSession(object):
+    """
+    Wraps a session to limit the amount of requests that run concurrently against a single host.
+    It also keeps a minimal interval between the start of requests to the same host.
+    Any other attribute gets looked up on the wrapped session.
+    """
+
+    def __init__(self, session, host_concurrency, interval_duration=0):
+        """
+        :param session: the session object to send requests with
+        :param host_concurrency: (int) maximum of requests that may run at the same time against a host
+        :param interval_duration: (float) minimum of seconds between the start of two requests to a host
+        """
+        assert host_concurrency > 0, "ThrottledSession expects host_concurrency to be at least 1"
+        self.session = session
+        self.host_concurrency = host_concurrency
+        self.interval_duration = interval_duration
+        self._lock = Lock()
+        self._semaphores = {}
+        self._next_starts = {}
+
+    def __getattr__(self, item):
+        return getattr(self.session, item)
+
+    def get_semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = BoundedSemaphore(self.host_concurrency)
+            return self._semaphores[host]
+
+    def wait_for_turn(self, host):
+        if not self.interval_duration:
+            return
+        with self._lock:
+            now = time()
+            start = max(now, self._next_starts.get(host, now))
+            self._next_starts[host] = start + self.interval_duration
+        if start > now:
+            sleep(start - now)
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        with self.get_semaphore(host):
+            self.wait_for_turn(host)
+            return self.session.send(request, **kwargs)
+
+
 @app.task(name="core.send")
 @load_config(defaults=DEFAULT_CONFIGURATION)
 @load_session()
@@ -62,22 +121,25 @@ def send(config, *args, **kwargs):
     # Set vars
     session = kwargs.pop("session", None)
     method = kwargs.pop("method", None)
+    cache = kwargs.pop("cache", None)
     success = []
     errors = []
+    links = []
     has_next_request = True
-    current_request = {}
+    current_request = kwargs.pop("request", None) or {}  # NB: a stored request replaces args and kwargs
     count = 0
     limit = config.continuation_limit or 1
     # Continue as long as there are subsequent requests
     while has_next_request and count < limit:
         # Get payload
-        link = get_resource_link(config, session)
+        link = get_resource_link(config, session, cache=cache)
         link.request = current_request
         try:
             link = link.send(method, *args, **kwargs)
             link.clean()
             link.save()
             success.append(link.id)
+            links.append(link)
         except DSResourceException as exc:
             log.debug(exc)
             link = exc.resource
@@ -87,41 +149,225 @@ def send(config, *args, **kwargs):
         # Prepare next request
         has_next_request = current_request = link.create_next_request()
         count += 1
+    # Store complete responses to concatenated arguments per argument
+    if config.concat_args_size and config.concat_args_cache and links and not errors and not has_next_request:
+        store_concat_args(links, config.concat_args_symbol)
     # Output results in simple type for json serialization
     return [success, errors]
 
 
+def store_concat_args(links, symbol):
+    """
+    Stores a resource for every argument in a response to concatenated arguments.
+    Resources that were stored earlier for an argument get replaced.
+
+    :param links: (list) a resource followed by any resources that continued it
+    :param symbol: the symbol that joined the arguments
+    :return: None
+    """
+    head = links[0]
+    resources = head.split_by_concat_args(links, symbol)
+    if not resources:
+        return
+    Resource = head.__class__
+    for data_hash in {resource.data_hash for resource in resources}:
+        uris = [resource.uri for resource in resources if resource.data_hash == data_hash]
+        Resource.objects.filter(uri__in=uris, data_hash=data_hash).delete()
+    Resource.objects.bulk_create(resources)
+
+
+def load_concat_args_cache(config, args_list, kwargs_list, session=None, method=None):
+    """
+    Looks up resources that were stored per argument by store_concat_args.
+
+    :return: a list with ids of found resources and the args_list and kwargs_list for arguments that were not found
+    """
+    from core.models.resources.http import HttpResourceCache, Freshness
+    symbol = config.concat_args_symbol
+    cache = HttpResourceCache(get_any_model(config.resource))
+    keys = []
+    for args, kwargs in zip(args_list, kwargs_list):
+        link = get_resource_link(config, session)
+        try:
+            key = link.request_key(method, symbol.join(map(str, args)), **kwargs)
+        except (ValidationError, DSResourceException):
+            keys.append(None)
+            continue
+        cache.collect(*key)
+        keys.append(key)
+    cache.load()
+    cached_ids = []
+    missing_args_list = []
+    missing_kwargs_list = []
+    for key, args, kwargs in zip(keys, args_list, kwargs_list):
+        resource = cache.resources.get(key)
+        freshness = resource.freshness if resource is not None and resource.success else Freshness.EXPIRED
+        if freshness == Freshness.STALE:
+            resource.revalidate_later()
+        if freshness != Freshness.EXPIRED:
+            cached_ids.append(resource.id)
+        else:
+            missing_args_list.append(args)
+            missing_kwargs_list.append(kwargs)
+    return cached_ids, missing_args_list, missing_kwargs_list
+
+
 @app.task(name="core.send_serie")
 @load_config(defaults=DEFAULT_CONFIGURATION)
 @load_session()
 def send_serie(config, args_list, kwargs_list, session=None, method=None):
+    cache = load_resource_cache(config, args_list, kwargs_list, session=session, method=method)
+    if config.concurrency > 1:
+        result = send_concurrent(config, args_list, kwargs_list, session=session, method=method, cache=cache)
+        return send_retries(config, result, session=session, method=method)
     success = []
     errors = []
     for args, kwargs in zip(args_list, kwargs_list):
         # Get the results
-        scc, err = send(method=method, config=config, session=session, *args, **kwargs)
+        scc, err = send(method=method, config=config, session=session, cache=cache, *args, **kwargs)
         success += scc
         errors += err
         # Take a break for scraping if configured
         interval_duration = config.interval_duration / 1000
         if interval_duration:
             sleep(interval_duration)
+    return send_retries(config, [success, errors], session=session, method=method)
+
+
+def send_retries(config, result, session=None, method=None):
+    """
+    Sends the requests of resources that failed with a status that the resource wants to retry again.
+    Failed requests get parked until the rest of the serie got sent,
+    which means that waiting only happens for the remaining time of the longest backoff after each round of retries.
+    Every resource decides the backoff for an attempt and stops retrying after its maximum amount of retries.
+
+    :param result: a list with success ids and a list with error ids
+    :return: a list with success ids and a list with error ids after retrying
+    """
+    success, errors = result
+    if not errors:
+        return result
+    Resource = get_any_model(config.resource)
+    attempt = 0
+    while errors:
+        retries = []
+        ready_at = None
+        for resource in Resource.objects.filter(id__in=errors):
+            delay = resource.retry_delay(attempt)
+            if delay is None:
+                continue
+            retries.append(resource)
+            resource_ready_at = (resource.validated_at or resource.modified_at) + timedelta(seconds=delay)
+            ready_at = resource_ready_at if ready_at is None else max(ready_at, resource_ready_at)
+        if not retries:
+            break
+        wait = (ready_at - datetime.now()).total_seconds()
+        if wait > 0:
+            sleep(wait)
+        retry_ids = {resource.id for resource in retries}
+        errors = [error for error in errors if error not in retry_ids]
+        for resource in retries:
+            log.info("Retrying {} with id {} (attempt {})".format(Resource.__name__, resource.id, attempt + 1))
+            scc, err = send(method=method, config=config, session=session, request=resource.request)
+            success += scc
+            errors += err
+        attempt += 1
     return [success, errors]
 
 
+def load_resource_cache(config, args_list, kwargs_list, session=None, method=None):
+    """
+    Looks up all stored resources for a serie of requests with a few queries.
+    The returned cache makes sure that send only goes to the database for requests that were not looked up.
+
+    :return: HttpResourceCache
+    """
+    from core.models.resources.http import HttpResourceCache
+    cache = HttpResourceCache(get_any_model(config.resource))
+    for args, kwargs in zip(args_list, kwargs_list):
+        link = get_resource_link(config, session)
+        try:
+            cache.collect(*link.request_key(method, *args, **kwargs))
+        except (ValidationError, DSResourceException):
+            # Invalid arguments raise again when actually sending
+            continue
+    cache.load()
+    return cache
+
+
+def send_concurrent(config, args_list, kwargs_list, session=None, method=None, cache=None):
+    """
+    Sends a serie of requests using a pool of config.concurrency threads.
+    Requests to a single host are limited by config.host_concurrency
+    and config.interval_duration is used as minimal interval between requests to the same host.
+
+    :return: a list with success ids and a list with error ids in the order of args_list
+    """
+    throttled_session = ThrottledSession(
+        session,
+        host_concurrency=config.host_concurrency or config.concurrency,
+        interval_duration=config.interval_duration / 1000
+    )
+    jobs = Queue()
+    for job in enumerate(zip(args_list, kwargs_list)):
+        jobs.put(job)
+    results = [None] * jobs.qsize()
+    failures = []
+
+    def work():
+        try:
+            while not failures:
+                try:
+                    index, (args, kwargs) = jobs.get_nowait()
+                except Empty:
+                    return
+                results[index] = send(
+                    method=method,
+                    config=config,
+                    session=throttled_session,
+                    cache=cache,
+                    *args,
+                    **kwargs
+                )
+        except Exception as exc:
+            failures.append(exc)
+        finally:
+            connection.close()  # every thread has its own database connection
+
+    workers = [Thread(target=work) for worker in range(min(config.concurrency, len(results)))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if failures:
+        raise failures[0]
+    return merge_results(results)
+
+
 @app.task(name="core.send_mass")
 @load_config(defaults=DEFAULT_CONFIGURATION)
 @load_session()
 def send_mass(config, args_list, kwargs_list, session=None, method=None):
-    # FEATURE: chain "batches" of send_mass if configured through batch_size
 
     assert args_list and kwargs_list, "No args list and/or kwargs list given to send mass"
 
+    cached_ids = []
+    if config.concat_args_size and config.concat_args_cache:
+        cached_ids, args_list, kwargs_list = load_concat_args_cache(
+            config,
+            args_list,
+            kwargs_list,
+            session=session,
+            method=method
+        )
+        if not args_list:
+            return [cached_ids, []]
+
     if config.concat_args_size:
         # Set some vars based on config
         symbol = config.concat_args_symbol
         concat_size = config.concat_args_size
-        args_list_size = int(len(args_list) / concat_size) + 1
+        args_list_size = int(ceil(len(args_list) / concat_size))
         # Calculate new args_list and kwargs_list
         # Arg list that are of the form [[1],[2],[3], ...] should become [[1|2|3], ...]
         # Kwargs are assumed to remain similar across the list
@@ -139,10 +385,89 @@ def send_mass(config, args_list, kwargs_list, session=None, method=None):
         prc_args_list = args_list
         prc_kwargs_list = kwargs_list
 
-    return send_serie(
+    scc, err = send_serie(
         prc_args_list,
         prc_kwargs_list,
         config=config,
         method=method,
         session=session
     )
+    return [cached_ids + scc, err]
+
+
+@app.task(name="core.revalidate")
+def revalidate(resource, resource_id):
+    """
+    Revalidates a stored resource. Stored resources that no longer exist are ignored.
+
+    :param resource: (str) name of the HttpResource model
+    :param resource_id: (int) id of the resource
+    :return: (bool) whether revalidation succeeded
+    """
+    Resource = get_any_model(resource)
+    try:
+        link = Resource.objects.get(id=resource_id)
+    except Resource.DoesNotExist:
+        return False
+    return link.revalidate()
+
+
+@app.task(name="core.merge_results")
+def merge_results(results):
+    """
+    Merges a list of [success, errors] results into a single [success, errors] result.
+    """
+    success = []
+    errors = []
+    for scc, err in results:
+        success += scc
+        errors += err
+    return [success, errors]
+
+
+class SendMassBatches(object):
+    """
+    Splits the arguments for a send_mass signature into batches that Celery workers can process in parallel.
+    Calling an instance sends all batches in the current process,
+    while delay dispatches the batches as a chord that merges all results into one result.
+    Callbacks that get linked run after the merge.
+    """
+
+    def __init__(self, signature, batch_size, concat_args_size=0):
+        """
+        :param signature: a send_mass signature that is missing the args_list and kwargs_list
+        :param batch_size: (int) maximum amount of args per batch
+        :param concat_args_size: (int) batches become a multiple of this size to not break concatenation of args
+        """
+        assert batch_size > 0, "SendMassBatches expects a batch_size of at least 1"
+        if concat_args_size:
+            batch_size = int(ceil(batch_size / concat_args_size)) * concat_args_size
+        self.signature = signature
+        self.batch_size = batch_size
+        self.body = merge_results.s()
+
+    def batches(self, args_list, kwargs_list):
+        args_list = list(args_list)
+        kwargs_list = list(kwargs_list)
+        for start in range(0, len(args_list), self.batch_size):
+            end = start + self.batch_size
+            yield args_list[start:end], kwargs_list[start:end]
+
+    def __call__(self, args_list, kwargs_list):
+        return merge_results([
+            self.signature(args_batch, kwargs_batch)
+            for args_batch, kwargs_batch in self.batches(args_list, kwargs_list)
+        ])
+
+    def link(self, callback):
+        return self.body.link(callback)
+
+    def link_error(self, errback):
+        return self.body.link_error(errback)
+
+    def delay(self, args_list, kwargs_list):
+        header = group(
+            self.signature.clone(args=(args_batch, kwargs_batch,))
+            for args_batch, kwargs_batch in self.batches(args_list, kwargs_list)
+        )
+        return chord(header)(self.body)
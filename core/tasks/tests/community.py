@@ -0,0 +1,53 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from mock import patch
+
+from django.test import TestCase
+
+from core.models.organisms.states import CommunityState
+from core.models.organisms import Growth
+from core.models.organisms.growth import GrowthState
+from core.tasks.community import grow_community, begin_growth
+from core.exceptions import DSProcessUnfinished, DSProcessError
+
+
+class TestGrowCommunity(TestCase):
+
+    fixtures = ["test-community"]
+
+    @patch("core.tests.mocks.community.CommunityMock.grow_exclusive", side_effect=DSProcessUnfinished)
+    def test_grow_community(self, grow_exclusive):
+        state = grow_community("CommunityMock", 2)
+        self.assertEqual(state, CommunityState.ASYNC)
+        grow_exclusive.assert_called_once_with(states=[CommunityState.ASYNC])
+
+    @patch("core.tests.mocks.community.CommunityMock.grow_exclusive", side_effect=DSProcessError)
+    def test_grow_community_error(self, grow_exclusive):
+        state = grow_community("CommunityMock", 2)
+        self.assertEqual(state, CommunityState.ASYNC)
+        grow_exclusive.assert_called_once_with(states=[CommunityState.ASYNC])
+
+    @patch("core.tests.mocks.community.CommunityMock.grow")
+    def test_grow_community_inactive(self, grow):
+        state = grow_community("CommunityMock", 1)
+        self.assertEqual(state, CommunityState.NEW)
+        self.assertIsNone(grow_community("CommunityMock", 0))
+        self.assertFalse(grow.called)
+
+
+class TestBeginGrowth(TestCase):
+
+    fixtures = ["test-community"]
+
+    @patch("core.models.organisms.community.Growth.begin")
+    def test_begin_growth(self, begin):
+        Growth.objects.filter(id=2).update(state=GrowthState.QUEUED)
+        state = begin_growth("CommunityMock", 2, 2)
+        self.assertEqual(state, GrowthState.QUEUED)  # Growth.begin is mocked
+        self.assertEqual(begin.call_count, 1)
+
+    @patch("core.models.organisms.community.Growth.begin")
+    def test_begin_growth_not_queued(self, begin):
+        self.assertIsNone(begin_growth("CommunityMock", 2, 2))
+        self.assertIsNone(begin_growth("CommunityMock", 0, 2))
+        self.assertFalse(begin.called)
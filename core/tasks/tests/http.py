@@ -1,15 +1,19 @@
 from datetime import datetime
+from time import sleep
+from threading import Thread, Lock
 
-from mock import patch
+from mock import patch, Mock
 import requests
 
 from django.test import TestCase
 from django.utils import six
 
 from datascope.configuration import MOCK_CONFIGURATION
-from core.tasks.http import send, send_serie, send_mass, get_resource_link, load_session
+from core.tasks.http import (send, send_serie, send_mass, get_resource_link, load_session, send_concurrent,
+                             send_retries, ThrottledSession, SendMassBatches, merge_results)
 from core.utils.configuration import ConfigurationType
 from core.tests.mocks.requests import MockRequestsWithAgent, MockRequests
+from core.models.resources.http import HttpResourceCache
 from core.tests.mocks.http import HttpResourceMock
 
 
@@ -100,6 +104,18 @@ class TestSendMassTaskBase(TestHTTPTasksBase):
         self.check_results(scc, 3)
         self.check_results(err, 1)
 
+    def test_send_mass_cache(self):
+        args_list = self.get_args_list(["success", "success", "fail", "new"])
+        kwargs_list = self.get_kwargs_list(["success", "success", "fail", "new"])
+        with patch.object(HttpResourceCache, "load", autospec=True, side_effect=HttpResourceCache.load) as load_cache:
+            send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+            self.assertEqual(load_cache.call_count, 1)
+        scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+        self.check_results(scc, 4)
+        self.check_results(err, 0)
+        self.assertEqual(scc[0], scc[1])
+        self.assertEqual(HttpResourceMock.objects.filter(id__in=scc).count(), 3)
+
     @patch("core.tasks.http.send_serie", return_value=([], [],))
     def test_send_mass_concat_arguments(self, send_serie):
         self.config.concat_args_size = 3
@@ -127,6 +143,63 @@ class TestSendMassTaskPost(TestSendMassTaskBase):
     method = "post"
 
 
+class TestSendMassConcatArgsCache(TestHTTPTasksBase):
+
+    method = "get"
+
+    def setUp(self):
+        super(TestSendMassConcatArgsCache, self).setUp()
+        self.config.concat_args_size = 2
+        self.config.concat_args_cache = True
+
+    def get_resource(self, query):
+        return HttpResourceMock.objects.filter(uri="localhost:8000/en/?param=1&q={}".format(query)).first()
+
+    def test_send_mass(self):
+        args_list = self.get_args_list(["test", "test2", "test3"])
+        kwargs_list = self.get_kwargs_list(["test", "test2", "test3"])
+        scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+        self.check_results(scc, 2)
+        self.check_results(err, 0)
+        for query in ["test", "test2", "test3"]:
+            resource = self.get_resource(query)
+            self.assertIsNotNone(resource, "Expected a resource for {}".format(query))
+            self.assertEqual(resource.status, 200)
+            self.assertEqual(resource.request["args"], ["en", query])
+        self.assertEqual(HttpResourceMock.objects.filter(uri__contains="%7C").count(), 1)
+        # Only arguments without stored resource should get sent
+        args_list = self.get_args_list(["test2", "test3", "test4"])
+        kwargs_list = self.get_kwargs_list(["test2", "test3", "test4"])
+        with patch("core.tasks.http.send_serie", wraps=send_serie) as send_serie_mock:
+            scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+            args, kwargs = send_serie_mock.call_args
+            self.assertEqual(args, ([["test4"]], [{}],))
+        self.check_results(scc, 3)
+        self.check_results(err, 0)
+        self.assertEqual(scc[:2], [self.get_resource("test2").id, self.get_resource("test3").id])
+        # Nothing gets sent when all arguments have a stored resource
+        with patch("core.tasks.http.send_serie") as send_serie_mock:
+            scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+            self.assertFalse(send_serie_mock.called)
+        self.check_results(scc, 3)
+
+    def test_send_mass_errors(self):
+        args_list = self.get_args_list(["test", "404"])
+        kwargs_list = self.get_kwargs_list(["test", "404"])
+        scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+        self.check_results(scc, 0)
+        self.check_results(err, 1)
+        self.assertIsNone(self.get_resource("test"))
+
+    def test_send_mass_disabled(self):
+        self.config.concat_args_cache = False
+        args_list = self.get_args_list(["test", "test2"])
+        kwargs_list = self.get_kwargs_list(["test", "test2"])
+        scc, err = send_mass(args_list, kwargs_list, method=self.method, config=self.config, session=MockRequests)
+        self.check_results(scc, 1)
+        self.assertIsNone(self.get_resource("test2"))
+
+
 class TestSendTaskGet(TestHTTPTasksBase):
 
     method = "get"
@@ -219,6 +292,193 @@ class TestSendSerieTaskPost(TestHTTPTasksBase):
         self.skipTest("not tested")
 
 
+def mock_send_result(*args, **kwargs):
+    number = int(args[-1])
+    return [[number], []] if number % 2 else [[], [number]]
+
+
+class TestSendConcurrentTask(TestHTTPTasksBase):
+
+    method = "get"
+
+    def setUp(self):
+        super(TestSendConcurrentTask, self).setUp()
+        self.config.concurrency = 3
+
+    @patch("core.tasks.http.send", side_effect=mock_send_result)
+    def test_send_concurrent(self, send_mock):
+        args_list = [[str(number)] for number in range(1, 11)]
+        kwargs_list = [{} for number in range(1, 11)]
+        scc, err = send_concurrent(self.config, args_list, kwargs_list, session=MockRequests, method=self.method)
+        self.assertEqual(scc, [1, 3, 5, 7, 9])
+        self.assertEqual(err, [2, 4, 6, 8, 10])
+        self.assertEqual(send_mock.call_count, 10)
+        args, kwargs = send_mock.call_args
+        self.assertIsInstance(kwargs["session"], ThrottledSession)
+        self.assertIs(kwargs["session"].session, MockRequests)
+        self.assertEqual(kwargs["method"], self.method)
+
+    @patch("core.tasks.http.send_concurrent", return_value=[[], []])
+    def test_send_serie_concurrency(self, send_concurrent_mock):
+        send_serie([["test"]], [{}], method=self.method, config=self.config, session=MockRequests)
+        self.assertTrue(send_concurrent_mock.called)
+        send_concurrent_mock.reset_mock()
+        self.config.concurrency = 0
+        send_serie([["test"]], [{}], method=self.method, config=self.config, session=MockRequests)
+        self.assertFalse(send_concurrent_mock.called)
+
+    @patch.object(HttpResourceMock, "DAILY_QUOTA", 1)
+    def test_send_serie_quota(self):
+        for concurrency in [0, 3]:
+            self.config.concurrency = concurrency
+            queries = ["quota-{}-{}".format(concurrency, number) for number in range(3)]
+            scc, err = send_serie(
+                [[query] for query in queries], [{} for query in queries],
+                method=self.method, config=self.config, session=MockRequests
+            )
+            self.check_results(scc, 1 if not concurrency else 0)
+            self.check_results(err, 2 if not concurrency else 3)
+            for resource in HttpResourceMock.objects.filter(id__in=err):
+                self.assertEqual(resource.status, 429)
+
+
+@patch.object(HttpResourceMock, "RETRY_STATUSES", [500])
+@patch.object(HttpResourceMock, "MAX_RETRIES", 2)
+@patch.object(HttpResourceMock, "RETRY_BACKOFF", 10)
+class TestSendRetries(TestHTTPTasksBase):
+
+    method = "get"
+
+    @patch("core.tasks.http.sleep")
+    @patch("core.tasks.http.send", wraps=send)
+    def test_send_retries(self, send_mock, sleep_mock):
+        scc, err = send_serie(
+            [["test"], ["500"], ["404"]],
+            [{}, {}, {}],
+            method=self.method,
+            config=self.config,
+            session=MockRequests
+        )
+        self.check_results(scc, 1)
+        self.check_results(err, 2)
+        retry_calls = [kwargs for args, kwargs in send_mock.call_args_list if "request" in kwargs]
+        self.assertEqual(len(retry_calls), 2)
+        for kwargs in retry_calls:
+            self.assertIn("500", kwargs["request"]["url"])
+        self.assertEqual(len(sleep_mock.call_args_list), 2)
+        first_wait, second_wait = [args[0] for args, kwargs in sleep_mock.call_args_list]
+        self.assertGreater(first_wait, 9)
+        self.assertLessEqual(first_wait, 10)
+        self.assertGreater(second_wait, 19)
+        self.assertLessEqual(second_wait, 20)
+
+    @patch("core.tasks.http.sleep")
+    def test_send_retries_recover(self, sleep_mock):
+        scc, err = send_serie([["500"]], [{}], method=self.method, config=self.config, session=MockRequests)
+        resource = HttpResourceMock.objects.get(id=err[0])
+        resource.status = 200
+        resource.save()
+        scc, err = send_retries(self.config, [[], [resource.id]], session=MockRequests, method=self.method)
+        self.assertEqual(scc, [])
+        self.assertEqual(err, [resource.id])
+        with patch("core.tasks.http.send", return_value=[[resource.id], []]) as send_mock:
+            HttpResourceMock.objects.filter(id=resource.id).update(status=500)
+            scc, err = send_retries(self.config, [[], [resource.id]], session=MockRequests, method=self.method)
+        self.assertEqual(send_mock.call_count, 1)
+        self.assertEqual(scc, [resource.id])
+        self.assertEqual(err, [])
+
+
+class TestThrottledSession(TestCase):
+
+    def setUp(self):
+        super(TestThrottledSession, self).setUp()
+        self.active = 0
+        self.max_active = 0
+        self.lock = Lock()
+        self.session = Mock(send=Mock(side_effect=self.slow_send), token="token")
+
+    def slow_send(self, request, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.active, self.max_active)
+        sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return request.url
+
+    def send_requests(self, session, urls):
+        threads = [Thread(target=session.send, args=(Mock(url=url),)) for url in urls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_host_concurrency(self):
+        session = ThrottledSession(self.session, host_concurrency=2)
+        self.send_requests(session, ["http://localhost:8000/{}".format(number) for number in range(6)])
+        self.assertEqual(self.max_active, 2)
+        self.assertEqual(self.session.send.call_count, 6)
+        self.assertEqual(session.token, "token")
+
+    def test_interval_duration(self):
+        session = ThrottledSession(self.session, host_concurrency=3, interval_duration=0.1)
+        start = datetime.now()
+        self.send_requests(session, ["http://localhost:8000/{}".format(number) for number in range(3)])
+        duration = (datetime.now() - start).total_seconds()
+        self.assertGreater(duration, 0.2)
+        self.assertLess(duration, 0.5)
+
+
+class TestSendMassBatches(TestCase):
+
+    def setUp(self):
+        super(TestSendMassBatches, self).setUp()
+        self.signature = Mock(side_effect=lambda args_list, kwargs_list: [
+            [args[0] for args in args_list if args[0] % 2],
+            [args[0] for args in args_list if not args[0] % 2]
+        ])
+        self.args_list = [[number] for number in range(1, 8)]
+        self.kwargs_list = [{} for number in range(1, 8)]
+
+    def test_batches(self):
+        batches = SendMassBatches(self.signature, 3)
+        self.assertEqual(
+            [args_batch for args_batch, kwargs_batch in batches.batches(self.args_list, self.kwargs_list)],
+            [[[1], [2], [3]], [[4], [5], [6]], [[7]]]
+        )
+        batches = SendMassBatches(self.signature, 3, concat_args_size=2)
+        self.assertEqual(batches.batch_size, 4)
+
+    def test_call(self):
+        batches = SendMassBatches(self.signature, 3)
+        scc, err = batches(self.args_list, self.kwargs_list)
+        self.assertEqual(self.signature.call_count, 3)
+        self.assertEqual(scc, [1, 3, 5, 7])
+        self.assertEqual(err, [2, 4, 6])
+
+    @patch("core.tasks.http.chord")
+    def test_delay(self, chord_mock):
+        batches = SendMassBatches(self.signature, 3)
+        result = batches.delay(self.args_list, self.kwargs_list)
+        self.assertEqual(self.signature.clone.call_count, 3)
+        args, kwargs = self.signature.clone.call_args
+        self.assertEqual(kwargs["args"], ([[7]], [{}],))
+        self.assertEqual(result, chord_mock.return_value.return_value)
+        chord_mock.return_value.assert_called_once_with(batches.body)
+
+    def test_link(self):
+        batches = SendMassBatches(self.signature, 3)
+        callback = merge_results.si([])
+        batches.link(callback)
+        batches.link_error(callback)
+        self.assertEqual(batches.body.options["link"], [callback])
+        self.assertEqual(batches.body.options["link_error"], [callback])
+
+    def test_merge_results(self):
+        self.assertEqual(merge_results([[[1], [2]], [[], [3]], [[4, 5], []]]), [[1, 4, 5], [2, 3]])
+
+
 class TestGetResourceLink(TestHTTPTasksBase):
 
     def test_get_link(self):
@@ -10,6 +10,8 @@ MockTaskChain = Mock(spec=Task, id="result-id")
 MockTask = Mock(spec=Task, id="result-id", return_value=MockTaskChain)
 MockTask.attach_mock(MockTask, "s")
 MockTask.attach_mock(MockTask, "delay")
+MockTask.attach_mock(Mock(), "link")
+MockTask.attach_mock(Mock(), "link_error")
 
 MockAsyncResultPartial = Mock(spec=AsyncResult)
 MockAsyncResultPartial.attach_mock(Mock(return_value=True), "ready")
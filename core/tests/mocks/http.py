@@ -74,7 +74,7 @@ class HttpResourceMock(HttpResource):
         self.session = MockRequests
         self.session.send.reset_mock()
 
-    def send(self, method, *args, **kwargs):
+    def request_arguments(self, method, *args, **kwargs):
         if method == "post":
             query = kwargs.get("query")
             if query:
@@ -82,7 +82,11 @@ class HttpResourceMock(HttpResource):
             args = (self.config.source_language,) + args
         elif method == "get":
             args = (self.config.source_language,) + args
-        return super(HttpResourceMock, self).send(method, *args, **kwargs)
+        return args, kwargs
+
+    def split_content(self, links, keys):
+        content_type, data = links[0].content
+        return {key: data for key in keys if key != "404"}
 
     def auth_parameters(self):
         return {
@@ -58,3 +58,18 @@ class MockRankProcessor(RankProcessor):
 
     def i_think_none_of_it(self, individual):
         return None
+
+
+class MockColumnarRankProcessor(MockRankProcessor):
+
+    COLUMNAR = True
+
+
+class MockFeatureRankProcessor(MockColumnarRankProcessor):
+
+    FEATURE_STORE = True
+
+
+class MockDailyFeatureRankProcessor(MockFeatureRankProcessor):
+
+    DATE_DEPENDENT_HOOKS = ["is_highest"]
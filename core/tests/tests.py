@@ -1,23 +1,33 @@
 from core.utils.tests.configuration import TestConfigurationType, TestConfigurationProperty, TestLoadConfigDecorator
-from core.utils.tests.data import TestPythonReach
-from core.utils.tests.image import TestImageGrid
-from core.utils.tests.helpers import TestUtilHelpers
+from core.utils.tests.data import TestPythonReach, TestKeyPath
+from core.utils.tests.image import TestImageGrid, TestOpenImage
+from core.utils.tests.helpers import TestUtilHelpers, TestBulkUpdate
+from core.utils.tests.http import TestSessions
+from core.utils.tests.compression import TestCompression
+from core.utils.tests.schemas import TestSchemas
+from core.utils.tests.metrics import TestQueryMetrics, TestTimedIterator
+from core.utils.tests.vectors import TestVectorStore
 
 from core.processors.tests.resources import TestHttpResourceProcessor
 from core.processors.tests.extraction import TestExtractProcessor
 from core.processors.tests.rank import TestRankProcessor
 from core.processors.tests.expansion import TestExpansionProcessor
 from core.processors.tests.compare import TestCompareProcessor
+from core.processors.tests.cluster import TestClusterProcessor
 
 from core.models.organisms.tests.growth import TestGrowth
 from core.models.organisms.tests.community import TestCommunityMock
 from core.models.organisms.managers.tests.community import TestCommunityManager
 from core.models.organisms.tests.collective import TestCollective
 from core.models.organisms.tests.individual import TestIndividual
-from core.models.resources.tests.http import TestHttpResourceMock
+from core.models.resources.tests.http import TestHttpResourceMock, TestHttpResourceCache
+from core.models.resources.tests.limits import TestRateLimitBucket, TestDailyQuota
 
 from core.tasks.tests.http import (TestSendMassTaskGet, TestSendMassTaskPost, TestSendTaskGet, TestSendTaskPost,
-                                   TestSendSerieTaskGet, TestSendSerieTaskPost, TestGetResourceLink, TestLoadSession)
+                                   TestSendSerieTaskGet, TestSendSerieTaskPost, TestGetResourceLink, TestLoadSession,
+                                   TestSendConcurrentTask, TestThrottledSession, TestSendMassBatches,
+                                   TestSendMassConcatArgsCache, TestSendRetries)
+from core.tasks.tests.community import TestGrowCommunity
 
 from core.views.tests.collective import TestCollectiveView, TestCollectiveContentView
 from core.views.tests.individual import TestIndividualView, TestIndividualContentView
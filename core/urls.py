@@ -12,6 +12,11 @@ urlpatterns = [
     url(r'^collective/(?P<pk>\d+)/$', views.CollectiveView.as_view(), name="collective"),
     url(r'^individual/(?P<pk>\d+)/content/$', views.IndividualContentView.as_view(), name="individual-content"),
     url(r'^individual/(?P<pk>\d+)/$', views.IndividualView.as_view(), name="individual"),
+    url(
+        r'^community/(?P<community>\w+)/(?P<pk>\d+)/status/$',
+        views.CommunityStatusView.as_view(),
+        name="community-status"
+    ),
     url(r'^$', views.index, name="datascope-index"),
     url(r'^question/$', views.question, name="datascope-question")
 ]
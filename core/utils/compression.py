@@ -0,0 +1,176 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import json
+import zlib
+
+from django.db.models import fields
+
+
+COMPRESSION_HEADER = b"\x00zlib\x00"
+COMPRESSION_LEVEL = 6
+COMPRESSION_MIN_SIZE = 256  # smaller values get stored without compression
+
+
+def compress(data):
+    """
+    Compresses bytes with zlib and prefixes the result with COMPRESSION_HEADER.
+    Data that is already compressed or smaller than COMPRESSION_MIN_SIZE gets returned as is.
+
+    :param data: (bytes) data to compress
+    :return: bytes
+    """
+    if data.startswith(COMPRESSION_HEADER) or len(data) < COMPRESSION_MIN_SIZE:
+        return data
+    return COMPRESSION_HEADER + zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def decompress(data):
+    """
+    Decompresses data that starts with COMPRESSION_HEADER.
+    Any other data gets returned as bytes, which keeps rows readable that were stored before compression.
+
+    :param data: (bytes, memoryview or str) data as stored
+    :return: bytes
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    elif isinstance(data, str):
+        return data.encode("utf-8")
+    if data.startswith(COMPRESSION_HEADER):
+        return zlib.decompress(data[len(COMPRESSION_HEADER):])
+    return data
+
+
+class CompressedValue(object):
+    """
+    Holds the value of a compressed field in the form that it was given or loaded in.
+    Other forms of the value get created when they are requested for the first time.
+    """
+
+    def __init__(self, field, value=None, raw=None):
+        """
+        :param field: the CompressedTextField that the value belongs to
+        :param value: python value of the field
+        :param raw: bytes (possibly compressed) or str as stored in the database
+        """
+        self.field = field
+        self._value = value
+        self._raw = raw.tobytes() if isinstance(raw, memoryview) else raw
+        self._bytes = None
+
+    @property
+    def value(self):
+        if self._value is None:
+            self._value = self.field.from_bytes(self.bytes)
+        return self._value
+
+    @property
+    def bytes(self):
+        if self._bytes is None:
+            self._bytes = decompress(self._raw) if self._raw is not None else self.field.to_bytes(self._value)
+        return self._bytes
+
+    @property
+    def stored(self):
+        if self.field.mutable and self._value is not None:
+            return compress(self.field.to_bytes(self._value))  # the value may have changed in place
+        if isinstance(self._raw, bytes) and self._raw.startswith(COMPRESSION_HEADER):
+            return self._raw  # unchanged since it was loaded
+        return compress(self.bytes)
+
+
+class CompressedDescriptor(object):
+    """
+    Gives access to the python value of a compressed field, which gets decompressed upon first access.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        compressed = instance.__dict__.get(self.field.attname)
+        return compressed.value if compressed is not None else None
+
+    def __set__(self, instance, value):
+        if value is not None and not isinstance(value, CompressedValue):
+            value = self.field.to_compressed_value(value)
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(fields.BinaryField):
+    """
+    This field stores text compressed with zlib, while models get and set the text as a string.
+    Bytes that get set are kept as they are until they get saved or the text is requested.
+    Use get_<field name>_bytes on models to get the (decompressed) bytes without decoding them.
+
+    NB: rows that were stored without compression remain readable.
+    """
+
+    mutable = False
+
+    def contribute_to_class(self, cls, name, virtual_only=False):
+        super(CompressedTextField, self).contribute_to_class(cls, name)
+        setattr(cls, self.attname, CompressedDescriptor(self))
+        attname = self.attname
+
+        def get_bytes(instance):
+            compressed = instance.__dict__.get(attname)
+            return compressed.bytes if compressed is not None else None
+
+        setattr(cls, "get_{}_bytes".format(self.name), get_bytes)
+
+    def from_bytes(self, data):
+        return data.decode("utf-8", "replace")
+
+    def to_bytes(self, value):
+        return value.encode("utf-8")
+
+    def to_compressed_value(self, value):
+        if isinstance(value, (bytes, memoryview,)):
+            return CompressedValue(self, raw=value)
+        return CompressedValue(self, value=value)
+
+    def from_db_value(self, value, expression, connection, context):
+        if value is None:
+            return value
+        return CompressedValue(self, raw=value)
+
+    def to_python(self, value):
+        return value
+
+    def pre_save(self, model_instance, add):
+        return model_instance.__dict__.get(self.attname)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if not isinstance(value, CompressedValue):
+            value = self.to_compressed_value(value)
+        return value.stored
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+
+class CompressedJSONField(CompressedTextField):
+    """
+    This field stores JSON compressed with zlib, while models get and set python data.
+    """
+
+    mutable = True
+
+    def from_bytes(self, data):
+        return json.loads(data.decode("utf-8"))
+
+    def to_bytes(self, value):
+        return json.dumps(value).encode("utf-8")
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj))
@@ -1,10 +1,96 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 import json
-import copy
+from functools import lru_cache
 from collections import Counter
 
 
+class KeyPath(object):
+    """
+    A compiled form of the paths that reach() and expand() understand.
+
+    Paths get split into their parts once upon initialization,
+    which makes it cheap to reach for the same path into many data structures.
+    Use compile_path() to get a cached instance for a path string.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        key = path
+        if key and key.startswith("$"):  # TODO: fix now that legacy is gone
+            key = key[2:] if len(key) > 1 else None
+        if key is None:
+            self.parts = None
+            self.fallback = None
+        else:
+            self.parts = tuple(int(part) if part.isdigit() else part for part in key.split('.'))
+            self.fallback = int(key) if key.isdigit() else key
+        # Wildcards get expanded by reaching for the part of the path before the first wildcard
+        self.has_wildcard = False
+        self.wildcard_prefix = None
+        if path is not None:
+            prefix = None
+            for part in path.split('.'):
+                if part == '*':
+                    self.has_wildcard = True
+                    self.wildcard_prefix = prefix
+                    break
+                prefix = part if prefix is None else prefix + '.' + part
+
+    def reach(self, data):
+        """
+        Returns the value belonging to the path in data. See reach() for details.
+
+        :param data: The data to reach into
+        :return: The value from data (not a copy) or None
+        """
+        # First we check whether we really get a structure we can use
+        if self.parts is None:
+            return data
+        if not isinstance(data, (dict, list, tuple)):
+            raise TypeError("Reach needs dict, list or tuple as input, got {} instead".format(type(data)))
+
+        # We see how far we get with using the path parts as key/index
+        value = data
+        try:
+            for part in self.parts:
+                value = value[part]
+            return value
+        except (IndexError, KeyError, TypeError):
+            pass
+
+        # We try the path as key/index or return None.
+        return data[self.fallback] if self.fallback in data else None
+
+    def expand(self, data):
+        """
+        Replaces the first wildcard of the path with every index available in data.
+
+        :param data: The data to expand the path for
+        :return: A list of paths or an empty list if the path has no wildcards
+        """
+        if not self.has_wildcard:
+            return []
+        return [
+            self.path.replace('*', str(ind), 1)
+            for ind, value in enumerate(compile_path(self.wildcard_prefix).reach(data))
+        ]
+
+    def __repr__(self):
+        return "KeyPath({!r})".format(self.path)
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path):
+    """
+    Returns a KeyPath for given path. KeyPaths get cached by their path string.
+
+    :param path: (string) path as understood by reach()
+    :return: KeyPath
+    """
+    return KeyPath(path)
+
+
 def reach(path, data):
     """
     Reach takes a data structure and a path. It will return the value belonging to the path,
@@ -19,38 +105,10 @@ def reach(path, data):
     }
     "test.test" as path would return "second level test"
     while "test.1" as path would return "test1"
-    """
-    if path and path.startswith("$"):  # TODO: fix now that legacy is gone
-        if len(path) > 1:
-            path = path[2:]
-        else:
-            path = None
-
-    # First we check whether we really get a structure we can use
-    if path is None:
-        return data
-    if not isinstance(data, (dict, list, tuple)):
-        raise TypeError("Reach needs dict, list or tuple as input, got {} instead".format(type(data)))
 
-    # We make a copy of the input for later reference
-    root = copy.deepcopy(data)
-
-    # We split the path and see how far we get with using it as key/index
-    try:
-        for part in path.split('.'):
-            if part.isdigit():
-                data = data[int(part)]
-            else:
-                data = data[part]
-        else:
-            return data
-
-    except (IndexError, KeyError, TypeError):
-        pass
-
-    # We try the path as key/index or return None.
-    path = int(path) if path.isdigit() else path
-    return root[path] if path in root else None
+    NB: the returned value is not a copy. Copy it before making changes that shouldn't affect data.
+    """
+    return compile_path(path).reach(data)
 
 
 def interpolate(interpolate_path, source_path):
@@ -96,17 +154,7 @@ def expand(keypath, data):  # TODO: handle exceptions better like dotted.key etc
     new = []
 
     for path in paths:
-        pth = None
-
-        for part in path.split('.'):
-
-            if part == '*':  # TODO: prevent dict access here
-                for ind, value in enumerate(reach(pth, data)):
-                    new_path = path.replace('*', str(ind), 1)
-                    new.append(new_path)
-                break
-            else:
-                pth = part if pth is None else pth + '.' + part
+        new += compile_path(path).expand(data)
 
     if new:
         return expand(new, data)
@@ -134,8 +182,8 @@ def extractor(target, objective):
     # General preparation
     results = []
     defaults = dict(objective)
-    paths = [path if not path.startswith('_') else path[1:] for path in objective.iterkeys()]
-    triggers = set([path.split('.')[0] for path in objective.iterkeys() if not path.startswith('_')])
+    paths = [compile_path(path if not path.startswith('_') else path[1:]) for path in objective]
+    triggers = set([path.split('.')[0] for path in objective if not path.startswith('_')])
 
     # Function which calls itself when necessary
     def extract(target):
@@ -147,16 +195,16 @@ def extractor(target, objective):
 
         # Extract data when confronted with dict
         elif isinstance(target, dict):
-            for key in target.iterkeys():
+            for key in target:
                 # When a key in target is a trigger , create default result from objective
                 # and reach for all paths in paths to fill result.
                 if key in triggers:
                     result = dict(defaults)
                     updated = False
                     for path in paths:
-                        reached = reach(path, target)
+                        reached = path.reach(target)
                         if reached is not None:
-                            result[path] = reached
+                            result[path.path] = reached
                             updated = True
                     if updated:
                         results.append(result)
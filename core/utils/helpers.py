@@ -7,6 +7,7 @@ from itertools import islice, cycle
 
 from django.apps import apps as django_apps
 from django.conf import settings
+from django.db.models import Case, When, Value, F
 
 
 def get_any_model(name):
@@ -69,6 +70,34 @@ def ibatch(iterable, batch_size):
         yield batch
 
 
+def bulk_update(instances, fields, batch_size=100):
+    """
+    Writes the values of fields for model instances to the database with one UPDATE query per batch.
+    Instances are expected to be saved before and to be of the same model.
+
+    :param instances: (list) model instances to write
+    :param fields: (list) names of the fields to write
+    :param batch_size: (int) amount of instances to update per query
+    :return: (int) amount of updated rows
+    """
+    update_count = 0
+    for batch in ibatch(instances, batch_size):
+        model = batch[0].__class__
+        updates = {}
+        for name in fields:
+            field = model._meta.get_field(name)
+            updates[field.name] = Case(
+                *[
+                    When(pk=instance.pk, then=Value(getattr(instance, field.attname), output_field=field))
+                    for instance in batch
+                ],
+                default=F(field.name),
+                output_field=field
+            )
+        update_count += model.objects.filter(pk__in=[instance.pk for instance in batch]).update(**updates)
+    return update_count
+
+
 def iroundrobin(*iterables):
     "iroundrobin('ABC', 'D', 'EF') --> A D E B F C"
     # Recipe credited to George Sakkis
@@ -0,0 +1,51 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import os
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+_shared_sessions = {}
+_shared_sessions_lock = Lock()
+
+
+def create_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Creates a requests session that keeps connections alive in a pool for every host it connects to.
+
+    :param pool_connections: (int) amount of hosts to keep a connection pool for
+    :param pool_maxsize: (int) amount of connections to keep alive per host
+    :return: requests.Session
+    """
+    session = requests.Session()
+    for prefix in ["http://", "https://"]:
+        session.mount(prefix, HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+    return session
+
+
+def get_shared_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Returns a session that gets shared by everything in the current process that uses the same pool sizes.
+    Connections from a forked process never get reused, because every process gets its own sessions.
+    Use create_session instead when a session needs its own state like cookies or tokens.
+
+    :param pool_connections: (int) amount of hosts to keep a connection pool for
+    :param pool_maxsize: (int) amount of connections to keep alive per host
+    :return: requests.Session
+    """
+    key = (os.getpid(), pool_connections, pool_maxsize,)
+    session = _shared_sessions.get(key)
+    if session is not None:
+        return session
+    with _shared_sessions_lock:
+        if key not in _shared_sessions:
+            pid = key[0]
+            for stale_key in [stale_key for stale_key in _shared_sessions if stale_key[0] != pid]:
+                del _shared_sessions[stale_key]
+            _shared_sessions[key] = create_session(pool_connections, pool_maxsize)
+        return _shared_sessions[key]
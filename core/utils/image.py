@@ -15,9 +15,27 @@ class CouldNotFillGrid(Exception):
     pass
 
 
+def open_image(file_name, minimum_size=None):
+    """
+    Opens and decodes an image from the default storage.
+    When a minimum size is given JPEGs get decoded at the smallest scale that is at least that size,
+    which is much faster for large images.
+
+    :param file_name: (str) name of the image in the default storage
+    :param minimum_size: (tuple) optional minimum width and height of the decoded image
+    :return: a decoded PIL image
+    :raises IOError: when the image can't be decoded
+    """
+    image = Image.open(default_storage.open(file_name))
+    if minimum_size is not None:
+        image.draft("RGB", minimum_size)
+    image.load()
+    return image
+
+
 class ImageGrid(object):
 
-    def __init__(self, columns, rows, cell_width, cell_height):
+    def __init__(self, columns, rows, cell_width, cell_height, cache=None):
         assert cell_width > cell_height, \
             "Image grid expect cells to be landscape oriented"
         self.columns = columns
@@ -29,6 +47,7 @@ class ImageGrid(object):
             [None for cell in range(0, rows) for row in range(0, columns)]
         )
         self.index = 0
+        self.cache = cache  # NB: a dict to size images once, keyed by id(image), so images must outlive the cache
 
     def next_carousel_image(self):
         try:
@@ -119,6 +138,25 @@ class ImageGrid(object):
 
         return image, horizontal, vertical
 
+    def cached_size_image(self, image):
+        """
+        Sizes an image like size_image, but only once per cell size when the grid has a cache.
+        """
+        if self.cache is None:
+            return self.size_image(image)
+        key = (id(image), self.cell_width, self.cell_height,)
+        if key not in self.cache:
+            try:
+                self.cache[key] = self.size_image(image)
+            except ImageRejected:
+                self.cache[key] = None
+        if self.cache[key] is None:
+            raise ImageRejected("Image was rejected for cell size {}:{} before".format(
+                self.cell_width,
+                self.cell_height
+            ))
+        return self.cache[key]
+
     def _cell_image(self, cell_index, image_info):
         image, horizontal, vertical = image_info
         self.cells[cell_index] = image
@@ -144,7 +182,7 @@ class ImageGrid(object):
     def fill(self, images):
         for image in images:
             try:
-                self.images.append(self.size_image(image))
+                self.images.append(self.cached_size_image(image))
             except ImageRejected:
                 pass
 
@@ -0,0 +1,77 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from time import time
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class QueryMetrics(object):
+    """
+    Counts the queries and their total duration for a database connection while used as a context manager.
+    Django only logs queries through a debug cursor, so the connection uses a debug cursor while measuring.
+    Queries still get logged as usual for connections that were logging already.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        self.count = 0
+        self.time = 0.0
+        self._queries_log = None
+        self._queries_logged = False
+        self._force_debug_cursor = False
+
+    def __enter__(self):
+        self._queries_log = self.connection.queries_log
+        self._queries_logged = self.connection.queries_logged
+        self._force_debug_cursor = self.connection.force_debug_cursor
+        self.connection.queries_log = self
+        self.connection.force_debug_cursor = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.connection.queries_log = self._queries_log
+        self.connection.force_debug_cursor = self._force_debug_cursor
+
+    # Methods that make this class act like the queries log of the connection
+
+    def append(self, query):
+        self.count += 1
+        self.time += float(query["time"])
+        if self._queries_logged:
+            self._queries_log.append(query)
+
+    def clear(self):
+        self._queries_log.clear()
+
+    def __iter__(self):
+        return iter(self._queries_log)
+
+    def __len__(self):
+        return len(self._queries_log)
+
+    @property
+    def maxlen(self):
+        return self._queries_log.maxlen
+
+
+class TimedIterator(object):
+    """
+    Wraps an iterable and sums the time spent on getting its items.
+    That way the time of a lazy producer can be told apart from the time of its consumer.
+    """
+
+    def __init__(self, iterable):
+        self.iterator = iter(iterable)
+        self.duration = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time()
+        try:
+            return next(self.iterator)
+        finally:
+            self.duration += time() - start
+
+    next = __next__  # Python 2
@@ -0,0 +1,92 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import json
+import hashlib
+from copy import deepcopy
+from threading import local
+
+from jsonschema.validators import validator_for
+
+
+VALIDATOR_CACHE_SIZE = 512
+
+_cache = local()  # NB: validators resolve references with internal state, so every thread gets its own
+
+
+def schema_fingerprint(schema):
+    """
+    Returns a string that is the same for every schema with the same content, regardless of key order.
+
+    :param schema: (dict) a JSON schema
+    :return: (str) fingerprint
+    """
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_validator(schema):
+    """
+    Returns a validator for schema that gets compiled and checked only once for every schema fingerprint.
+    A schema object that was seen before skips the fingerprint,
+    as long as it still equals the schema of its validator. Trivial schemas like {} accept anything and return None.
+
+    :param schema: (dict) a JSON schema
+    :return: jsonschema validator or None
+    """
+    if not schema:
+        return None
+    validators = getattr(_cache, "validators", None)
+    if validators is None:
+        validators = _cache.validators = {}
+        _cache.identities = {}
+    identities = _cache.identities
+    # NB: identities keep the schema object alive, so its id can't get reused by another object
+    known_schema, validator = identities.get(id(schema), (None, None,))
+    if known_schema is schema and validator.schema == schema:
+        return validator
+    fingerprint = schema_fingerprint(schema)
+    validator = validators.get(fingerprint)
+    if validator is None:
+        schema_copy = deepcopy(schema)  # later changes to the schema should not change the cached validator
+        Validator = validator_for(schema_copy)
+        Validator.check_schema(schema_copy)
+        validator = Validator(schema_copy)
+        if len(validators) >= VALIDATOR_CACHE_SIZE:
+            validators.clear()
+        validators[fingerprint] = validator
+    if len(identities) >= VALIDATOR_CACHE_SIZE:
+        identities.clear()
+    identities[id(schema)] = (schema, validator,)
+    return validator
+
+
+def validate(instance, schema):
+    """
+    Validates instance against schema like jsonschema.validate does, but with a cached validator.
+
+    :param instance: data to validate
+    :param schema: (dict) a JSON schema
+    :return: None
+    :raises jsonschema.exceptions.ValidationError: when the instance is invalid
+    """
+    validator = get_validator(schema)
+    if validator is not None:
+        validator.validate(instance)
+
+
+def validate_batch(instances, schema):
+    """
+    Validates every instance against schema with a single validator.
+
+    :param instances: (iterable) data to validate
+    :param schema: (dict) a JSON schema
+    :return: (dict) the first jsonschema ValidationError of every invalid instance by the index of the instance
+    """
+    validator = get_validator(schema)
+    if validator is None:
+        return {}
+    errors = {}
+    for index, instance in enumerate(instances):
+        error = next(validator.iter_errors(instance), None)
+        if error is not None:
+            errors[index] = error
+    return errors
@@ -0,0 +1,53 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import json
+import zlib
+from unittest import TestCase
+
+from core.utils.compression import (compress, decompress, COMPRESSION_HEADER, COMPRESSION_MIN_SIZE,
+                                    CompressedValue, CompressedTextField, CompressedJSONField)
+
+
+class TestCompression(TestCase):
+
+    def setUp(self):
+        super(TestCompression, self).setUp()
+        self.data = json.dumps({"test": ["überhaupt"] * COMPRESSION_MIN_SIZE}).encode("utf-8")
+
+    def test_compress(self):
+        compressed = compress(self.data)
+        self.assertTrue(compressed.startswith(COMPRESSION_HEADER))
+        self.assertLess(len(compressed), len(self.data))
+        self.assertEqual(zlib.decompress(compressed[len(COMPRESSION_HEADER):]), self.data)
+        self.assertIs(compress(compressed), compressed)
+        self.assertEqual(compress(b"small"), b"small")
+
+    def test_decompress(self):
+        self.assertEqual(decompress(compress(self.data)), self.data)
+        self.assertEqual(decompress(memoryview(compress(self.data))), self.data)
+        # Data stored before compression
+        self.assertEqual(decompress(self.data), self.data)
+        self.assertEqual(decompress(self.data.decode("utf-8")), self.data)
+
+    def test_compressed_text_value(self):
+        field = CompressedTextField()
+        compressed = compress(self.data)
+        value = CompressedValue(field, raw=compressed)
+        self.assertIsNone(value._bytes)
+        self.assertEqual(value.value, self.data.decode("utf-8"))
+        self.assertIs(value.stored, compressed)
+        value = CompressedValue(field, raw=self.data)
+        self.assertIs(value.bytes, self.data)
+        self.assertIsNone(value._value)
+        self.assertEqual(value.stored, compressed)
+        value = CompressedValue(field, value="text")
+        self.assertEqual(value.bytes, b"text")
+        self.assertEqual(value.stored, b"text")
+
+    def test_compressed_json_value(self):
+        field = CompressedJSONField()
+        value = CompressedValue(field, raw=compress(self.data))
+        data = value.value
+        self.assertEqual(data, json.loads(self.data.decode("utf-8")))
+        data["test"] = []
+        self.assertEqual(value.stored, json.dumps(data).encode("utf-8"))
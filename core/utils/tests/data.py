@@ -1,7 +1,7 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 from unittest import TestCase
-from core.utils.data import extractor, reach, expand, interpolate
+from core.utils.data import extractor, reach, expand, interpolate, compile_path, KeyPath
 
 
 class TestPythonReach(TestCase):
@@ -47,6 +47,43 @@ class TestPythonReach(TestCase):
         except TypeError:
             pass
 
+    def test_no_copies(self):
+        self.assertIs(reach("dict.list", self.test_dict), self.test_dict["dict"]["list"])
+        self.assertIs(reach("$.dict", self.test_dict), self.test_dict["dict"])
+
+
+class TestKeyPath(TestCase):
+
+    def setUp(self):
+        self.test_dict = {
+            "dict": {
+                "test": "nested value",
+                "list": ["nested value 0", "nested value 1", "nested value 2"],
+            },
+            "list": ["value 0", "value 1", "value 2"],
+            "dotted.key": "another value"
+        }
+
+    def test_compile_path(self):
+        path = compile_path("$.dict.list.1")
+        self.assertIsInstance(path, KeyPath)
+        self.assertEqual(path.parts, ("dict", "list", 1,))
+        self.assertIs(path, compile_path("$.dict.list.1"))
+        self.assertIsNone(compile_path("$").parts)
+        self.assertIsNone(compile_path(None).parts)
+
+    def test_reach(self):
+        self.assertEqual(compile_path("dict.list.1").reach(self.test_dict), "nested value 1")
+        self.assertEqual(compile_path("$.dotted.key").reach(self.test_dict), "another value")
+        self.assertIsNone(compile_path("does.not.exist").reach(self.test_dict))
+        self.assertIs(compile_path("$").reach(self.test_dict), self.test_dict)
+
+    def test_expand(self):
+        self.assertEqual(compile_path("dict.list.*").expand(self.test_dict), [
+            "dict.list.0", "dict.list.1", "dict.list.2"
+        ])
+        self.assertEqual(compile_path("dict.list").expand(self.test_dict), [])
+
 
 class TestPythonExtractor(TestCase):
 
@@ -2,6 +2,11 @@ from __future__ import unicode_literals, absolute_import, print_function, divisi
 
 from unittest import TestCase
 
+from django.test import TestCase as DjangoTestCase
+
+from core.models.organisms import Individual
+from core.utils.helpers import bulk_update
+
 
 class TestUtilHelpers(TestCase):
 
@@ -15,4 +20,20 @@ class TestUtilHelpers(TestCase):
         self.skipTest("not tested")
 
     def test_parse_datetime_string(self):
-        self.skipTest("not tested")
\ No newline at end of file
+        self.skipTest("not tested")
+
+class TestBulkUpdate(DjangoTestCase):
+
+    fixtures = ["test-organisms"]
+
+    def test_bulk_update(self):
+        individuals = list(Individual.objects.all())
+        for individual in individuals:
+            individual.properties["number"] = individual.id
+            individual.identity = "identity {}".format(individual.id)
+        with self.assertNumQueries(2):
+            update_count = bulk_update(individuals, ["properties", "identity"], batch_size=len(individuals) - 1)
+        self.assertEqual(update_count, len(individuals))
+        for individual in Individual.objects.all():
+            self.assertEqual(individual.properties["number"], individual.id)
+            self.assertEqual(individual.identity, "identity {}".format(individual.id))
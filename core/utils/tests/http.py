@@ -0,0 +1,34 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from unittest import TestCase
+
+from mock import patch
+
+from core.utils.http import create_session, get_shared_session
+
+
+class TestSessions(TestCase):
+
+    def test_create_session(self):
+        session = create_session(pool_connections=2, pool_maxsize=5)
+        for prefix in ["http://", "https://"]:
+            adapter = session.get_adapter(prefix + "localhost/")
+            self.assertEqual(adapter._pool_connections, 2)
+            self.assertEqual(adapter._pool_maxsize, 5)
+        self.assertIsNot(create_session(), create_session())
+
+    def test_get_shared_session(self):
+        session = get_shared_session()
+        self.assertIs(get_shared_session(), session)
+        self.assertIsNot(get_shared_session(pool_maxsize=20), session)
+        self.assertIs(get_shared_session(pool_maxsize=20), get_shared_session(pool_maxsize=20))
+        adapter = get_shared_session(pool_maxsize=20).get_adapter("https://localhost/")
+        self.assertEqual(adapter._pool_maxsize, 20)
+
+    @patch("core.utils.http.os.getpid", return_value=-1)
+    def test_get_shared_session_forked(self, getpid):
+        session = get_shared_session()
+        getpid.return_value = -2
+        forked_session = get_shared_session()
+        self.assertIsNot(forked_session, session)
+        self.assertIs(get_shared_session(), forked_session)
@@ -1,13 +1,14 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 import types
+from six import BytesIO
 
 from PIL import Image
 
 from unittest import TestCase
-from mock import Mock, MagicMock
+from mock import Mock, MagicMock, patch
 
-from core.utils.image import ImageGrid, ImageRejected, CouldNotFillGrid
+from core.utils.image import ImageGrid, ImageRejected, CouldNotFillGrid, open_image
 
 
 def monkey_patch_mock_image(image):
@@ -159,3 +160,60 @@ class TestImageGrid(TestCase):
             pass
 
         self.skipTest("Test with panorama images at the border")
+
+    def test_fill_cache(self):
+        cache = {}
+        images = [
+            Image.new("RGB", (18, 30)),
+            Image.new("RGB", (20, 12)),
+            Image.new("RGB", (36, 10)),
+            Image.new("RGB", (5, 5)),  # too small
+        ]
+        image_grid = ImageGrid(4, 3, 16, 9, cache=cache)
+        image_grid.fill(images)
+        self.assertEqual(len(cache), 4)
+        with patch.object(ImageGrid, "size_image") as size_image:
+            cached_grid = ImageGrid(4, 3, 16, 9, cache=cache)
+            cached_grid.fill(images)
+            self.assertEqual(size_image.call_count, 0)
+        self.assertEqual(cached_grid.images, image_grid.images)
+        self.assertEqual(cached_grid.cells, image_grid.cells)
+        larger_grid = ImageGrid(4, 3, 8, 4, cache=cache)
+        larger_grid.fill(images)
+        self.assertEqual(len(cache), 8)
+        self.assertEqual(larger_grid.images[0][0].size, (8, 8))
+
+
+class TestOpenImage(TestCase):
+
+    @staticmethod
+    def get_image_file(image_format):
+        image_file = BytesIO()
+        Image.new("RGB", (400, 300)).save(image_file, image_format)
+        image_file.seek(0)
+        return image_file
+
+    @patch("core.utils.image.default_storage")
+    def test_open_image(self, default_storage):
+        default_storage.open.return_value = self.get_image_file("JPEG")
+        image = open_image("downloads/image.jpg")
+        default_storage.open.assert_called_once_with("downloads/image.jpg")
+        self.assertEqual(image.size, (400, 300))
+        # JPEGs decode at a smaller scale when possible
+        default_storage.open.return_value = self.get_image_file("JPEG")
+        image = open_image("downloads/image.jpg", (100, 60))
+        self.assertEqual(image.size, (100, 75))
+        default_storage.open.return_value = self.get_image_file("JPEG")
+        image = open_image("downloads/image.jpg", (300, 200))
+        self.assertEqual(image.size, (400, 300))
+        # Other formats decode as usual
+        default_storage.open.return_value = self.get_image_file("PNG")
+        image = open_image("downloads/image.png", (100, 60))
+        self.assertEqual(image.size, (400, 300))
+        # Images that are not images
+        default_storage.open.return_value = BytesIO(b"not an image")
+        try:
+            open_image("downloads/image.jpg")
+            self.fail("open_image should raise IOError for invalid images")
+        except IOError:
+            pass
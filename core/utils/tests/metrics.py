@@ -0,0 +1,52 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from time import sleep
+
+from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.models.organisms import Individual
+from core.utils.metrics import QueryMetrics, TimedIterator
+
+
+class TestQueryMetrics(TestCase):
+
+    fixtures = ["test-organisms"]
+
+    def test_count(self):
+        queries_log = connection.queries_log
+        with QueryMetrics() as queries:
+            list(Individual.objects.all())
+            Individual.objects.count()
+        self.assertEqual(queries.count, 2)
+        self.assertGreaterEqual(queries.time, 0.0)
+        self.assertIs(connection.queries_log, queries_log)
+        self.assertFalse(connection.force_debug_cursor)
+        Individual.objects.count()
+        self.assertEqual(queries.count, 2)
+
+    def test_nested(self):
+        with CaptureQueriesContext(connection) as captured:
+            with QueryMetrics() as outer:
+                Individual.objects.count()
+                with QueryMetrics() as inner:
+                    Individual.objects.count()
+        self.assertEqual(inner.count, 1)
+        self.assertEqual(outer.count, 2)
+        self.assertEqual(len(captured), 2)
+
+
+class TestTimedIterator(TestCase):
+
+    def test_duration(self):
+
+        def produce():
+            for number in range(3):
+                sleep(0.01)
+                yield number
+
+        iterator = TimedIterator(produce())
+        self.assertEqual(list(iterator), [0, 1, 2])
+        self.assertGreaterEqual(iterator.duration, 0.03)
+        self.assertEqual(list(TimedIterator([])), [])
@@ -0,0 +1,68 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from unittest import TestCase
+
+from mock import patch
+from jsonschema.exceptions import ValidationError, SchemaError
+
+from core.utils.schemas import schema_fingerprint, get_validator, validate, validate_batch
+
+
+class TestSchemas(TestCase):
+
+    def setUp(self):
+        super(TestSchemas, self).setUp()
+        self.schema = {
+            "type": "object",
+            "properties": {
+                "value": {"type": "string"}
+            },
+            "required": ["value"]
+        }
+
+    def test_schema_fingerprint(self):
+        reordered = {
+            "required": ["value"],
+            "properties": {
+                "value": {"type": "string"}
+            },
+            "type": "object"
+        }
+        self.assertEqual(schema_fingerprint(self.schema), schema_fingerprint(reordered))
+        self.assertNotEqual(schema_fingerprint(self.schema), schema_fingerprint({"type": "object"}))
+
+    def test_get_validator(self):
+        validator = get_validator(self.schema)
+        self.assertIs(get_validator(dict(self.schema)), validator)
+        self.schema["properties"]["value"]["type"] = "integer"
+        self.assertIsNot(get_validator(self.schema), validator)
+        self.assertIsNone(get_validator({}))
+        self.assertIsNone(get_validator(None))
+        self.assertRaises(SchemaError, get_validator, {"type": 1})
+
+    def test_get_validator_identity(self):
+        validator = get_validator(self.schema)
+        with patch("core.utils.schemas.schema_fingerprint", wraps=schema_fingerprint) as fingerprint:
+            self.assertIs(get_validator(self.schema), validator)
+            self.assertFalse(fingerprint.called)
+            # Changes to a known schema object get noticed
+            self.schema["properties"]["other"] = {"type": "integer"}
+            self.assertIsNot(get_validator(self.schema), validator)
+            self.assertEqual(fingerprint.call_count, 1)
+            validate({"value": "test"}, self.schema)
+            self.assertEqual(fingerprint.call_count, 1)
+
+    def test_validate(self):
+        validate({"value": "test"}, self.schema)
+        self.assertRaises(ValidationError, validate, {"value": 1}, self.schema)
+        with patch("core.utils.schemas.validator_for") as validator_for:
+            validate({"value": 1}, {})
+            validator_for.assert_not_called()
+
+    def test_validate_batch(self):
+        errors = validate_batch([{"value": "test"}, {"value": 1}, {}, {"value": "test"}], self.schema)
+        self.assertEqual(sorted(errors.keys()), [1, 2])
+        for error in errors.values():
+            self.assertIsInstance(error, ValidationError)
+        self.assertEqual(validate_batch([{"value": "test"}], self.schema), {})
+        self.assertEqual(validate_batch([{"value": 1}], {}), {})
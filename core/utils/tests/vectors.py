@@ -0,0 +1,83 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+from mock import patch, Mock
+
+from core.utils.vectors import VectorStore, delete_collective_vectors
+
+
+class TestVectorStore(TestCase):
+
+    def setUp(self):
+        super(TestVectorStore, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.store = VectorStore(os.path.join(self.directory, "vectors", "test"))
+        self.items = [("a.jpg", [1.0, 2.0, 3.0]), ("b.jpg", [0.5, 0.25, 0.0])]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super(TestVectorStore, self).tearDown()
+
+    def test_save(self):
+        self.assertFalse(self.store.exists())
+        index = self.store.save(iter(self.items))
+        self.assertEqual(index, {"a.jpg": 0, "b.jpg": 1})
+        self.assertTrue(self.store.exists())
+        self.assertFalse(os.path.exists(self.store.matrix_file + ".tmp"))
+        self.store.save(self.items[1:])
+        self.assertEqual(VectorStore(self.store.path).index, {"b.jpg": 0})
+        try:
+            self.store.save([("a.jpg", [1.0]), ("b.jpg", [1.0, 2.0])])
+            self.fail("VectorStore.save should not accept vectors of different length")
+        except (AssertionError, ValueError):
+            pass
+
+    def test_read(self):
+        self.store.save(self.items)
+        store = VectorStore(self.store.path)
+        self.assertIsInstance(store.matrix, np.memmap)
+        self.assertEqual(store.matrix.dtype, np.float32)
+        self.assertEqual(store.matrix.shape, (2, 3))
+        self.assertIn("b.jpg", store)
+        self.assertNotIn("c.jpg", store)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(list(store["a.jpg"]), [1.0, 2.0, 3.0])
+        self.assertEqual(store.matrix[[1, 0]].tolist(), [[0.5, 0.25, 0.0], [1.0, 2.0, 3.0]])
+
+    def test_delete(self):
+        self.store.save(self.items)
+        self.store.delete()
+        self.assertFalse(self.store.exists())
+        self.store.delete()
+
+    def test_read_individuals(self):
+        self.store.save(self.items)
+        missing = VectorStore(os.path.join(self.directory, "vectors", "missing"))
+        individuals = [
+            {"vector_collective": 1, "vector_row": 1},
+            {"vectors": [1.0, 2.0, 3.0]},
+            {"vector_collective": 2, "vector_row": 0},
+            {"vector_collective": 1, "vector_row": 0},
+        ]
+        stores = {2: missing}
+        with patch.object(VectorStore, "for_collective", return_value=self.store) as for_collective:
+            results = list(VectorStore.read_individuals(individuals, stores))
+            for_collective.assert_called_once_with(1)
+        self.assertEqual(len(results), 1)
+        indices, matrix = results[0]
+        self.assertEqual(indices.tolist(), [0, 3])
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertEqual(matrix.tolist(), [[0.5, 0.25, 0.0], [1.0, 2.0, 3.0]])
+        self.assertEqual(stores, {1: self.store, 2: missing})
+
+    def test_delete_collective_vectors(self):
+        self.store.save(self.items)
+        with patch.object(VectorStore, "for_collective", return_value=self.store) as for_collective:
+            delete_collective_vectors(None, instance=Mock(id=1))
+            for_collective.assert_called_once_with(1)
+        self.assertFalse(self.store.exists())
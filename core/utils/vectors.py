@@ -0,0 +1,129 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+import os
+import json
+
+from django.core.files.storage import default_storage
+
+
+class VectorStore(object):
+    """
+    Stores vectors of equal length as rows of a single float32 matrix in a .npy file.
+    A JSON file next to it maps keys to rows. Reading memory-maps the matrix,
+    so vectors never get parsed and only rows that get used are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.matrix_file = path + ".npy"
+        self.index_file = path + ".json"
+        self._matrix = None
+        self._index = None
+
+    @classmethod
+    def for_collective(cls, collective_id):
+        """
+        Returns the store for vectors of Individuals in a Collective, which lives in the default file storage.
+        """
+        return cls(default_storage.path("vectors/collective-{}".format(collective_id)))
+
+    @classmethod
+    def read_individuals(cls, individuals, stores=None):
+        """
+        Reads the vectors of individuals that hold a vector_collective and vector_row from the store
+        of the Collective the vectors were saved for. Rows get read with a single lookup per store.
+        Individuals of Collectives without a store get skipped.
+
+        :param individuals: (list) dictionaries that may hold a vector_collective and vector_row
+        :param stores: (dict) optional stores by Collective id, which get reused and filled
+        :return: (iterator) indices of individuals and a matrix with their vectors for every store
+        """
+        import numpy as np
+        stores = stores if stores is not None else {}
+        rows = {}
+        for index, individual in enumerate(individuals):
+            collective_id = individual.get("vector_collective")
+            row = individual.get("vector_row")
+            if collective_id is None or row is None:
+                continue
+            rows.setdefault(collective_id, []).append((index, row,))
+        for collective_id, index_rows in rows.items():
+            if collective_id not in stores:
+                stores[collective_id] = cls.for_collective(collective_id)
+            store = stores[collective_id]
+            if not store.exists():
+                continue
+            indices = np.array([index for index, row in index_rows], dtype=int)
+            yield indices, np.array(store.matrix[[row for index, row in index_rows]], dtype=np.float32)
+
+    def exists(self):
+        return os.path.exists(self.matrix_file) and os.path.exists(self.index_file)
+
+    def save(self, items):
+        """
+        Writes vectors to the store replacing anything that was stored before.
+        Files get written under a temporary name first, so readers never see half written files.
+
+        :param items: (iterable) key and vector pairs
+        :return: (dict) the row for every key
+        """
+        import numpy as np
+        index = {}
+        vectors = []
+        for key, vector in items:
+            index[key] = len(vectors)
+            vectors.append(vector)
+        matrix = np.array(vectors, dtype=np.float32)
+        assert matrix.ndim == 2 or not vectors, "VectorStore expects vectors of equal length"
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.matrix_file + ".tmp", "wb") as matrix_file:
+            np.save(matrix_file, matrix)
+        with open(self.index_file + ".tmp", "w") as index_file:
+            json.dump(index, index_file)
+        os.rename(self.matrix_file + ".tmp", self.matrix_file)
+        os.rename(self.index_file + ".tmp", self.index_file)
+
+        self._matrix = None
+        self._index = index
+        return index
+
+    def delete(self):
+        for file_name in [self.matrix_file, self.index_file]:
+            if os.path.exists(file_name):
+                os.remove(file_name)
+        self._matrix = None
+        self._index = None
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            import numpy as np
+            self._matrix = np.load(self.matrix_file, mmap_mode="r")
+        return self._matrix
+
+    @property
+    def index(self):
+        if self._index is None:
+            with open(self.index_file) as index_file:
+                self._index = json.load(index_file)
+        return self._index
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __getitem__(self, key):
+        return self.matrix[self.index[key]]
+
+    def __len__(self):
+        return len(self.index)
+
+
+def delete_collective_vectors(sender, instance, **kwargs):
+    """
+    Removes the vectors of a deleted Collective from the file storage.
+    Gets connected to the post_delete signal of Collective, which also fires when a Community gets deleted.
+    """
+    VectorStore.for_collective(instance.id).delete()
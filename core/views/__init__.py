@@ -1,4 +1,4 @@
 from .collective import CollectiveView, CollectiveContentView
 from .individual import IndividualView, IndividualContentView
-from .community import CommunityView
+from .community import CommunityView, CommunityStatusView
 from .core import index, question
@@ -11,9 +11,10 @@ from rest_framework.status import (HTTP_200_OK, HTTP_202_ACCEPTED, HTTP_204_NO_C
                                    HTTP_500_INTERNAL_SERVER_ERROR)
 
 from core.models.organisms.states import CommunityState
+from core.models.organisms import Community
 from core.models.resources.manifestation import Manifestation
 from core.exceptions import DSProcessUnfinished, DSProcessError
-from core.utils.helpers import parse_datetime_string
+from core.utils.helpers import parse_datetime_string, get_any_model
 
 
 class CommunityView(APIView):
@@ -23,7 +24,7 @@ class CommunityView(APIView):
 
     RESPONSE_DATA = {
         "actions": [],  # FEATURE: get all available actions
-        "status": {},  # FEATURE: get the status of growth
+        "status": {},
         "result": {},
         "results": [],
         "error": None
@@ -83,10 +84,14 @@ class CommunityView(APIView):
 
             if manifestation is not None:
                 return self._get_response_from_manifestation(manifestation, response_data)
-            if community.state == CommunityState.SYNC:
-                raise DSProcessUnfinished()
+            if community.state == CommunityState.SYNC or \
+                    community.state == CommunityState.ASYNC and not community.is_stalled():
+                raise DSProcessUnfinished()  # asynchronous growth continues through callbacks of Growth tasks
 
-            community.grow(*query_path.split('/'))
+            if community.config.async:
+                community.grow_exclusive(*query_path.split('/'))
+            else:
+                community.grow(*query_path.split('/'))
             config = Manifestation.generate_config(community.PUBLIC_CONFIG, **query_parameters)
             manifestation = Manifestation.objects.create(uri=full_path, community=community, config=config)
             return self._get_response_from_manifestation(manifestation, response_data)
@@ -96,7 +101,7 @@ class CommunityView(APIView):
             return Response(response_data, HTTP_400_BAD_REQUEST)
 
         except DSProcessUnfinished:
-            # FEATURE: set status
+            response_data["status"] = CommunityStatusView.get_status(community_class, community.id)
             return Response(response_data, HTTP_202_ACCEPTED)
 
         except DSProcessError:
@@ -115,6 +120,36 @@ class CommunityView(APIView):
     #     pass
 
 
+class CommunityStatusView(APIView):
+    """
+    Reports how far a Community has grown. Poll this instead of the service of a Community,
+    because it does not grow the Community and it only needs a few small queries.
+    """
+
+    @staticmethod
+    def get_status(community_class, community_id):
+        status = community_class.get_growth_status(community_id)
+        if status is None:
+            return status
+        status["url"] = reverse(
+            "v1:community-status",
+            kwargs={"community": community_class.__name__, "pk": community_id}
+        )
+        return status
+
+    def get(self, request, community, pk, *args, **kwargs):
+        try:
+            community_class = get_any_model(community)
+        except LookupError:
+            raise Http404("Can not find community of type {}".format(community))
+        if not issubclass(community_class, Community):
+            raise Http404("{} is not a community".format(community))
+        status = self.get_status(community_class, int(pk))
+        if status is None:
+            raise Http404("Can not find community with id {}".format(pk))
+        return Response(status, HTTP_200_OK)
+
+
 class HtmlCommunityView(View):
 
     INDEX = "index.html"
@@ -18,17 +18,25 @@ DEFAULT_CONFIGURATION = {
     "global_token": "",
     "global_purge_immediately": False,  # by default keep resources around
 
+    "growth_reset_output": True,  # NB: appending Growths replace output unless they reuse previous output
+
     "http_resource_batch_size": 0,
     "http_resource_continuation_limit": 1,
     "http_resource_interval_duration": 0,  # NB: milliseconds!
     "http_resource_concat_args_size": 0,
     "http_resource_concat_args_symbol": "|",
+    "http_resource_concat_args_cache": False,  # NB: stores responses per argument for resources that support it
+    "http_resource_concurrency": 0,  # NB: amount of threads, sends one request at a time when lower than 2
+    "http_resource_host_concurrency": 0,  # NB: defaults to concurrency when 0
+    "http_resource_pool_connections": 10,  # NB: amount of hosts to keep connections alive for
+    "http_resource_pool_maxsize": 10,  # NB: amount of connections to keep alive per host
 
     "wikipedia_wiki_country": "en",
     "wikipedia_wiki_query_param": "titles",
     "wikipedia_wiki_full_extracts": False,
     "wikipedia_wiki_domain": "en.wikipedia.org",
     "wikipedia_wiki_show_categories": "!hidden",
+    "wikipedia_cursor_time": 0,  # NB: recent changes before this timestamp are known already
 
     "google_api_key": getattr(settings, 'GOOGLE_API_KEY', ''),
     "google_cx": "004613812033868156538:5pcwbuudj1m",
@@ -36,7 +44,13 @@ DEFAULT_CONFIGURATION = {
     "indico_api_key": getattr(settings, 'INDICO_API_KEY', ''),
 
     "rank_processor_batch_size": 1000,
-    "rank_processor_result_size": 20
+    "rank_processor_result_size": 20,
+
+    "cluster_processor_clusters": 8,
+    "cluster_processor_iterations": 10,  # NB: amount of passes over all vectors
+    "cluster_processor_batch_size": 1000,
+    "cluster_processor_vectors": "$.vectors",
+    "cluster_processor_seed": 0
 }
 
 
@@ -56,6 +70,11 @@ MOCK_CONFIGURATION = {
     "http_resource_interval_duration": 0,  # NB: milliseconds!
     "http_resource_concat_args_size": 0,
     "http_resource_concat_args_symbol": "|",
+    "http_resource_concat_args_cache": False,  # NB: stores responses per argument for resources that support it
+    "http_resource_concurrency": 0,
+    "http_resource_host_concurrency": 0,
+    "http_resource_pool_connections": 10,  # NB: amount of hosts to keep connections alive for
+    "http_resource_pool_maxsize": 10,  # NB: amount of connections to keep alive per host
     "mock_processor_include_odd": False,
     "mock_processor_include_even": False,
 }
@@ -5,8 +5,11 @@ from django.conf import settings
 from django.core.files.storage import default_storage
 
 from collections import OrderedDict
+from datetime import datetime
 
 from core.models.organisms import Community, Collective, Individual
+from core.utils.helpers import bulk_update
+from core.utils.vectors import VectorStore
 
 
 class FutureFashionCommunity(Community):
@@ -39,7 +42,8 @@ class FutureFashionCommunity(Community):
 
     PUBLIC_CONFIG = {
         "$reference": None,
-        "$euclidean_distance": 1
+        "$euclidean_distance": 1,
+        "$cosine_similarity": 0
     }
 
     def initial_input(self, *args):
@@ -61,6 +65,31 @@ class FutureFashionCommunity(Community):
             Individual.objects.create(community=self, collective=initial, properties=properties, schema={})
         return initial
 
+    def finish_vectors(self, out, err):
+        """
+        Moves the feature vectors of Individuals into a VectorStore for the output Collective.
+        Individuals keep the Collective and row of their vectors,
+        which the ImageFeaturesCompareProcessor uses to read vectors from the right store.
+        """
+        individuals = [
+            individual for individual in out.individual_set.iterator()
+            if isinstance(individual.properties.get("vectors"), list)
+        ]
+        if not individuals:
+            return
+        store = VectorStore.for_collective(out.id)
+        index = store.save(
+            (individual.properties["file"], individual.properties["vectors"],)
+            for individual in individuals
+        )
+        now = datetime.now()
+        for individual in individuals:
+            del individual.properties["vectors"]
+            individual.properties["vector_collective"] = out.id
+            individual.properties["vector_row"] = index[individual.properties["file"]]
+            individual.modified_at = now
+        bulk_update(individuals, ["properties", "modified_at"])
+
     def set_kernel(self):
         self.kernel = self.current_growth.output
 
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-02 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0019_officialannouncementsdocumentnetherlands_officialannouncementsnetherlands'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='acteursspotprofile',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='benfcastingprofile',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='googleimage',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='googletranslate',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='imagedownload',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='imagefeatures',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='moederannecastingsearch',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='moederannecastingsession',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='officialannouncementsdocumentnetherlands',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='officialannouncementsnetherlands',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikidataitems',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediacategories',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediacategorymembers',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediaedit',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipedialistpages',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipedialogin',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediapageviewdetails',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediarecentchanges',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediarevisions',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediasearch',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediatoken',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediatransclusions',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='wikipediatranslate',
+            index_together=set([('uri', 'data_hash')]),
+        ),
+    ]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.5 on 2017-11-13 11:04
+from __future__ import unicode_literals
+
+from django.db import migrations
+import core.utils.compression
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sources', '0021_auto_20171106_1531'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='acteursspotprofile',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='benfcastingprofile',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='googleimage',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='googletranslate',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='imagedownload',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='imagefeatures',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='moederannecastingsearch',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='moederannecastingsession',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='officialannouncementsdocumentnetherlands',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='officialannouncementsnetherlands',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikidataitems',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediacategories',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediacategorymembers',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediaedit',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipedialistpages',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipedialogin',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediapageviewdetails',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediarecentchanges',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediarevisions',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediasearch',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediatoken',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediatransclusions',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+        migrations.AlterField(
+            model_name='wikipediatranslate',
+            name='body',
+            field=core.utils.compression.CompressedTextField(default=None),
+        ),
+    ]
@@ -60,7 +60,13 @@ class GoogleImage(GoogleQuery):
         content_type, data = super(GoogleImage, self).content
         try:
             if data is not None:
-                data["queries"]["request"][0]["searchTerms"] = data["queries"]["request"][0]["searchTerms"][1:-1]
+                # The parsed content is shared, so we copy everything on the path to searchTerms before changing it
+                request = dict(data["queries"]["request"][0])
+                request["searchTerms"] = request["searchTerms"][1:-1]
+                queries = dict(data["queries"])
+                queries["request"] = [request] + data["queries"]["request"][1:]
+                data = dict(data)
+                data["queries"] = queries
         except (KeyError, IndexError):
             raise DSInvalidResource("Google Image resource does not specify searchTerms", self)
         return content_type, data
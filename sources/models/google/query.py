@@ -1,6 +1,9 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
+from django.conf import settings
+
 from core.models.resources.http import HttpResource
+from core.models.resources.limits import DailyQuota
 from core.exceptions import DSHttpError40X, DSHttpError403LimitExceeded, DSHttpWarning204
 
 
@@ -8,6 +11,14 @@ class GoogleQuery(HttpResource):
 
     CONFIG_NAMESPACE = "google"
 
+    FRESHNESS_TTL = 60 * 60 * 24 * 7
+    FRESHNESS_STALE_WHILE_REVALIDATE = 60 * 60 * 24
+    FRESHNESS_NEGATIVE_TTL = 60 * 60 * 24
+
+    RATE_LIMIT = 1
+    RATE_LIMIT_BURST = 10
+    DAILY_QUOTA = getattr(settings, "GOOGLE_DAILY_QUOTA", None)  # NB: opt-in, because quotas differ per key
+
     def auth_parameters(self):
         return {
             "key": self.config.api_key
@@ -18,6 +29,9 @@ class GoogleQuery(HttpResource):
             no_errors = super(GoogleQuery, self)._handle_errors()
         except DSHttpError40X as exception:
             if self.status == 403:
+                # Stop sending requests today when Google tells us the quota is used up
+                if self.DAILY_QUOTA is not None and "dailyLimitExceeded" in (self.body or ""):
+                    DailyQuota.exhaust(self.rate_limit_key(self.request["url"]), self.DAILY_QUOTA)
                 raise DSHttpError403LimitExceeded(exception, resource=self)
             else:
                 raise exception
@@ -31,5 +45,5 @@ class GoogleQuery(HttpResource):
     def success(self):
         return super(GoogleQuery, self).success and self.status != 204
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         abstract = True
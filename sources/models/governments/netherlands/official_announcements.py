@@ -59,13 +59,13 @@ class OfficialAnnouncementsNetherlands(HttpResource):
             "_page": next_url.query_dict["_page"]
         }
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         verbose_name = "Official announcements (Dutch)"
         verbose_name_plural = "Official announcements (Dutch)"
 
 
 class OfficialAnnouncementsDocumentNetherlands(URLResource):
 
-    class Meta:
+    class Meta(URLResource.Meta):
         verbose_name = "Official announcements document (Dutch)"
         verbose_name_plural = "Official announcements document (Dutch)"
@@ -71,6 +71,6 @@ class ImageFeatures(HttpResource):
     def uri_from_url(url):
         return url
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         verbose_name = "Image features"
         verbose_name_plural = "Image features"
@@ -1,8 +1,7 @@
 import urllib
 
-import requests
-
 from core.models.resources.http import HttpResource
+from core.utils.http import create_session
 
 
 class MoederAnneCastingSession(HttpResource):
@@ -104,7 +103,7 @@ class MoederAnneCastingSearch(HttpResource):
     def send(self, *args, **kwargs):
         if self.session is None or not self.session.cookies.get("ASP.NET_SessionId"):
             link = MoederAnneCastingSession()
-            link.session = requests.Session()
+            link.session = create_session()
             link.get()
             self.session = link.session  # TODO: make sure that in fetch_mass the session gets transferred
         return super(MoederAnneCastingSearch, self).send(*args, **kwargs)
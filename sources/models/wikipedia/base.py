@@ -1,5 +1,3 @@
-from time import sleep
-
 from core.models.resources.http import HttpResource
 
 
@@ -17,12 +15,19 @@ class WikipediaAPI(HttpResource):
         "continue": ""
     }
 
+    FRESHNESS_TTL = 60 * 60 * 24
+    FRESHNESS_NEGATIVE_TTL = 60 * 60
+
+    # Lagging servers respond with maxlag errors, which get retried after the rest of a serie got sent
+    RETRY_STATUSES = [503]
+    MAX_RETRIES = 5
+
     ERROR_CODE_TO_STATUS = {
         "no-such-entity": 404,
         "maxlag": 503
     }
 
-    class Meta:
+    class Meta(HttpResource.Meta):
         abstract = True
 
     def _handle_errors(self):
@@ -35,9 +40,5 @@ class WikipediaAPI(HttpResource):
         if data is not None and "error" in data:
             error_code = data["error"]["code"]
             self.set_error(self.ERROR_CODE_TO_STATUS[error_code])
-        # Here we act on specific errors that need handling
-        if self.status == self.ERROR_CODE_TO_STATUS["maxlag"]:
-            maxlag_interval = int(self.head.get("Retry-After", 5))
-            sleep(maxlag_interval)
         # HttpResource will now raise exceptions
         super(WikipediaAPI, self)._handle_errors()
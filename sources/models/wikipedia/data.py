@@ -13,6 +13,8 @@ class WikiDataItems(WikipediaAPI):
         "props": "info|claims|descriptions"
     })
 
+    FRESHNESS_TTL = None  # NB: WikiFeedCommunity expires items of changed pages
+
     GET_SCHEMA = {
         "args": {
             "type": "array",
@@ -21,7 +23,7 @@ class WikiDataItems(WikipediaAPI):
         "kwargs": None
     }
 
-    class Meta:
+    class Meta(WikipediaAPI.Meta):
         verbose_name = "Wikidata items"
         verbose_name_plural = "Wikidata items"
 
@@ -54,6 +56,20 @@ class WikiDataItems(WikipediaAPI):
                 "type": snak["datatype"]
             }, False
 
+    @staticmethod
+    def get_claim_index(claims):
+        """
+        Indexes the values of claims by their property, keeping the order of the claims.
+        This allows to look up claims of a property without going through all claims.
+
+        :param claims: (list) claims as returned by get_entity
+        :return: (dict) a list of values per property
+        """
+        claim_index = {}
+        for claim in claims:
+            claim_index.setdefault(claim["property"], []).append(claim["value"])
+        return claim_index
+
     def get_item(self, raw_item_data):
         raw_claims = []
         for raw_claims_list in raw_item_data.get("claims", {}).values():
@@ -78,7 +94,7 @@ class WikiDataItems(WikipediaAPI):
                 claim_entity["references"].append(reference)
                 references.add(reference)
             claim_entities.append(claim_entity)
-        item = raw_item_data
+        item = dict(raw_item_data)
         try:
             item["description"] = item["descriptions"]["en"]["value"]
             del item["descriptions"]
@@ -86,6 +102,7 @@ class WikiDataItems(WikipediaAPI):
             item["description"] = "No English description available"
 
         item["claims"] = claim_entities
+        item["claim_index"] = self.get_claim_index(claim_entities)
         item["references"] = list(references)
         return item
 
@@ -96,6 +113,21 @@ class WikiDataItems(WikipediaAPI):
             self.set_error(self.ERROR_CODE_TO_STATUS[error_code])
         super(WikiDataItems, self)._handle_errors()
 
+    def split_content(self, links, keys):
+        contents = {}
+        for link in links:
+            content_type, data = super(WikiDataItems, link).content
+            for entity_id, raw_item in data.get("entities", {}).items():
+                if "missing" in raw_item:
+                    continue
+                # Redirected items are found under the id that was requested
+                key = raw_item.get("redirects", {}).get("from", entity_id)
+                contents[key] = {
+                    "entities": {entity_id: raw_item},
+                    "success": data.get("success", 1)
+                }
+        return contents
+
     @property
     def content(self):
         content_type, data = super(WikiDataItems, self).content
@@ -6,6 +6,8 @@ from sources.models.wikipedia.query import WikipediaAPI
 class WikipediaEdit(WikipediaAPI):
 
     URI_TEMPLATE = "https://{}.wikipedia.org/w/api.php"
+    FRESHNESS_TTL = None
+    FRESHNESS_NEGATIVE_TTL = 0
 
     DATA = {
         'action': 'edit',
@@ -62,9 +64,8 @@ class WikipediaEdit(WikipediaAPI):
         parameters.pop("continue", None)
         return parameters
 
-    def send(self, method, *args, **kwargs):
-        args = (self.config.wiki_country,)
-        return super(WikipediaEdit, self).send(method, *args, **kwargs)
+    def request_arguments(self, method, *args, **kwargs):
+        return (self.config.wiki_country,), kwargs
 
     def get(self, *args, **kwargs):
         raise NotImplementedError("GET is not implemented for this resource")
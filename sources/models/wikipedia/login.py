@@ -6,6 +6,8 @@ from sources.models.wikipedia.query import WikipediaAPI
 class WikipediaToken(WikipediaAPI):
 
     URI_TEMPLATE = "https://{}.wikipedia.org/w/api.php"
+    FRESHNESS_TTL = None
+    FRESHNESS_NEGATIVE_TTL = 0
 
     DATA = {
         "action": "query",
@@ -69,6 +71,8 @@ class WikipediaToken(WikipediaAPI):
 class WikipediaLogin(WikipediaAPI):
 
     URI_TEMPLATE = "https://{}.wikipedia.org/w/api.php"
+    FRESHNESS_TTL = None
+    FRESHNESS_NEGATIVE_TTL = 0
 
     DATA = {
         "action": "login",
@@ -21,7 +21,35 @@ class WikipediaListPages(WikipediaQuery, WikipediaImagesMixin):
         "kwargs": None
     }
     WIKI_QUERY_PARAM = "pageids"
+    # Stored pages stay fresh, because WikiFeedCommunity expires pages that changed and reuses the rest
+    FRESHNESS_TTL = None
 
-    class Meta:
+    class Meta(WikipediaQuery.Meta):
         verbose_name = "Wikipedia list pages"
-        verbose_name_plural = "Wikipedia list pages"
\ No newline at end of file
+        verbose_name_plural = "Wikipedia list pages"
+
+    def split_content(self, links, keys):
+        keys = set(keys)
+        pages = {}
+        for link in links:
+            content_type, data = link.content
+            for pageid, page in data["query"][self.WIKI_RESULTS_KEY].items():
+                if pageid not in pages:
+                    pages[pageid] = dict(page)
+                    continue
+                # Continued responses hold the remainder of list properties like categories
+                merged_page = pages[pageid]
+                for key, value in page.items():
+                    if isinstance(value, list):
+                        merged_page[key] = merged_page.get(key, []) + value
+                    else:
+                        merged_page.setdefault(key, value)
+        return {
+            pageid: {
+                "batchcomplete": "",
+                "query": {
+                    self.WIKI_RESULTS_KEY: {pageid: page}
+                }
+            }
+            for pageid, page in pages.items() if pageid in keys and "missing" not in page
+        }
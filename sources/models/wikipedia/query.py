@@ -22,9 +22,8 @@ class WikipediaQuery(WikipediaAPI):
     WIKI_QUERY_PARAM = "titles"
     ERROR_MESSAGE = "We did not find the page you were looking for. Perhaps you should create it?"
 
-    def send(self, method, *args, **kwargs):
-        args = (self.config.wiki_country, self.WIKI_QUERY_PARAM,) + args
-        return super(WikipediaQuery, self).send(method, *args, **kwargs)
+    def request_arguments(self, method, *args, **kwargs):
+        return (self.config.wiki_country, self.WIKI_QUERY_PARAM,) + args, kwargs
 
     def _handle_errors(self):
         super(WikipediaQuery, self)._handle_errors()
@@ -49,7 +48,7 @@ class WikipediaQuery(WikipediaAPI):
     def content(self):
         content_type, data = super(WikipediaQuery, self).content
         if "warnings" in data:
-            del(data["warnings"])
+            data = {key: value for key, value in data.items() if key != "warnings"}
         return content_type, data
 
     def get_wikipedia_json(self):
@@ -61,7 +60,7 @@ class WikipediaQuery(WikipediaAPI):
         content_type, data = self.content
         return data.get("continue", {})
 
-    class Meta:
+    class Meta(WikipediaAPI.Meta):
         abstract = True
 
 
@@ -80,7 +79,7 @@ class WikipediaGenerator(WikipediaQuery):
             self.status = 404
             raise DSHttpError40X(self.ERROR_MESSAGE, resource=self)
 
-    class Meta:
+    class Meta(WikipediaQuery.Meta):
         abstract = True
 
 
@@ -102,8 +101,9 @@ class WikipediaPage(WikipediaQuery):
                 "{} resource did not contain 'query', 'pages' or a first page".format(self.__class__.__name__),
                 resource=self
             )
+        data = dict(data)
         data["page"] = page
         return content_type, data
 
-    class Meta:
+    class Meta(WikipediaQuery.Meta):
         abstract = True
@@ -26,13 +26,13 @@ class WikipediaRecentChanges(WikipediaQuery):
     CONFIG_NAMESPACE = "wikipedia"
     WIKI_RESULTS_KEY = "recentchanges"
 
-    class Meta:
+    class Meta(WikipediaQuery.Meta):
         verbose_name = "Wikipedia recent changes"
         verbose_name_plural = "Wikipedia recent changes"
 
-    def send(self, method, *args, **kwargs):
-        args = (self.config.wiki_country, int(self.config.start_time), int(self.config.end_time))
-        return super(WikipediaQuery, self).send(method, *args, **kwargs)
+    def request_arguments(self, method, *args, **kwargs):
+        start_time = max(int(self.config.start_time), int(self.config.cursor_time))
+        return (self.config.wiki_country, start_time, int(self.config.end_time)), kwargs
 
 
 class WikipediaRevisions(WikipediaPage):
@@ -44,6 +44,6 @@ class WikipediaRevisions(WikipediaPage):
         "rvdir": "older"
     })
 
-    class Meta:
+    class Meta(WikipediaPage.Meta):
         verbose_name = "Wikipedia revisions"
         verbose_name_plural = "Wikipedia revisions"
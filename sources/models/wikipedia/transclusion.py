@@ -10,6 +10,6 @@ class WikipediaTransclusions(WikipediaGenerator):
         "gtilimit": 500
     })
 
-    class Meta:
+    class Meta(WikipediaGenerator.Meta):
         verbose_name = "Wikipedia transclusions"
         verbose_name_plural = "Wikipedia transclusions"
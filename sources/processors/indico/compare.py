@@ -1,15 +1,106 @@
 from __future__ import unicode_literals, absolute_import, print_function, division
 
 from core.processors.compare import ComparisonProcessor
+from core.utils.vectors import VectorStore
 
 
 class ImageFeaturesCompareProcessor(ComparisonProcessor):
 
+    COLUMNAR = True
+    VECTORIZED_HOOKS = ["euclidean_distance", "cosine_similarity"]
+
+    def __init__(self, config):
+        super(ImageFeaturesCompareProcessor, self).__init__(config)
+        self._vector_stores = {}
+
     @staticmethod
     def euclidean_distance(individual, reference_individual):
-        from scipy.spatial.distance import euclidean
-        distance = euclidean(individual["vectors"], reference_individual["vectors"])
+        import numpy as np
+        distance = np.linalg.norm(
+            np.asarray(individual["vectors"], dtype=np.float32) -
+            np.asarray(reference_individual["vectors"], dtype=np.float32)
+        )
         if not distance:
             return 0.99999999
         else:
-            return 1/distance
+            return 1/float(distance)
+
+    @staticmethod
+    def cosine_similarity(individual, reference_individual):
+        import numpy as np
+        vectors = np.asarray(individual["vectors"], dtype=np.float32)
+        reference = np.asarray(reference_individual["vectors"], dtype=np.float32)
+        norms = np.linalg.norm(vectors) * np.linalg.norm(reference)
+        if not norms:
+            return 0.0
+        return float(np.dot(vectors, reference) / norms)
+
+    def get_vector_matrix(self, individuals):
+        """
+        Stacks the vectors of individuals into a single float32 matrix.
+        Vectors come from the VectorStore of the Collective they were saved for when individuals hold a vector row
+        and otherwise from the vectors of individuals themselves.
+        Rows of individuals without vectors or with vectors of another size than the reference stay empty.
+
+        :param individuals: (list) dictionaries with vectors or a vector row
+        :return: (tuple) the matrix, the reference vector and a boolean mask of rows that hold vectors
+        """
+        import numpy as np
+        reference = None
+        for indices, vectors in VectorStore.read_individuals([self.reference.properties], self._vector_stores):
+            reference = vectors[0]
+        if reference is None:
+            reference = np.asarray(self.reference.properties["vectors"], dtype=np.float32)
+        matrix = np.zeros((len(individuals), reference.shape[0]), dtype=np.float32)
+        mask = np.zeros(len(individuals), dtype=bool)
+        for indices, vectors in VectorStore.read_individuals(individuals, self._vector_stores):
+            if vectors.shape[1] != reference.shape[0]:
+                continue
+            matrix[indices] = vectors
+            mask[indices] = True
+        for row in np.flatnonzero(~mask):
+            vectors = individuals[row].get("vectors")
+            if not vectors or len(vectors) != reference.shape[0]:
+                continue
+            matrix[row] = vectors
+            mask[row] = True
+        return matrix, reference, mask
+
+    @staticmethod
+    def euclidean_similarities(matrix, reference):
+        import numpy as np
+        distances = np.linalg.norm(matrix - reference, axis=1)
+        similarities = np.full(distances.shape, 0.99999999)
+        nonzero = distances != 0
+        similarities[nonzero] = 1 / distances[nonzero].astype(np.float64)
+        return similarities
+
+    @staticmethod
+    def cosine_similarities(matrix, reference):
+        import numpy as np
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(reference)
+        similarities = np.zeros(norms.shape)
+        nonzero = norms != 0
+        similarities[nonzero] = matrix[nonzero].dot(reference) / norms[nonzero]
+        return similarities
+
+    def evaluate_hooks(self, hooks, individuals):
+        """
+        Computes the similarity of all individuals with the reference in a single operation per vectorized hook.
+        Other hooks get called for every individual as usual.
+        """
+        vectorized = [hook for hook in hooks if hook.__name__ in self.VECTORIZED_HOOKS]
+        if not vectorized:
+            return super(ImageFeaturesCompareProcessor, self).evaluate_hooks(hooks, individuals)
+        import numpy as np
+        values = np.zeros((len(individuals), len(hooks)))
+        matrix, reference, mask = self.get_vector_matrix(individuals)
+        for column, hook in enumerate(hooks):
+            if hook.__name__ == "euclidean_distance":
+                values[mask, column] = self.euclidean_similarities(matrix[mask], reference)
+            elif hook.__name__ == "cosine_similarity":
+                values[mask, column] = self.cosine_similarities(matrix[mask], reference)
+            else:
+                values[:, column:column+1] = \
+                    super(ImageFeaturesCompareProcessor, self).evaluate_hooks([hook], individuals)
+        return values
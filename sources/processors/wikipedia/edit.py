@@ -1,6 +1,5 @@
-import requests
-
 from core.processors import HttpResourceProcessor
+from core.utils.http import create_session
 
 from sources.models import WikipediaToken, WikipediaLogin
 
@@ -9,7 +8,7 @@ class WikipediaEditProcessor(HttpResourceProcessor):
 
     @classmethod
     def get_session(cls, config):
-        session = requests.Session()
+        session = create_session(config.pool_connections, config.pool_maxsize)
         login_token = WikipediaToken(session=session).post("login").get_token()
         WikipediaLogin(session=session, token=login_token).post(
             username=config.username,
@@ -21,36 +21,38 @@ def categories_watch(categories, page_data):
         if category in categories
     ])
 
+''' Returns the values of claims with a given property, using the claim index of WikiDataItems when available'''
+def get_claim_values(property, wikidata):
+    claim_index = wikidata.get("claim_index")
+    if claim_index is not None:
+        return claim_index.get(property, [])
+    return [claim["value"] for claim in wikidata.get("claims", []) if claim["property"] == property]
+
 ''' Returns articles with a given claim e.g. if property(genre) is item(superhero film)'''
 def claim_watch(property, item, wikidata):
-    return any(
-        (claim for claim in wikidata.get("claims", [])
-        if claim["property"] == property and claim["value"] == item)
-    )
+    return item in get_claim_values(property, wikidata)
 
 ''' Returns articles where a given claim exists (regardless of its value) '''
 def claim_exists(property, wikidata):
-    return any(
-        (claim for claim in wikidata.get("claims", [])
-         if claim["property"] == property)
-    )
+    return len(get_claim_values(property, wikidata)) > 0
 
 ''' Returns articles ranked by a quantity from wikidata e.g. property(box office)'''
 def get_quantity(property, wikidata):
-    return next(
-        (float(claim["value"]["amount"]) for claim in wikidata.get("claims", [])
-        if claim["property"] == property)
-    , 0.0)
+    values = get_claim_values(property, wikidata)
+    return float(values[0]["amount"]) if values else 0.0
 
 ''' Returns a time based on a property which is expected to have a time value'''
 def get_time(property, wikidata):
-    return next(
-        (dateutil.parser.parse(claim["value"]["time"]) for claim in wikidata.get("claims", [])
-         if claim["property"] == property)
-    , 0.0)
+    values = get_claim_values(property, wikidata)
+    return dateutil.parser.parse(values[0]["time"]) if values else 0.0
 
 
 class WikipediaRankProcessor(RankProcessor):
+
+    COLUMNAR = True
+    FEATURE_STORE = True
+    DATE_DEPENDENT_HOOKS = ["whats_on_tv"]
+
     def get_hook_arguments(self, individual):
         individual_argument = super(WikipediaRankProcessor, self).get_hook_arguments(individual)[0]
         wikidata_argument = individual_argument.get("wikidata", {})
@@ -101,10 +103,7 @@ class WikipediaRankProcessor(RankProcessor):
     def is_woman(page, wikidata):
         sex_property = "P21"
         women_item = "Q6581072"
-        return any(
-            (claim for claim in wikidata.get("claims", [])
-            if claim["property"] == sex_property and claim["value"] == women_item)
-        )
+        return claim_watch(sex_property, women_item, wikidata)
 
     @staticmethod
     def london_traffic_accidents(page, wikidata):
@@ -242,9 +241,8 @@ class WikipediaRankProcessor(RankProcessor):
             'Q39',  # Switzerland
         ]
         return any(
-            (claim["value"] for claim in wikidata.get("claims", [])
-             if claim["property"] == country_property and
-             claim["value"] in central_europe_country_entities)
+            (value for value in get_claim_values(country_property, wikidata)
+             if value in central_europe_country_entities)
         )
 
     @staticmethod
@@ -8,12 +8,14 @@ import os
 
 from django.conf import settings
 
+from celery import group
+
 from core.models.organisms import Community, Collective, Individual
-from core.utils.image import ImageGrid
-from core.utils.helpers import format_datetime, iroundrobin
+from core.utils.helpers import format_datetime, iroundrobin, ibatch
 from core.processors.expansion import ExpansionProcessor
 
 from sources.models.downloads import ImageDownload
+from visual_translations.tasks import build_image_grids
 
 
 class VisualTranslationsEUCommunity(Community):
@@ -208,6 +210,22 @@ class VisualTranslationsEUCommunity(Community):
 
     zoom_levels = {"S": 0.2, "L": 1, "XL": 1}
 
+    def get_download_files(self, urls):
+        """
+        Loads the file names of successful downloads for urls with a query per batch of urls.
+
+        :param urls: (iterable) urls of downloaded images
+        :return: (dict) file name by url
+        """
+        urls_by_uri = {ImageDownload.uri_from_url(url): url for url in urls}
+        download_files = {}
+        for uris in ibatch(urls_by_uri.keys(), 500):
+            downloads = ImageDownload.objects.filter(uri__in=uris).only("uri", "status", "body")
+            for download in downloads:
+                if download.success and download.body:
+                    download_files[urls_by_uri[download.uri]] = download.body
+        return download_files
+
     def finish_download(self, out, err):  # TODO: move images in downloads folder? another way?
         translation_growth = self.growth_set.filter(type="translations").last()
         query = translation_growth.input.individual_set.last().properties["query"]
@@ -215,42 +233,38 @@ class VisualTranslationsEUCommunity(Community):
         grouped_translations = translation_growth.output.group_by("locale")
         directory = "visual_translations/{}/{}".format(query, format_datetime(self.created_at))
         os.makedirs(os.path.join(settings.MEDIA_ROOT, directory), 0o0755, True)
+
+        locale_urls = {}
+        expansion_processor = ExpansionProcessor(self.config.to_dict())
         for locale, translations in six.iteritems(grouped_translations):
-            expansion_processor = ExpansionProcessor(self.config.to_dict())
             translations = expansion_processor.collective_content(
                 [translation.properties for translation in translations]
             )
-            image_sources = []
-            for translation in translations:
-                image_sources.append(iter(translation["images"]))
-            images = iroundrobin(*image_sources)
-            downloads = []
-            grid, xlarge_factor = grids[locale]
-
-            while True:
-                try:
-                    image = next(images)
-                except StopIteration:
-                    break
-                try:
-                    download = ImageDownload.objects.get(uri=ImageDownload.uri_from_url(image["url"]))
-                except ImageDownload.DoesNotExist:
-                    continue
-                content_type, image = download.content
-                if image is not None:
-                    downloads.append(image)
-                if len(downloads) >= (grid["rows"] * grid["columns"] + 10):
-                    break
+            image_sources = [iter(translation["images"]) for translation in translations]
+            locale_urls[locale] = [image["url"] for image in iroundrobin(*image_sources)]
+        download_files = self.get_download_files(
+            url for urls in six.itervalues(locale_urls) for url in urls
+        )
 
+        jobs = []
+        for locale, urls in six.iteritems(locale_urls):
+            grid, xlarge_factor = grids[locale]
+            zoom_grids = []
             for size, factor in six.iteritems(self.zoom_levels):
-                grid, xlarge_factor = grids[locale]
                 factor = factor if size != "XL" else xlarge_factor
                 grid_specs = copy(grid)
                 grid_specs["cell_width"] = int(grid_specs["cell_width"] * factor)
                 grid_specs["cell_height"] = int(grid_specs["cell_height"] * factor)
-                image_grid = ImageGrid(**grid_specs)
-                image_grid.fill(downloads)
-                image_grid.export("{}/{}_{}.jpg".format(directory, size, locale))
+                zoom_grids.append((grid_specs, "{}/{}_{}.jpg".format(directory, size, locale),))
+            file_names = [download_files[url] for url in urls if url in download_files]
+            jobs.append((file_names, grid["rows"] * grid["columns"] + 10, zoom_grids,))
+
+        # Grids of locales get built by workers in parallel, the Community doesn't wait for them
+        if self.config.async:
+            group(build_image_grids.s(*job) for job in jobs).delay()
+            return
+        for job in jobs:
+            build_image_grids(*job)
 
     def set_kernel(self):
         self.kernel = self.growth_set.filter(type="translations").last().output
@@ -0,0 +1,36 @@
+from __future__ import unicode_literals, absolute_import, print_function, division
+
+from celery import current_app as app
+
+from core.utils.image import ImageGrid, open_image
+
+
+@app.task(name="visual_translations.build_image_grids")
+def build_image_grids(file_names, image_count, grids):
+    """
+    Builds and exports the grids of all zoom levels for a single locale.
+    Every image gets decoded once at the smallest scale that still fits two cells of the largest grid
+    and every sized image gets shared among grids with the same cell size.
+
+    :param file_names: (list) image file names in order of preference
+    :param image_count: (int) amount of images to use
+    :param grids: (list) grid specs together with the file name to export to
+    :return: None
+    """
+    minimum_size = (
+        max(grid_specs["cell_width"] for grid_specs, export_name in grids) * 2,
+        max(grid_specs["cell_height"] for grid_specs, export_name in grids) * 2,
+    )
+    images = []
+    for file_name in file_names:
+        try:
+            images.append(open_image(file_name, minimum_size))
+        except IOError:
+            continue
+        if len(images) >= image_count:
+            break
+    cache = {}
+    for grid_specs, export_name in grids:
+        image_grid = ImageGrid(cache=cache, **grid_specs)
+        image_grid.fill(images)
+        image_grid.export(export_name)
@@ -19,9 +19,10 @@ class Command(GrowCommand):
     def clear_database():
         three_days_ago = datetime.now() - timedelta(days=3)
         WikiFeedCommunity.objects.filter(created_at__lte=three_days_ago).delete()
-        WikipediaRecentChanges.objects.all().delete()
-        WikipediaListPages.objects.all().delete()
-        WikiDataItems.objects.all().delete()
+        # Recent resources stay around, because new feeds reuse them for pages that did not change
+        WikipediaRecentChanges.objects.filter(created_at__lte=three_days_ago).delete()
+        WikipediaListPages.objects.filter(created_at__lte=three_days_ago).delete()
+        WikiDataItems.objects.filter(created_at__lte=three_days_ago).delete()
         WikipediaPageviewDetails.objects.all().delete()
 
     @staticmethod
@@ -8,9 +8,10 @@ from django.conf import settings
 from django.template.loader import render_to_string
 
 from core.models.organisms import Community, Individual
+from core.models.organisms.states import CommunityState
 from core.views import CommunityView
 from core.exceptions import DSResourceException
-from sources.models.wikipedia import WikipediaCategories
+from sources.models.wikipedia import WikipediaCategories, WikipediaListPages, WikiDataItems
 
 
 class WikiFeedCommunity(Community):
@@ -40,6 +41,7 @@ class WikiFeedCommunity(Community):
             },
             "schema": {},
             "errors": {},
+            "reuse": True,
         }),
         ("pages", {
             "process": "HttpResourceProcessor.fetch_mass",
@@ -59,12 +61,14 @@ class WikiFeedCommunity(Community):
                     "wikidata": "$.pageprops.wikibase_item"
                 },
                 "_concat_args_size": 50,
+                "_concat_args_cache": True,
                 "_continuation_limit": 1000,
                 "_update_key": "pageid",
                 "user_agent": USER_AGENT
             },
             "schema": {},
             "errors": {},
+            "reuse": True,
         }),
         ("wikidata", {
             "process": "HttpResourceProcessor.fetch_mass",
@@ -79,16 +83,19 @@ class WikiFeedCommunity(Community):
                     "@": "$",
                     "wikidata": "$.id",
                     "claims": "$.claims",
+                    "claim_index": "$.claim_index",
                     "references": "$.references",
                     "description": "$.description",
                 },
                 "_inline_key": "wikidata",
                 "_concat_args_size": 50,
+                "_concat_args_cache": True,
                 "_continuation_limit": 1000,
                 "user_agent": USER_AGENT
             },
             "schema": {},
             "errors": {},
+            "reuse": True,
         }),
         # ("pageviews", {
         #     "process": "HttpResourceProcessor.fetch_mass",
@@ -148,6 +155,94 @@ class WikiFeedCommunity(Community):
     def initial_input(self, *args):
         return Individual.objects.create(community=self, properties={}, schema={})
 
+    @staticmethod
+    def timestamp_from_time(time):
+        return datetime.utcfromtimestamp(time).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def get_predecessor(self):
+        """
+        Returns the latest ready feed whose time window overlaps with or ends at the start of the time window of this feed.
+        Feeds get archived under a different signature, so the signature can't identify predecessors.
+        """
+        start_time = self.config.to_dict().get("start_time")
+        end_time = self.config.to_dict().get("end_time")
+        if start_time is None or end_time is None:
+            return None
+        candidates = WikiFeedCommunity.objects \
+            .filter(state=CommunityState.READY, created_at__lt=self.created_at) \
+            .exclude(id=self.id) \
+            .order_by("-created_at")
+        for candidate in candidates.iterator():
+            candidate_config = candidate.config.to_dict()
+            candidate_start_time = candidate_config.get("start_time")
+            candidate_end_time = candidate_config.get("end_time")
+            if candidate_start_time is None or candidate_end_time is None:
+                continue
+            if candidate_start_time <= start_time <= candidate_end_time <= end_time:
+                return candidate
+        return None
+
+    def reuse_revisions(self, growth, previous):
+        cursor_time = previous.community.config.end_time
+        start = self.timestamp_from_time(self.config.start_time)
+        cursor = self.timestamp_from_time(cursor_time)
+        revisions = (
+            revision.content for revision in previous.output.individual_set.iterator()
+            if start <= revision.properties.get("timestamp", "") < cursor
+        )
+        growth.output.update(revisions, reset=True, validate=False)
+        growth.config = {"_reset_output": False}
+        growth.save()
+        self.config = {"cursor_time": cursor_time}  # only recent changes after the cursor get fetched
+        self.save()
+
+    def call_reuse_callback(self, growth):
+        """
+        Expires responses of changed pages also when there is no predecessor to reuse.
+        Stored responses outlive the feeds that requested them, so they may be stale without any predecessor.
+        """
+        reused = super(WikiFeedCommunity, self).call_reuse_callback(growth)
+        if not reused and growth.type in ["pages", "wikidata"]:
+            getattr(self, "reuse_" + growth.type)(growth, None)
+        return reused
+
+    def get_changed_pageids(self):
+        """
+        Returns the pageids of revisions after the cursor time. Without a cursor time all pageids count as changed.
+        """
+        cursor = self.timestamp_from_time(self.config.to_dict().get("cursor_time", 0))
+        revisions = self.growth_set.filter(type="revisions").last().output
+        return {
+            revision.identity
+            for revision in revisions.individual_set.filter(identity__isnull=False).iterator()
+            if revision.identity and revision.properties.get("timestamp", "") >= cursor
+        }
+
+    def reuse_pages(self, growth, previous):
+        # Unchanged pages get served from responses stored per pageid, changed pages should be requested again
+        pageids = sorted(self.get_changed_pageids())
+        WikipediaListPages.expire_requests(
+            "get",
+            [[pageid] for pageid in pageids],
+            [{} for pageid in pageids],
+            config=growth.config.to_dict(protected=True)
+        )
+
+    def reuse_wikidata(self, growth, previous):
+        pageids = self.get_changed_pageids()
+        pages = self.growth_set.filter(type="pages").last().output
+        items = sorted({
+            page.properties["wikidata"]
+            for page in pages.individual_set.filter(identity__in=pageids).iterator()
+            if page.properties.get("wikidata")
+        })
+        WikiDataItems.expire_requests(
+            "get",
+            [[item] for item in items],
+            [{} for item in items],
+            config=growth.config.to_dict(protected=True)
+        )
+
     def finish_revisions(self, out, err):
         pages_growth = self.next_growth()
         grouped_pages = groupby(out.individual_set.order_by("identity").iterator(), lambda ind: ind.identity)
@@ -1,5 +1,8 @@
+from mock import patch
+
 from django.test import TestCase
 
+from core.models.organisms.states import CommunityState
 from wiki_feed.models import WikiFeedCommunity
 
 
@@ -18,3 +21,32 @@ class TestWikiFeedCommunity(TestCase):
         self.instance.setup_growth()
         growth = self.instance.next_growth()
         self.assertEqual(growth.type, "revisions")
+
+    def test_get_predecessor(self):
+        self.assertIsNone(self.instance.get_predecessor())
+        self.instance.config = {"start_time": 86400, "end_time": 2 * 86400}
+        self.instance.state = CommunityState.READY
+        self.instance.save()
+        overlapping = WikiFeedCommunity(config={"start_time": 86400 + 3600, "end_time": 2 * 86400 + 3600})
+        overlapping.save()
+        self.assertEqual(overlapping.get_predecessor(), self.instance)
+        following = WikiFeedCommunity(config={"start_time": 2 * 86400, "end_time": 3 * 86400})
+        following.save()
+        self.assertEqual(following.get_predecessor(), self.instance)
+        later = WikiFeedCommunity(config={"start_time": 2 * 86400 + 1, "end_time": 3 * 86400})
+        later.save()
+        self.assertIsNone(later.get_predecessor())
+        self.instance.state = CommunityState.NEW
+        self.instance.save()
+        self.assertIsNone(overlapping.get_predecessor())
+
+    def test_call_reuse_callback(self):
+        self.instance.setup_growth()
+        growths = {growth.type: growth for growth in self.instance.growth_set.all()}
+        # Changed pages get expired without a predecessor
+        with patch.object(WikiFeedCommunity, "reuse_pages") as reuse_pages:
+            self.assertFalse(self.instance.call_reuse_callback(growths["pages"]))
+            reuse_pages.assert_called_once_with(growths["pages"], None)
+        with patch.object(WikiFeedCommunity, "reuse_revisions") as reuse_revisions:
+            self.assertFalse(self.instance.call_reuse_callback(growths["revisions"]))
+            self.assertFalse(reuse_revisions.called)
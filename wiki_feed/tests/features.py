@@ -1,7 +1,9 @@
 from django.test import TestCase
 
 from core.models import Individual
-from sources.processors.wikipedia.rank import WikipediaRankProcessor, users_watch, categories_watch, claim_watch
+from sources.models.wikipedia import WikiDataItems
+from sources.processors.wikipedia.rank import (WikipediaRankProcessor, users_watch, categories_watch, claim_watch,
+                                               claim_exists, get_quantity)
 
 
 class TestWikiFeedFeatures(TestCase):
@@ -78,3 +80,18 @@ class TestWikiFeedFeaturesHelpers(TestCase):
         self.assertFalse(is_childrens_party)
         is_woman = claim_watch("P21", "Q6581097", page.properties["wikidata"])
         self.assertFalse(is_woman)
+
+    def test_claim_index(self):
+        page = Individual.objects.get(identity="Q42440670")
+        wikidata = page.properties["wikidata"]
+        indexed_wikidata = dict(wikidata)
+        indexed_wikidata["claim_index"] = WikiDataItems.get_claim_index(wikidata["claims"])
+        self.assertIn("Q18711682", indexed_wikidata["claim_index"]["P31"])
+        for data in [wikidata, indexed_wikidata]:
+            self.assertTrue(claim_watch("P31", "Q18711682", data))
+            self.assertFalse(claim_watch("P31", "Q5098265", data))
+            self.assertTrue(claim_exists("P31", data))
+            self.assertFalse(claim_exists("P0", data))
+            self.assertEqual(get_quantity("P1120", data), 8)
+            self.assertEqual(get_quantity("P0", data), 0.0)
+        self.assertFalse(claim_watch("P31", "Q18711682", {}))